@@ -0,0 +1,204 @@
+import argparse
+import hashlib
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+"""Tamaño máximo de los resultados guardados en la cache, en bytes"""
+TAMANO_MAXIMO = 2**30
+
+ESQUEMA = (
+    """
+CREATE TABLE IF NOT EXISTS resultados (
+    clave TEXT PRIMARY KEY,
+    experimento TEXT NOT NULL,
+    tamano INTEGER NOT NULL,
+    usado REAL NOT NULL,
+    resultado BLOB NOT NULL
+)
+""",
+    "CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado)",
+)
+
+_versiones: Dict[Path, str] = {}
+
+
+def version_codigo(*archivos: Path) -> str:
+    """
+    Huella del código que resuelve las instancias: el paquete `src` y los
+    archivos dados (el módulo de cada experimento).
+    """
+    total = hashlib.sha256()
+    for archivo in sorted(set(RAIZ.glob("src/**/*.py")) | set(archivos)):
+        if archivo not in _versiones:
+            _versiones[archivo] = hashlib.sha256(archivo.read_bytes()).hexdigest()
+        total.update(_versiones[archivo].encode())
+    return total.hexdigest()
+
+
+class CacheResoluciones:
+    """
+    Cache de resultados de resolver instancias, compartida entre experimentos
+    y direccionada por contenido: la clave es la huella de la instancia, la de
+    la configuración de resolución y la del código.
+
+    Cuando los resultados superan `tamano_maximo` se descartan los usados hace
+    más tiempo, así que los de versiones viejas del código (que ya no se
+    consultan) terminan saliendo de la cache.
+    """
+
+    def __init__(self, path: Path, tamano_maximo: int = TAMANO_MAXIMO) -> None:
+        self.path = Path(path)
+        self.tamano_maximo = tamano_maximo
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.transaccion() as conexion:
+            for sentencia in ESQUEMA:
+                conexion.execute(sentencia)
+
+    @staticmethod
+    def clave(instancia: str, configuracion: str, version: str) -> str:
+        return hashlib.sha256(
+            f"{instancia}-{configuracion}-{version}".encode()
+        ).hexdigest()
+
+    @contextmanager
+    def transaccion(self) -> Iterator[sqlite3.Connection]:
+        """Conexión con una transacción que bloquea la base para escribir"""
+        conexion = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            conexion.execute("BEGIN IMMEDIATE")
+            yield conexion
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        finally:
+            conexion.close()
+
+    def buscar(self, claves: Iterable[str]) -> Dict[str, Any]:
+        """Clave -> resultado de las claves que están en la cache"""
+        claves = list(claves)
+        encontrados: Dict[str, Any] = {}
+
+        with self.transaccion() as conexion:
+            # SQLite limita la cantidad de parámetros de una consulta
+            for inicio in range(0, len(claves), 500):
+                parte = claves[inicio : inicio + 500]
+                marcas = ",".join("?" * len(parte))
+                for clave, resultado in conexion.execute(
+                    f"SELECT clave, resultado FROM resultados WHERE clave IN ({marcas})",
+                    parte,
+                ):
+                    encontrados[clave] = pickle.loads(resultado)
+
+                conexion.execute(
+                    f"UPDATE resultados SET usado = ? WHERE clave IN ({marcas})",
+                    [time.time(), *parte],
+                )
+
+        return encontrados
+
+    def guardar(self, clave: str, experimento: str, resultado: Any) -> None:
+        datos = pickle.dumps(resultado)
+
+        with self.transaccion() as conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?)",
+                (clave, experimento, len(datos), time.time(), datos),
+            )
+            self.desalojar(conexion)
+
+    def desalojar(self, conexion: sqlite3.Connection) -> None:
+        """Descarta los resultados usados hace más tiempo hasta entrar en el tamaño"""
+        (total,) = conexion.execute(
+            "SELECT COALESCE(SUM(tamano), 0) FROM resultados"
+        ).fetchone()
+        if total <= self.tamano_maximo:
+            return
+
+        descartar = []
+        for clave, tamano in conexion.execute(
+            "SELECT clave, tamano FROM resultados ORDER BY usado"
+        ):
+            if total <= self.tamano_maximo:
+                break
+            descartar.append((clave,))
+            total -= tamano
+
+        conexion.executemany("DELETE FROM resultados WHERE clave = ?", descartar)
+
+    def invalidar(self, experimento: Optional[str] = None) -> int:
+        """
+        Descarta los resultados del tipo de experimento dado, o todos. Devuelve
+        cuántos se descartaron.
+        """
+        with self.transaccion() as conexion:
+            if experimento is None:
+                cursor = conexion.execute("DELETE FROM resultados")
+            else:
+                cursor = conexion.execute(
+                    "DELETE FROM resultados WHERE experimento = ?", (experimento,)
+                )
+            descartados = cursor.rowcount
+
+        # Devuelve el espacio liberado al sistema de archivos
+        conexion = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            conexion.execute("VACUUM")
+        finally:
+            conexion.close()
+
+        return descartados
+
+    def estado(self) -> Dict[str, Dict[str, int]]:
+        """Cantidad y tamaño de los resultados de cada tipo de experimento"""
+        with self.transaccion() as conexion:
+            filas = conexion.execute(
+                "SELECT experimento, COUNT(*), SUM(tamano) FROM resultados "
+                "GROUP BY experimento"
+            ).fetchall()
+        return {
+            experimento: {"resultados": cantidad, "tamano": tamano}
+            for experimento, cantidad, tamano in filas
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cache de resultados compartida entre experimentos"
+    )
+    parser.add_argument("cache", type=Path, help="Path a la base de la cache")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    subparsers.add_parser(
+        "estado", help="Muestra cuántos resultados hay de cada tipo de experimento"
+    )
+
+    parser_invalidar = subparsers.add_parser(
+        "invalidar", help="Descarta resultados guardados en la cache"
+    )
+    parser_invalidar.add_argument(
+        "--experimento",
+        type=str,
+        default=None,
+        help="Sólo los de este tipo (clase) de experimento",
+    )
+
+    args = parser.parse_args()
+
+    cache = CacheResoluciones(args.cache)
+    if args.comando == "estado":
+        print(cache.estado())
+
+    elif args.comando == "invalidar":
+        print(f"{cache.invalidar(args.experimento)} resultados descartados")
+
+
+if __name__ == "__main__":
+    main()
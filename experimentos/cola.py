@@ -0,0 +1,444 @@
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.instancia import InstanciaAsignacionCuadrillas
+
+"""Duración de los leases sobre los trabajos, en segundos"""
+DURACION_LEASE = 300.0
+
+"""Cantidad de veces que se intenta un trabajo cuya resolución falla"""
+INTENTOS_MAXIMOS = 3
+
+"""Espera entre consultas a la cola cuando no hay novedades, en segundos"""
+ESPERA = 2.0
+
+ESQUEMA = (
+    """
+CREATE TABLE IF NOT EXISTS experimentos (
+    nombre TEXT PRIMARY KEY,
+    experimento BLOB NOT NULL,
+    configuracion TEXT NOT NULL DEFAULT ''
+)
+""",
+    """
+CREATE TABLE IF NOT EXISTS trabajos (
+    experimento TEXT NOT NULL,
+    indice INTEGER NOT NULL,
+    instancia BLOB NOT NULL,
+    huella TEXT NOT NULL DEFAULT '',
+    configuracion TEXT NOT NULL DEFAULT '',
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    trabajador TEXT,
+    lease_hasta REAL,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    resultado BLOB,
+    PRIMARY KEY (experimento, indice)
+)
+""",
+)
+
+"""
+Columnas (tabla, columna) agregadas después de crear el esquema. En las colas
+anteriores quedan vacías, por lo que sus trabajos se vuelven a publicar.
+"""
+COLUMNAS_AGREGADAS = (
+    ("experimentos", "configuracion"),
+    ("trabajos", "huella"),
+    ("trabajos", "configuracion"),
+)
+
+
+class ColaTrabajos:
+    """
+    Cola de trabajos (experimento, instancia) sobre una base SQLite, que puede
+    estar en un sistema de archivos compartido entre nodos.
+
+    Un trabajador toma un trabajo con un lease que renueva mientras lo resuelve.
+    Si el trabajador muere, el lease vence y otro trabajador vuelve a tomarlo.
+
+    Cada trabajo guarda la huella de su instancia y la de la configuración del
+    experimento (ver `Experimento.huella_configuracion`), que identifican su
+    resultado.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        duracion_lease: float = DURACION_LEASE,
+        intentos_maximos: int = INTENTOS_MAXIMOS,
+    ) -> None:
+        self.path = Path(path)
+        self.duracion_lease = duracion_lease
+        self.intentos_maximos = intentos_maximos
+
+        with self.transaccion() as conexion:
+            for sentencia in ESQUEMA:
+                conexion.execute(sentencia)
+
+            for tabla, columna in COLUMNAS_AGREGADAS:
+                columnas = {
+                    fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla})")
+                }
+                if columna not in columnas:
+                    conexion.execute(
+                        f"ALTER TABLE {tabla} ADD COLUMN {columna} "
+                        "TEXT NOT NULL DEFAULT ''"
+                    )
+
+    @contextmanager
+    def transaccion(self) -> Iterator[sqlite3.Connection]:
+        """Conexión con una transacción que bloquea la base para escribir"""
+        conexion = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            conexion.execute("BEGIN IMMEDIATE")
+            yield conexion
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        finally:
+            conexion.close()
+
+    def publicar(
+        self,
+        nombre: str,
+        experimento: Any,
+        instancias: List[InstanciaAsignacionCuadrillas],
+    ) -> None:
+        """
+        Publica el experimento y un trabajo por instancia. Si el experimento ya
+        estaba publicado, conserva los trabajos de la misma instancia con la
+        misma configuración, vuelve a publicar (descartando su resultado) los que
+        cambiaron y quita los que sobran.
+        """
+        configuracion = experimento.huella_configuracion()
+        huellas = [instancia.huella() for instancia in instancias]
+
+        with self.transaccion() as conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO experimentos (nombre, experimento, "
+                "configuracion) VALUES (?, ?, ?)",
+                (nombre, pickle.dumps(experimento), configuracion),
+            )
+
+            publicados = {
+                indice: (huella, configuracion_trabajo)
+                for indice, huella, configuracion_trabajo in conexion.execute(
+                    "SELECT indice, huella, configuracion FROM trabajos "
+                    "WHERE experimento = ?",
+                    (nombre,),
+                )
+            }
+            conexion.execute(
+                "DELETE FROM trabajos WHERE experimento = ? AND indice >= ?",
+                (nombre, len(instancias)),
+            )
+            conexion.executemany(
+                "INSERT OR REPLACE INTO trabajos "
+                "(experimento, indice, instancia, huella, configuracion) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (nombre, indice, pickle.dumps(instancia), huella, configuracion)
+                    for indice, (instancia, huella) in enumerate(
+                        zip(instancias, huellas)
+                    )
+                    if publicados.get(indice) != (huella, configuracion)
+                ],
+            )
+
+    def experimento(self, nombre: str) -> Any:
+        with self.transaccion() as conexion:
+            (experimento,) = conexion.execute(
+                "SELECT experimento FROM experimentos WHERE nombre = ?", (nombre,)
+            ).fetchone()
+        return pickle.loads(experimento)
+
+    def instancias(self, nombre: str) -> List[InstanciaAsignacionCuadrillas]:
+        with self.transaccion() as conexion:
+            filas = conexion.execute(
+                "SELECT instancia FROM trabajos WHERE experimento = ? ORDER BY indice",
+                (nombre,),
+            ).fetchall()
+        return [pickle.loads(instancia) for (instancia,) in filas]
+
+    def tomar(
+        self, trabajador: str, nombre: Optional[str] = None
+    ) -> Optional[Tuple[str, int, InstanciaAsignacionCuadrillas, str, str]]:
+        """
+        Toma el primer trabajo pendiente o con el lease vencido (del experimento
+        dado, o de cualquiera), y devuelve (experimento, índice, instancia, huella,
+        configuración). Devuelve None si no hay ninguno disponible.
+        """
+        ahora = time.time()
+
+        with self.transaccion() as conexion:
+            fila = conexion.execute(
+                "SELECT experimento, indice, instancia, huella, configuracion "
+                "FROM trabajos WHERE (estado = 'pendiente' OR (estado = 'tomado' AND lease_hasta < ?)) "
+                "AND (? IS NULL OR experimento = ?) "
+                "ORDER BY experimento, indice LIMIT 1",
+                (ahora, nombre, nombre),
+            ).fetchone()
+            if fila is None:
+                return None
+
+            experimento, indice, instancia, huella, configuracion = fila
+            conexion.execute(
+                "UPDATE trabajos SET estado = 'tomado', trabajador = ?, "
+                "lease_hasta = ?, intentos = intentos + 1 "
+                "WHERE experimento = ? AND indice = ?",
+                (trabajador, ahora + self.duracion_lease, experimento, indice),
+            )
+
+        return experimento, indice, pickle.loads(instancia), huella, configuracion
+
+    def renovar(self, nombre: str, indice: int, trabajador: str) -> None:
+        """Extiende el lease del trabajo, si el trabajador todavía lo tiene"""
+        with self.transaccion() as conexion:
+            conexion.execute(
+                "UPDATE trabajos SET lease_hasta = ? "
+                "WHERE experimento = ? AND indice = ? AND trabajador = ? "
+                "AND estado = 'tomado'",
+                (time.time() + self.duracion_lease, nombre, indice, trabajador),
+            )
+
+    @contextmanager
+    def renovando(self, nombre: str, indice: int, trabajador: str) -> Iterator[None]:
+        """Renueva el lease del trabajo en segundo plano mientras dura el bloque"""
+        fin = threading.Event()
+
+        def renovar() -> None:
+            while not fin.wait(self.duracion_lease / 3):
+                self.renovar(nombre, indice, trabajador)
+
+        hilo = threading.Thread(target=renovar, daemon=True)
+        hilo.start()
+        try:
+            yield
+        finally:
+            fin.set()
+            hilo.join()
+
+    def completar(
+        self,
+        nombre: str,
+        indice: int,
+        huella: str,
+        configuracion: str,
+        resultado: Any,
+    ) -> None:
+        """
+        Guarda el resultado del trabajo. Si otro trabajador lo completó antes
+        (porque el lease venció), se conserva el primer resultado, y si el trabajo
+        se volvió a publicar con otra instancia o configuración, se descarta.
+        """
+        with self.transaccion() as conexion:
+            conexion.execute(
+                "UPDATE trabajos SET estado = 'terminado', resultado = ?, "
+                "lease_hasta = NULL "
+                "WHERE experimento = ? AND indice = ? AND huella = ? "
+                "AND configuracion = ? AND estado != 'terminado'",
+                (pickle.dumps(resultado), nombre, indice, huella, configuracion),
+            )
+
+    def fallar(
+        self, nombre: str, indice: int, huella: str, configuracion: str, error: str
+    ) -> None:
+        """
+        Devuelve el trabajo a la cola, o lo marca como fallido si agotó sus
+        intentos.
+        """
+        with self.transaccion() as conexion:
+            conexion.execute(
+                "UPDATE trabajos SET "
+                "estado = CASE WHEN intentos >= ? THEN 'fallido' ELSE 'pendiente' END, "
+                "error = ?, lease_hasta = NULL "
+                "WHERE experimento = ? AND indice = ? AND huella = ? "
+                "AND configuracion = ? AND estado = 'tomado'",
+                (self.intentos_maximos, error, nombre, indice, huella, configuracion),
+            )
+
+    def fallidos(self, nombre: str) -> Dict[int, str]:
+        """Índice -> último error de los trabajos que agotaron sus intentos"""
+        with self.transaccion() as conexion:
+            filas = conexion.execute(
+                "SELECT indice, error FROM trabajos "
+                "WHERE experimento = ? AND estado = 'fallido'",
+                (nombre,),
+            ).fetchall()
+        return dict(filas)
+
+    def estado(self, nombre: str) -> Dict[str, int]:
+        """Cantidad de trabajos del experimento en cada estado"""
+        with self.transaccion() as conexion:
+            filas = conexion.execute(
+                "SELECT estado, COUNT(*) FROM trabajos WHERE experimento = ? "
+                "GROUP BY estado",
+                (nombre,),
+            ).fetchall()
+        return dict(filas)
+
+    def terminados(
+        self, nombre: str, excluidos: Optional[Set[int]] = None
+    ) -> List[Tuple[int, str, str, Any]]:
+        """
+        Tuplas (índice, huella, configuración, resultado) de los trabajos
+        terminados que no se excluyen
+        """
+        with self.transaccion() as conexion:
+            indices = [
+                indice
+                for (indice,) in conexion.execute(
+                    "SELECT indice FROM trabajos "
+                    "WHERE experimento = ? AND estado = 'terminado'",
+                    (nombre,),
+                )
+                if excluidos is None or indice not in excluidos
+            ]
+            filas = [
+                conexion.execute(
+                    "SELECT huella, configuracion, resultado FROM trabajos "
+                    "WHERE experimento = ? AND indice = ?",
+                    (nombre, indice),
+                ).fetchone()
+                for indice in indices
+            ]
+        return [
+            (indice, huella, configuracion, pickle.loads(resultado))
+            for indice, (huella, configuracion, resultado) in zip(indices, filas)
+        ]
+
+
+def trabajar(
+    path: Path,
+    nombre: Optional[str] = None,
+    trabajador: Optional[str] = None,
+    duracion_lease: float = DURACION_LEASE,
+) -> int:
+    """
+    Resuelve trabajos de la cola (del experimento dado, o de cualquiera) hasta
+    que no quede ninguno abierto. Devuelve la cantidad de trabajos resueltos.
+    """
+    cola = ColaTrabajos(path, duracion_lease=duracion_lease)
+    trabajador = trabajador or f"{socket.gethostname()}:{os.getpid()}"
+    experimentos: Dict[str, Any] = {}
+    resueltos = 0
+
+    while True:
+        trabajo = cola.tomar(trabajador, nombre)
+
+        if trabajo is None:
+            # Los trabajos tomados por otros pueden volver a la cola si sus leases
+            # vencen, así que sólo se termina cuando no queda ninguno abierto
+            abiertos = [
+                experimento
+                for experimento in ([nombre] if nombre is not None else experimentos)
+                if {"pendiente", "tomado"} & set(cola.estado(experimento))
+            ]
+            if len(abiertos) == 0:
+                return resueltos
+            time.sleep(ESPERA)
+            continue
+
+        experimento, indice, instancia, huella, configuracion = trabajo
+        if (
+            experimento not in experimentos
+            or experimentos[experimento].huella_configuracion() != configuracion
+        ):
+            # El experimento pudo volver a publicarse con otra configuración
+            experimentos[experimento] = cola.experimento(experimento)
+
+        try:
+            with cola.renovando(experimento, indice, trabajador):
+                resultado = experimentos[experimento].resolver_instancia(instancia)
+        except Exception as error:
+            cola.fallar(experimento, indice, huella, configuracion, repr(error))
+            continue
+
+        cola.completar(experimento, indice, huella, configuracion, resultado)
+        resueltos += 1
+
+
+def lanzar_trabajadores(
+    path: Path, cantidad: int, nombre: Optional[str] = None
+) -> List[mp.Process]:
+    """Lanza trabajadores locales en procesos aparte, como si fueran otros nodos"""
+    procesos = [
+        mp.Process(target=trabajar, args=(path, nombre), daemon=True)
+        for _ in range(cantidad)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    return procesos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Trabajadores y agregación de experimentos en una cola compartida"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    parser_trabajar = subparsers.add_parser(
+        "trabajar", help="Resuelve trabajos de la cola hasta que no quede ninguno"
+    )
+    parser_trabajar.add_argument("cola", type=Path, help="Path a la base de la cola")
+    parser_trabajar.add_argument(
+        "--experimento",
+        type=str,
+        default=None,
+        help="Sólo trabajos de este experimento",
+    )
+    parser_trabajar.add_argument(
+        "--procesos", type=int, default=1, help="Cantidad de trabajadores en este nodo"
+    )
+
+    parser_estado = subparsers.add_parser(
+        "estado", help="Muestra cuántos trabajos hay en cada estado"
+    )
+    parser_estado.add_argument("cola", type=Path, help="Path a la base de la cola")
+    parser_estado.add_argument("experimento", type=str)
+
+    parser_agregar = subparsers.add_parser(
+        "agregar",
+        help="Espera a que terminen los trabajos y guarda los resultados del experimento",
+    )
+    parser_agregar.add_argument("cola", type=Path, help="Path a la base de la cola")
+    parser_agregar.add_argument("experimento", type=str)
+
+    args = parser.parse_args()
+
+    if args.comando == "trabajar":
+        for proceso in lanzar_trabajadores(args.cola, args.procesos, args.experimento):
+            proceso.join()
+
+    elif args.comando == "estado":
+        print(ColaTrabajos(args.cola).estado(args.experimento))
+
+    elif args.comando == "agregar":
+        cola = ColaTrabajos(args.cola)
+        experimento = replace(
+            cola.experimento(args.experimento),
+            instancias=cola.instancias(args.experimento),
+            cola=args.cola,
+            procesos=0,
+        )
+        resultados = experimento.ejecutar()
+        print(f"{len(resultados.objetivos)} resultados en {experimento.path_datos}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
-import pickle
+import hashlib
+import inspect
+import json
+import os
 import random
 import sys
 import time
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import matplotlib as mpl
 from tqdm import tqdm
@@ -20,6 +24,13 @@ from src.modelo.modelo import (
 from src.solucion import SolucionAnotada
 from src.solver import ConfiguracionCPLEX
 
+from cache import CacheResoluciones, version_codigo
+from cola import ESPERA, ColaTrabajos, lanzar_trabajadores
+from planificacion import ConfiguracionPresupuesto, PlanificadorPresupuesto
+from registro import RegistroResultados
+from resultados import EstadoResolucion, ResultadosExperimento, SolucionesCompactas
+from tabla import TablaResultados
+
 FILE_DIR = Path(__file__).resolve().parent
 
 PATH_DATOS = FILE_DIR / "datos"
@@ -28,13 +39,24 @@ PATH_DATOS.mkdir(parents=True, exist_ok=True)
 PATH_GRAFICOS = FILE_DIR / "graficos"
 PATH_GRAFICOS.mkdir(parents=True, exist_ok=True)
 
+PATH_CACHE = PATH_DATOS / "cache.sqlite"
 
-@dataclass
-class ResultadosExperimento:
-    instancias: List[InstanciaAsignacionCuadrillas]
-    soluciones: List[SolucionAnotada]
-    objetivos: List[float]
-    tiempos: List[float]
+ResultadoInstancia = Tuple[SolucionAnotada, float, float, EstadoResolucion]
+
+# Experimento que resuelve las instancias en cada proceso del pool
+_experimento_proceso: Optional["Experimento"] = None
+
+
+def _inicializar_proceso(experimento: "Experimento") -> None:
+    global _experimento_proceso
+    _experimento_proceso = experimento
+
+
+def _resolver_en_proceso(
+    indice: int, instancia: InstanciaAsignacionCuadrillas
+) -> Tuple[int, ResultadoInstancia]:
+    assert _experimento_proceso is not None
+    return indice, _experimento_proceso.resolver_instancia(instancia)
 
 
 @dataclass
@@ -51,6 +73,31 @@ class Experimento:
     configuracion_solver: ConfiguracionCPLEX = ConfiguracionCPLEX(sin_output=True)
     seed: int = 42
 
+    # Cantidad de procesos que resuelven instancias en paralelo (1 resuelve en
+    # este proceso)
+    procesos: int = 1
+    # Hilos de CPLEX de cada proceso (None deja los de `configuracion_solver` o,
+    # si no los fija, reparte los procesadores del equipo entre los procesos)
+    hilos_por_proceso: Optional[int] = None
+
+    # Guardar los resultados comprimidos (ver `ResultadosExperimento.guardar`)
+    comprimir_resultados: bool = True
+
+    # Base SQLite de una cola compartida entre nodos (ver `cola.py`): las instancias
+    # se publican como trabajos, que resuelven los trabajadores de cualquier nodo
+    # además de `procesos` trabajadores locales
+    cola: Optional[Path] = None
+
+    # Base SQLite de la cache de resultados compartida entre experimentos (ver
+    # `cache.py`), por ejemplo `PATH_CACHE`, o None para no usarla. No se usa con
+    # `presupuesto`, porque el tiempo de cada instancia depende del lote
+    cache: Optional[Path] = None
+
+    # Presupuesto de tiempo total que se reparte entre las instancias (ver
+    # `planificacion.py`), en lugar del tiempo límite de `configuracion_solver`.
+    # Las instancias se resuelven en este proceso
+    presupuesto: Optional[ConfiguracionPresupuesto] = None
+
     @property
     def path_datos(self) -> Path:
         res = PATH_DATOS / f"{self.nombre}"
@@ -64,26 +111,179 @@ class Experimento:
         return res
 
     def ejecutar(self) -> ResultadosExperimento:
-        path_resultados = self.path_datos / "resultados.pkl"
-        if path_resultados.exists():
-            with open(path_resultados, "rb") as f:
-                return pickle.load(f)
-
+        """
+        Resuelve las instancias del experimento y guarda los resultados.
+
+        Cada instancia resuelta se agrega al registro de resultados parciales,
+        identificada por su huella y la de la configuración. Al volver a ejecutar
+        (tras una interrupción, o con más instancias) sólo se resuelven las que no
+        están en el registro.
+
+        Las instancias que no están en el registro se buscan en la cache compartida
+        entre experimentos, donde se guarda cada instancia que se resuelve. Los
+        resultados de la cache se marcan en `desde_cache`, porque su tiempo se
+        midió en otra ejecución. Con `presupuesto` no se usa la cache: el tiempo
+        que recibe cada instancia depende de las demás del lote.
+        """
         instancias = self.generar_instancias()
-        resultados_solucion = self.resolver_instancias(instancias)
+        configuracion = self.huella_configuracion()
+        huellas = [instancia.huella() for instancia in instancias]
+
+        path_resultados = self.path_resultados()
+        if path_resultados is not None:
+            anteriores = ResultadosExperimento.cargar(path_resultados)
+
+            # Los resultados anteriores al registro no guardan su configuración
+            if (
+                anteriores.configuracion in (None, configuracion)
+                and [instancia.huella() for instancia in anteriores.instancias]
+                == huellas
+            ):
+                return anteriores
+
+        # El registro guarda cada resultado como (asignaciones, objetivo, tiempo,
+        # estado, desde_cache), y la cache sin `desde_cache`. Los registros
+        # anteriores no tienen `desde_cache`
+        registro = RegistroResultados(self.path_datos / "resultados_parciales.pkl")
+        claves = [f"{huella}-{configuracion}" for huella in huellas]
+        guardados = registro.cargar()
+
+        cache = (
+            CacheResoluciones(self.cache)
+            if self.cache is not None and self.presupuesto is None
+            else None
+        )
+        if cache is not None:
+            version = self.version_codigo()
+            configuracion_cache = self.huella_cache()
+            claves_cache = {
+                clave: CacheResoluciones.clave(huella, configuracion_cache, version)
+                for clave, huella in zip(claves, huellas)
+            }
+
+            if self.cola is None:
+                sin_registrar = [clave for clave in claves if clave not in guardados]
+                encontrados = cache.buscar(
+                    claves_cache[clave] for clave in sin_registrar
+                )
+                for clave in sin_registrar:
+                    if claves_cache[clave] in encontrados:
+                        guardados[clave] = (*encontrados[claves_cache[clave]], True)
+                        registro.agregar(clave, guardados[clave])
+
+        # Una cola ya guarda los trabajos terminados, y sus índices deben ser los
+        # de todas las instancias. Sus resultados llegan verificados contra la
+        # huella de la instancia y la de la configuración (ver
+        # `iterar_resultados_cola`), así que corresponden a sus claves
+        faltantes = [
+            indice
+            for indice, clave in enumerate(claves)
+            if self.cola is not None or clave not in guardados
+        ]
+
+        for posicion, (solucion, *metricas) in self.iterar_resultados(
+            [instancias[indice] for indice in faltantes]
+        ):
+            clave = claves[faltantes[posicion]]
+            compacto = (solucion.asignaciones(), *metricas)
+            if clave not in guardados:
+                registro.agregar(clave, (*compacto, False))
+                if cache is not None:
+                    cache.guardar(claves_cache[clave], type(self).__name__, compacto)
+            guardados[clave] = (*compacto, False)
 
         resultados = ResultadosExperimento(
             instancias=instancias,
-            soluciones=[sol for sol, _, _ in resultados_solucion],
-            objetivos=[obj for _, obj, _ in resultados_solucion],
-            tiempos=[tiempo for _, _, tiempo in resultados_solucion],
+            soluciones=SolucionesCompactas.desde_asignaciones(
+                instancias, [guardados[clave][0] for clave in claves]
+            ),
+            objetivos=[guardados[clave][1] for clave in claves],
+            tiempos=[guardados[clave][2] for clave in claves],
+            configuracion=configuracion,
+            estados=[guardados[clave][3] for clave in claves],
+            desde_cache=[
+                len(guardados[clave]) > 4 and guardados[clave][4] for clave in claves
+            ],
         )
 
-        with open(path_resultados, "wb") as f:
-            pickle.dump(resultados, f)
+        resultados.guardar(
+            self.path_datos / "resultados.npz", comprimir=self.comprimir_resultados
+        )
+        TablaResultados.escribir(self.path_datos / "tabla", resultados)
 
         return resultados
 
+    def tabla(self) -> TablaResultados:
+        """Tabla columnar de los resultados, ejecutando el experimento si hace falta"""
+        if not (self.path_datos / "tabla").exists():
+            self.ejecutar()
+        return TablaResultados(self.path_datos / "tabla")
+
+    def path_resultados(self) -> Optional[Path]:
+        """Resultados guardados del experimento, en el formato nuevo o el anterior"""
+        return _path_resultados(self.path_datos)
+
+    def configuracion_resolucion(self) -> Dict[str, Any]:
+        """
+        Configuración que determina el resultado de resolver una instancia. Las
+        subclases que resuelven de otra forma deben agregar sus parámetros.
+        """
+        solver = self.configuracion_solver.a_dict()
+        # No cambian la solución
+        solver.pop("sin_output")
+        solver.pop("hilos")
+
+        configuracion = {
+            "experimento": type(self).__name__,
+            "modelo": self.configuracion_modelo.a_dict(),
+            "solver": solver,
+        }
+        if self.presupuesto is not None:
+            configuracion["presupuesto"] = asdict(self.presupuesto)
+
+        return configuracion
+
+    def huella_configuracion(self) -> str:
+        return hashlib.sha256(
+            json.dumps(self.configuracion_resolucion(), sort_keys=True).encode()
+        ).hexdigest()
+
+    def huella_cache(self) -> str:
+        """
+        Huella de la configuración en la cache compartida. A diferencia de
+        `huella_configuracion`, distingue los hilos de CPLEX, con los que se midió
+        el tiempo de los resultados.
+        """
+        if self.cola is not None or (self.presupuesto is None and self.procesos > 1):
+            solver = self.copia_para_procesos().configuracion_solver
+        else:
+            solver = self.configuracion_solver
+
+        return hashlib.sha256(
+            json.dumps(
+                {**self.configuracion_resolucion(), "hilos": solver.hilos},
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+    def version_codigo(self) -> str:
+        """
+        Huella del código con el que el experimento resuelve las instancias: el de
+        este módulo, el de la clase del experimento y el de los módulos de
+        `experimentos` que resuelven o arman los resultados.
+        """
+        return version_codigo(
+            *(
+                Path(inspect.getfile(objeto)).resolve()
+                for objeto in (
+                    Experimento,
+                    type(self),
+                    PlanificadorPresupuesto,
+                    EstadoResolucion,
+                )
+            )
+        )
+
     def generar_instancias(self) -> List[InstanciaAsignacionCuadrillas]:
         if self.instancias is not None:
             return self.instancias
@@ -95,17 +295,139 @@ class Experimento:
 
     def resolver_instancias(
         self, instancias: List[InstanciaAsignacionCuadrillas]
-    ) -> List[Tuple[SolucionAnotada, float, float]]:
-        resultados_soluciones = []
+    ) -> List[ResultadoInstancia]:
+        resultados_soluciones: List[Optional[ResultadoInstancia]] = [None] * len(
+            instancias
+        )
+
+        for indice, resultado in self.iterar_resultados(instancias):
+            resultados_soluciones[indice] = resultado
+
+        assert all(resultado is not None for resultado in resultados_soluciones)
+        return resultados_soluciones  # type: ignore
+
+    def iterar_resultados(
+        self, instancias: List[InstanciaAsignacionCuadrillas]
+    ) -> Iterator[Tuple[int, ResultadoInstancia]]:
+        """
+        Resuelve las instancias y devuelve los pares (índice, resultado) a medida
+        que terminan: en orden si `procesos` es 1, y si no en el orden en que los
+        terminan los procesos del pool.
+        """
+        if self.cola is not None:
+            yield from self.iterar_resultados_cola(instancias)
+            return
+
+        if self.presupuesto is not None:
+            yield from self.iterar_resultados_presupuesto(instancias)
+            return
+
+        if self.procesos <= 1:
+            for indice, instancia in enumerate(tqdm(instancias, desc=self.nombre)):
+                yield indice, self.resolver_instancia(instancia)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.procesos,
+            initializer=_inicializar_proceso,
+            initargs=(self.copia_para_procesos(),),
+        ) as pool:
+            futuros = [
+                pool.submit(_resolver_en_proceso, indice, instancia)
+                for indice, instancia in enumerate(instancias)
+            ]
+
+            for futuro in tqdm(
+                as_completed(futuros), total=len(futuros), desc=self.nombre
+            ):
+                yield futuro.result()
+
+    def iterar_resultados_cola(
+        self, instancias: List[InstanciaAsignacionCuadrillas]
+    ) -> Iterator[Tuple[int, ResultadoInstancia]]:
+        """
+        Publica las instancias en la cola y devuelve los resultados a medida que
+        los trabajadores los terminan.
+
+        Cada resultado se verifica contra la huella de su instancia y la de la
+        configuración, para no devolver el de un trabajo que otra ejecución
+        volvió a publicar con otra instancia o configuración.
+        """
+        assert self.cola is not None
+
+        configuracion = self.huella_configuracion()
+        esperadas = {
+            indice: (instancia.huella(), configuracion)
+            for indice, instancia in enumerate(instancias)
+        }
+
+        cola = ColaTrabajos(self.cola)
+        cola.publicar(self.nombre, self.copia_para_procesos(), instancias)
+
+        locales = lanzar_trabajadores(self.cola, self.procesos, self.nombre)
+        recibidos: Set[int] = set()
+
+        try:
+            with tqdm(total=len(instancias), desc=self.nombre) as progreso:
+                while len(recibidos) < len(instancias):
+                    nuevos = cola.terminados(self.nombre, recibidos)
+                    for indice, huella, configuracion_trabajo, resultado in nuevos:
+                        if esperadas.get(indice) != (huella, configuracion_trabajo):
+                            raise RuntimeError(
+                                f"El trabajo {indice} de {self.nombre} se volvió a "
+                                "publicar con otra instancia o configuración"
+                            )
+                        recibidos.add(indice)
+                        progreso.update()
+                        yield indice, resultado
+
+                    fallidos = cola.fallidos(self.nombre)
+                    if len(fallidos) > 0:
+                        raise RuntimeError(f"Trabajos fallidos: {fallidos}")
+
+                    if len(nuevos) == 0:
+                        time.sleep(ESPERA)
+        finally:
+            for proceso in locales:
+                proceso.terminate()
+
+    def iterar_resultados_presupuesto(
+        self, instancias: List[InstanciaAsignacionCuadrillas]
+    ) -> Iterator[Tuple[int, ResultadoInstancia]]:
+        """
+        Resuelve las instancias repartiendo el presupuesto entre ellas, y guarda
+        cuánto usó cada una en `presupuesto.csv`.
+        """
+        assert self.presupuesto is not None
+
+        planificador = PlanificadorPresupuesto(
+            self.configuracion_modelo, self.configuracion_solver, self.presupuesto
+        )
+        with tqdm(total=len(instancias), desc=self.nombre) as progreso:
+            for indice, resultado in planificador.resolver(instancias):
+                progreso.update()
+                yield indice, resultado
 
-        for instancia in tqdm(instancias, desc=self.nombre):
-            resultados_soluciones.append(self.resolver_instancia(instancia))
+        planificador.tabla_uso().to_csv(
+            self.path_datos / "presupuesto.csv", index=False
+        )
 
-        return resultados_soluciones
+    def copia_para_procesos(self) -> "Experimento":
+        """
+        Copia del experimento, sin sus instancias, que resuelve instancias en
+        otro proceso con `hilos_por_proceso` hilos de CPLEX.
+        """
+        copia = replace(self, instancias=None, procesos=1, cola=None)
+        hilos = self.hilos_por_proceso
+        if hilos is None and self.configuracion_solver.hilos is None:
+            hilos = max(1, (os.cpu_count() or 1) // max(1, self.procesos))
+        if hilos is not None:
+            copia.configuracion_solver = replace(self.configuracion_solver, hilos=hilos)
+        return copia
 
     def resolver_instancia(
         self, instancia: InstanciaAsignacionCuadrillas
-    ) -> Tuple[SolucionAnotada, float, float]:
+    ) -> ResultadoInstancia:
         modelo = ModeloAsignacionCuadrillas(instancia, self.configuracion_modelo)
 
         solver = modelo.armar_solver(self.configuracion_solver)
@@ -118,6 +440,9 @@ class Experimento:
             modelo.anotar_solucion(valores),
             objetivo,
             despues - antes,
+            EstadoResolucion(
+                optima=solver.es_optima(), gap=solver.gap(), cota=solver.cota()
+            ),
         )
 
     def guardar_imagen(self, fig: mpl.figure.Figure, nombre: str) -> None:
@@ -129,7 +454,25 @@ class Experimento:
         fig.savefig(path)
 
 
+def _path_resultados(path_datos: Path) -> Optional[Path]:
+    for nombre in ("resultados.npz", "resultados.pkl"):
+        if (path_datos / nombre).exists():
+            return path_datos / nombre
+    return None
+
+
 def cargar_resultados(nombre: str) -> ResultadosExperimento:
-    path_resultados = PATH_DATOS / nombre / "resultados.pkl"
-    with open(path_resultados, "rb") as f:
-        return pickle.load(f)
+    path_resultados = _path_resultados(PATH_DATOS / nombre)
+    assert path_resultados is not None, f"No hay resultados de {nombre}"
+    return ResultadosExperimento.cargar(path_resultados)
+
+
+def cargar_tabla(nombre: str) -> TablaResultados:
+    """
+    Tabla columnar de los resultados de un experimento, que se arma a partir de
+    sus resultados si todavía no existe.
+    """
+    path_tabla = PATH_DATOS / nombre / "tabla"
+    if not path_tabla.exists():
+        return TablaResultados.escribir(path_tabla, cargar_resultados(nombre))
+    return TablaResultados(path_tabla)
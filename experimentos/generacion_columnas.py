@@ -0,0 +1,96 @@
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from experimento import Experimento, ResultadoInstancia
+from resultados import EstadoResolucion
+from src.descomposicion import ConfiguracionGeneracionColumnas, GeneracionColumnas
+from src.generacion import (
+    DistribucionIndependiente,
+    DistribucionNormal,
+    DistribucionUniforme,
+    GeneradorInstancias,
+)
+from src.instancia import InstanciaAsignacionCuadrillas
+
+"""Instancias con muchos trabajadores, donde el modelo compacto escala peor"""
+GENERADOR_MUCHOS_TRABAJADORES = GeneradorInstancias(
+    cantidad_trabajadores=DistribucionUniforme(30, 60),
+    cantidad_ordenes=DistribucionUniforme(10, 20),
+    parametros_ordenes=DistribucionIndependiente(
+        DistribucionNormal(10000, 2000),
+        DistribucionUniforme(3, 10),
+    ),
+)
+
+
+@dataclass
+class ExperimentoGeneracionColumnas(Experimento):
+    """
+    Experimento que resuelve las instancias con generación de columnas y
+    price-and-branch en lugar del modelo compacto.
+    """
+
+    configuracion_generacion: ConfiguracionGeneracionColumnas = (
+        ConfiguracionGeneracionColumnas()
+    )
+
+    def resolver_instancia(
+        self, instancia: InstanciaAsignacionCuadrillas
+    ) -> ResultadoInstancia:
+        antes = time.perf_counter()
+        resultado = GeneracionColumnas(
+            instancia,
+            self.configuracion_modelo,
+            self.configuracion_generacion,
+            self.configuracion_solver,
+        ).resolver()
+        despues = time.perf_counter()
+
+        assert resultado is not None
+
+        return (
+            resultado.solucion,
+            resultado.objetivo,
+            despues - antes,
+            EstadoResolucion.desde_cota(resultado.objetivo, resultado.cota),
+        )
+
+    def configuracion_resolucion(self) -> Dict[str, Any]:
+        return {
+            **super().configuracion_resolucion(),
+            "generacion": asdict(self.configuracion_generacion),
+        }
+
+
+def comparar_con_modelo_compacto(
+    nombre: str,
+    instancias: List[InstanciaAsignacionCuadrillas],
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Resuelve las mismas instancias con el modelo compacto y con generación de
+    columnas, y devuelve una tabla con el objetivo y el tiempo de cada método por
+    instancia. Los argumentos adicionales se pasan a ambos experimentos.
+    """
+    compacto = Experimento(
+        nombre=f"{nombre}_compacto", instancias=instancias, **kwargs
+    ).ejecutar()
+    generacion = ExperimentoGeneracionColumnas(
+        nombre=f"{nombre}_generacion_columnas", instancias=instancias, **kwargs
+    ).ejecutar()
+
+    return pd.DataFrame(
+        {
+            "trabajadores": [
+                instancia.cantidad_trabajadores for instancia in instancias
+            ],
+            "ordenes": [len(instancia.ordenes) for instancia in instancias],
+            "objetivo_compacto": compacto.objetivos,
+            "objetivo_generacion": generacion.objetivos,
+            "tiempo_compacto": compacto.tiempos,
+            "tiempo_generacion": generacion.tiempos,
+        }
+    )
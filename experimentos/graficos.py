@@ -2,6 +2,7 @@ from collections.abc import Iterable
 from typing import List, Tuple, Union
 
 import matplotlib as mpl
+import numpy as np
 import pandas as pd
 import seaborn as sns
 from matplotlib import pyplot as plt
@@ -75,12 +76,17 @@ def boxplot(
 ) -> mpl.figure.Figure:
     fig, ax = plt.subplots(1, 1, figsize=figsize)
 
+    # Columnas armadas de una vez, sin un diccionario por dato
+    # Como con `zip`, los datos y las etiquetas sobrantes se descartan
+    pares = [
+        (values if isinstance(values, np.ndarray) else np.asarray(list(values)), label)
+        for values, label in zip(datos, labels)
+    ]
     df = pd.DataFrame(
-        [
-            {"value": value, "label": label}
-            for values, label in zip(datos, labels)
-            for value in values
-        ]
+        {
+            "value": np.concatenate([values for values, _ in pares]) if len(pares) > 0 else [],
+            "label": np.repeat([label for _, label in pares], [len(values) for values, _ in pares]),
+        }
     )
 
     sns.boxplot(data=df, x="value", y="label",  ax=ax, )
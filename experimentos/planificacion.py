@@ -0,0 +1,243 @@
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+sys.path.append("..")
+
+from src.instancia import InstanciaAsignacionCuadrillas
+from src.modelo.modelo import (
+    ConfiguracionAsignacionCuadrillas,
+    ModeloAsignacionCuadrillas,
+)
+from src.solucion import SolucionAnotada
+from src.solver import ConfiguracionCPLEX, Solver
+
+from resultados import EstadoResolucion
+
+
+@dataclass
+class ConfiguracionPresupuesto:
+    """Presupuesto de tiempo compartido entre las instancias de un experimento"""
+
+    """Tiempo de reloj total para resolver todas las instancias, en segundos"""
+    presupuesto: float
+
+    """Tiempo límite de la primera pasada por cada instancia"""
+    primera_pasada: float = 1.0
+
+    """Tiempo de cada tramo que se le asigna a una instancia abierta después"""
+    tramo: float = 5.0
+
+    """
+    Cantidad máxima de solvers que se mantienen armados para retomar su árbol de
+    branch and bound. Las demás instancias abiertas se rearman partiendo de su
+    incumbente.
+    """
+    solvers_retenidos: int = 32
+
+
+@dataclass
+class UsoPresupuesto:
+    """Uso del presupuesto de una instancia"""
+
+    indice: int
+
+    """Tiempo total de resolución de la instancia"""
+    tiempo: float = 0.0
+
+    """Cantidad de tramos que se le asignaron (incluyendo la primera pasada)"""
+    tramos: int = 0
+
+    """Tramos que retomaron el árbol del tramo anterior"""
+    retomados: int = 0
+
+    """Tramos que rearmaron el solver, partiendo del incumbente"""
+    rearmados: int = 0
+
+    gap_primera_pasada: float = math.inf
+    gap: float = math.inf
+
+
+@dataclass
+class _EstadoInstancia:
+    modelo: ModeloAsignacionCuadrillas
+    uso: UsoPresupuesto
+
+    solver: Optional[Solver] = None
+
+    objetivo: Optional[float] = None
+    valores: Optional[List[float]] = None
+    cota: float = math.inf
+    optima: bool = False
+
+    """Gap que se cerró por segundo en el último tramo (None si todavía no se sabe)"""
+    tasa: Optional[float] = None
+
+    @property
+    def gap(self) -> float:
+        if self.objetivo is None:
+            return math.inf
+        return EstadoResolucion.desde_cota(self.objetivo, self.cota).gap
+
+
+class PlanificadorPresupuesto:
+    """
+    Resuelve un lote de instancias con un presupuesto de tiempo total, en lugar
+    de un tiempo límite por instancia.
+
+    Cada instancia recibe primero una pasada corta. El resto del presupuesto se
+    reparte en tramos entre las instancias que quedan abiertas, eligiendo cada
+    vez la de mayor prioridad: el gap, aumentado por la mejora esperada en el
+    próximo tramo según cuánto se cerró en el anterior (las que todavía no tienen
+    un segundo tramo se suponen con la mejor mejora posible).
+
+    Los tramos de una instancia retoman su árbol de branch and bound si su solver
+    sigue armado (ver `solvers_retenidos`), y si no parten de su incumbente.
+    """
+
+    def __init__(
+        self,
+        configuracion_modelo: ConfiguracionAsignacionCuadrillas,
+        configuracion_solver: ConfiguracionCPLEX,
+        configuracion: ConfiguracionPresupuesto,
+    ) -> None:
+        self.configuracion_modelo = configuracion_modelo
+        self.configuracion_solver = configuracion_solver
+        self.configuracion = configuracion
+
+        self.uso: List[UsoPresupuesto] = []
+
+    def resolver(
+        self, instancias: List[InstanciaAsignacionCuadrillas]
+    ) -> Iterator[Tuple[int, Tuple[SolucionAnotada, float, float, EstadoResolucion]]]:
+        """
+        Resuelve las instancias y devuelve los pares (índice, resultado): cada
+        instancia apenas se prueba su optimalidad, y las demás al agotarse el
+        presupuesto. El tiempo de cada resultado es el que usó de presupuesto.
+
+        Una instancia sin solución factible al terminar su primera pasada sigue
+        recibiendo tramos hasta tener una, aunque se exceda el presupuesto.
+        """
+        fin = time.perf_counter() + self.configuracion.presupuesto
+
+        estados: Dict[int, _EstadoInstancia] = {}
+        self.uso = []
+
+        for indice, instancia in enumerate(instancias):
+            estado = _EstadoInstancia(
+                modelo=ModeloAsignacionCuadrillas(instancia, self.configuracion_modelo),
+                uso=UsoPresupuesto(indice),
+            )
+            self.uso.append(estado.uso)
+
+            # Si no alcanza para la primera pasada completa, se reparte lo que queda
+            limite = min(
+                self.configuracion.primera_pasada,
+                (fin - time.perf_counter()) / (len(instancias) - indice),
+            )
+            self.tramo(estado, limite)
+            while estado.objetivo is None:
+                limite = 2 * max(limite, self.configuracion.primera_pasada / 10)
+                self.tramo(estado, limite)
+
+            estado.uso.gap_primera_pasada = estado.gap
+
+            if estado.optima:
+                yield indice, self.resultado(estado)
+            else:
+                estados[indice] = estado
+                self.liberar_solvers(estados)
+
+        while len(estados) > 0 and time.perf_counter() < fin:
+            indice = max(estados, key=lambda i: self.prioridad(estados[i]))
+            estado = estados[indice]
+
+            self.tramo(estado, min(self.configuracion.tramo, fin - time.perf_counter()))
+
+            if estado.optima:
+                yield indice, self.resultado(estados.pop(indice))
+            else:
+                self.liberar_solvers(estados)
+
+        for indice, estado in estados.items():
+            yield indice, self.resultado(estado)
+
+    def tramo(self, estado: _EstadoInstancia, limite: float) -> None:
+        """Resuelve la instancia durante `limite` segundos más"""
+        if estado.solver is not None:
+            estado.uso.retomados += 1
+        else:
+            estado.solver = estado.modelo.armar_solver(self.configuracion_solver)
+            if estado.valores is not None:
+                estado.solver.establecer_inicio(estado.valores)
+                estado.uso.rearmados += 1
+
+        solver = estado.solver
+        solver.establecer_tiempo_limite(max(limite, 0.01))
+
+        gap_anterior = estado.gap
+
+        antes = time.perf_counter()
+        solver.cpx.solve()
+        tiempo = time.perf_counter() - antes
+
+        estado.uso.tiempo += tiempo
+        estado.uso.tramos += 1
+
+        if not solver.tiene_solucion():
+            return
+
+        objetivo = solver.cpx.solution.get_objective_value()
+        if estado.objetivo is None or objetivo > estado.objetivo:
+            estado.objetivo = objetivo
+            estado.valores = solver.cpx.solution.get_values()
+
+        # Un solver rearmado no conoce la cota del árbol anterior
+        estado.cota = min(estado.cota, solver.cota())
+        estado.optima = solver.es_optima() or (
+            EstadoResolucion.desde_cota(estado.objetivo, estado.cota).optima
+        )
+        estado.uso.gap = estado.gap
+
+        if math.isfinite(gap_anterior):
+            estado.tasa = max(gap_anterior - estado.gap, 0.0) / max(tiempo, 1e-3)
+
+    def prioridad(self, estado: _EstadoInstancia) -> float:
+        """Gap de la instancia, aumentado por la fracción que se espera cerrar"""
+        gap = estado.gap
+        if estado.tasa is None:
+            return 2 * gap
+
+        mejora = min(gap, estado.tasa * self.configuracion.tramo)
+        return gap + mejora
+
+    def liberar_solvers(self, estados: Dict[int, _EstadoInstancia]) -> None:
+        """Descarta los solvers de menor prioridad que exceden los retenidos"""
+        armados = sorted(
+            (estado for estado in estados.values() if estado.solver is not None),
+            key=self.prioridad,
+        )
+        sobrantes = len(armados) - self.configuracion.solvers_retenidos
+        for estado in armados[: max(sobrantes, 0)]:
+            estado.solver = None
+
+    def resultado(
+        self, estado: _EstadoInstancia
+    ) -> Tuple[SolucionAnotada, float, float, EstadoResolucion]:
+        assert estado.objetivo is not None and estado.valores is not None
+        estado.solver = None
+
+        return (
+            estado.modelo.anotar_solucion(estado.valores),
+            estado.objetivo,
+            estado.uso.tiempo,
+            EstadoResolucion(optima=estado.optima, gap=estado.gap, cota=estado.cota),
+        )
+
+    def tabla_uso(self) -> pd.DataFrame:
+        """Uso del presupuesto de cada instancia del último lote"""
+        return pd.DataFrame([vars(uso) for uso in self.uso])
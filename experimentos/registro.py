@@ -0,0 +1,50 @@
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict
+
+
+class RegistroResultados:
+    """
+    Registro de sólo agregado de los resultados de un experimento, con un
+    registro `(clave, resultado)` pickleado por instancia resuelta.
+
+    Cada registro se escribe a disco apenas se agrega, de forma que una
+    interrupción sólo pierde la instancia que se estaba resolviendo.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def cargar(self) -> Dict[str, Any]:
+        """
+        Clave -> resultado de los registros guardados. Si el último registro quedó
+        incompleto (porque se interrumpió su escritura), se descarta.
+        """
+        resultados: Dict[str, Any] = {}
+        if not self.path.exists():
+            return resultados
+
+        with open(self.path, "rb") as f:
+            completos = 0
+            while True:
+                try:
+                    clave, resultado = pickle.load(f)
+                except (EOFError, pickle.UnpicklingError):
+                    break
+
+                resultados[clave] = resultado
+                completos = f.tell()
+
+        if completos < self.path.stat().st_size:
+            # Se trunca el registro incompleto, para poder seguir agregando
+            with open(self.path, "r+b") as f:
+                f.truncate(completos)
+
+        return resultados
+
+    def agregar(self, clave: str, resultado: Any) -> None:
+        with open(self.path, "ab") as f:
+            pickle.dump((clave, resultado), f)
+            f.flush()
+            os.fsync(f.fileno())
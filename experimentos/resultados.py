@@ -0,0 +1,205 @@
+import pickle
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union, overload
+
+import numpy as np
+
+sys.path.append("..")
+
+from src.instancia import InstanciaAsignacionCuadrillas
+from src.solucion import SolucionAnotada
+
+
+class SolucionesCompactas(Sequence):
+    """
+    Soluciones guardadas sólo como sus asignaciones no nulas (ver
+    `SolucionAnotada.asignaciones`), que se anotan recién al accederlas.
+    """
+
+    def __init__(
+        self,
+        instancias: List[InstanciaAsignacionCuadrillas],
+        asignaciones: np.ndarray,
+        indptr: np.ndarray,
+    ) -> None:
+        """
+        Las asignaciones de la solución `s` son las filas
+        `asignaciones[indptr[s]:indptr[s + 1]]`.
+        """
+        self.instancias = instancias
+        self.asignaciones = asignaciones
+        self.indptr = indptr
+
+        self.anotadas: Dict[int, SolucionAnotada] = {}
+
+    @staticmethod
+    def desde_asignaciones(
+        instancias: List[InstanciaAsignacionCuadrillas],
+        asignaciones: List[np.ndarray],
+    ) -> "SolucionesCompactas":
+        return SolucionesCompactas(
+            instancias,
+            (
+                np.concatenate(asignaciones).astype(np.int32)
+                if len(asignaciones) > 0
+                else np.zeros((0, 4), dtype=np.int32)
+            ),
+            np.cumsum([0] + [len(asignacion) for asignacion in asignaciones]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.instancias)
+
+    @overload
+    def __getitem__(self, indice: int) -> SolucionAnotada: ...
+
+    @overload
+    def __getitem__(self, indice: slice) -> List[SolucionAnotada]: ...
+
+    def __getitem__(
+        self, indice: Union[int, slice]
+    ) -> Union[SolucionAnotada, List[SolucionAnotada]]:
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+
+        if indice not in self.anotadas:
+            self.anotadas[indice] = SolucionAnotada.desde_asignaciones(
+                self.instancias[indice],
+                self.asignaciones[self.indptr[indice] : self.indptr[indice + 1]],
+            )
+        return self.anotadas[indice]
+
+
+@dataclass
+class EstadoResolucion:
+    """Estado en que terminó la resolución de una instancia"""
+
+    """Si se probó la optimalidad de la solución"""
+    optima: bool
+
+    """Gap relativo entre el objetivo de la solución y la mejor cota"""
+    gap: float
+
+    cota: float
+
+    @staticmethod
+    def desde_cota(
+        objetivo: float, cota: float, tolerancia: float = 1e-4
+    ) -> "EstadoResolucion":
+        """Estado de una solución con una cota conocida, con el gap relativo de CPLEX"""
+        gap = abs(cota - objetivo) / (1e-10 + abs(objetivo))
+        return EstadoResolucion(optima=gap <= tolerancia, gap=gap, cota=cota)
+
+
+@dataclass
+class ResultadosExperimento:
+    instancias: List[InstanciaAsignacionCuadrillas]
+    soluciones: Sequence
+    objetivos: List[float]
+    tiempos: List[float]
+
+    # Huella de la configuración con la que se resolvieron las instancias
+    configuracion: Optional[str] = None
+
+    # Los resultados anteriores a que se registraran no los tienen
+    estados: Optional[List[EstadoResolucion]] = None
+
+    # Qué resultados se tomaron de la cache compartida entre experimentos: su
+    # tiempo es el que se midió al resolverlos en otra ejecución (None si no se
+    # registró)
+    desde_cache: Optional[List[bool]] = None
+
+    def guardar(self, path: Path, comprimir: bool = True) -> None:
+        """
+        Guarda los resultados en un `.npz`: las instancias en su formato de texto,
+        las soluciones como sus asignaciones no nulas y las métricas como arreglos.
+        """
+        if isinstance(self.soluciones, SolucionesCompactas):
+            soluciones = self.soluciones
+        else:
+            soluciones = SolucionesCompactas.desde_asignaciones(
+                self.instancias,
+                [solucion.asignaciones() for solucion in self.soluciones],
+            )
+
+        textos = [instancia.a_texto().encode() for instancia in self.instancias]
+
+        (np.savez_compressed if comprimir else np.savez)(
+            path,
+            instancias=np.frombuffer(b"".join(textos), dtype=np.uint8),
+            indptr_instancias=np.cumsum([0] + [len(texto) for texto in textos]),
+            asignaciones=soluciones.asignaciones,
+            indptr_asignaciones=soluciones.indptr,
+            objetivos=np.asarray(self.objetivos, dtype=float),
+            tiempos=np.asarray(self.tiempos, dtype=float),
+            configuracion=np.array(self.configuracion or ""),
+            **(
+                {
+                    "optimas": np.array([e.optima for e in self.estados], dtype=bool),
+                    "gaps": np.array([e.gap for e in self.estados], dtype=float),
+                    "cotas": np.array([e.cota for e in self.estados], dtype=float),
+                }
+                if self.estados is not None
+                else {}
+            ),
+            **(
+                {"desde_cache": np.array(self.desde_cache, dtype=bool)}
+                if self.desde_cache is not None
+                else {}
+            ),
+        )
+
+    @staticmethod
+    def cargar(path: Path) -> "ResultadosExperimento":
+        """
+        Carga resultados guardados con `guardar`, o pickleados (el formato
+        anterior) si el archivo no es un `.npz`.
+        """
+        if path.suffix != ".npz":
+            with open(path, "rb") as f:
+                return pickle.load(f)
+
+        with np.load(path) as datos:
+            textos = datos["instancias"].tobytes()
+            indptr = datos["indptr_instancias"]
+            instancias = [
+                InstanciaAsignacionCuadrillas.desde_texto(
+                    textos[indptr[s] : indptr[s + 1]].decode()
+                )
+                for s in range(len(indptr) - 1)
+            ]
+
+            return ResultadosExperimento(
+                instancias=instancias,
+                soluciones=SolucionesCompactas(
+                    instancias, datos["asignaciones"], datos["indptr_asignaciones"]
+                ),
+                objetivos=datos["objetivos"].tolist(),
+                tiempos=datos["tiempos"].tolist(),
+                configuracion=str(datos["configuracion"]) or None,
+                estados=(
+                    [
+                        EstadoResolucion(optima=bool(optima), gap=gap, cota=cota)
+                        for optima, gap, cota in zip(
+                            datos["optimas"],
+                            datos["gaps"].tolist(),
+                            datos["cotas"].tolist(),
+                        )
+                    ]
+                    if "optimas" in datos.files
+                    else None
+                ),
+                desde_cache=(
+                    datos["desde_cache"].tolist()
+                    if "desde_cache" in datos.files
+                    else None
+                ),
+            )
@@ -0,0 +1,128 @@
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append("..")
+
+from resultados import ResultadosExperimento, SolucionesCompactas
+
+
+class TablaResultados:
+    """
+    Tabla columnar de los resultados de un experimento, con una fila por
+    instancia.
+
+    Cada columna es un `.npy` en el directorio de la tabla, que se abre
+    memory-mapped recién cuando se la pide, así que consultar una métrica no
+    requiere cargar las soluciones ni el resto de las columnas.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.abiertas: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def escribir(path: Path, resultados: ResultadosExperimento) -> "TablaResultados":
+        """Escribe la tabla de los resultados, reemplazando la que hubiera"""
+        path.mkdir(parents=True, exist_ok=True)
+        for anterior in path.glob("*.npy"):
+            anterior.unlink()
+
+        for nombre, columna in columnas_de(resultados).items():
+            np.save(path / f"{nombre}.npy", columna)
+
+        return TablaResultados(path)
+
+    @property
+    def columnas(self) -> List[str]:
+        return sorted(columna.stem for columna in self.path.glob("*.npy"))
+
+    def __len__(self) -> int:
+        return len(self["objetivo"])
+
+    def __getitem__(self, columna: str) -> np.ndarray:
+        if columna not in self.abiertas:
+            self.abiertas[columna] = np.load(
+                self.path / f"{columna}.npy", mmap_mode="r"
+            )
+        return self.abiertas[columna]
+
+    def seleccionar(
+        self, *columnas: str, filas: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
+        """
+        DataFrame con las columnas pedidas (o todas), y sólo las filas dadas como
+        máscara o índices, si se indican.
+        """
+        return pd.DataFrame(
+            {
+                columna: (self[columna][filas] if filas is not None else self[columna])
+                for columna in (columnas or self.columnas)
+            }
+        )
+
+
+def columnas_de(resultados: ResultadosExperimento) -> Dict[str, np.ndarray]:
+    """Columnas de la tabla: características de cada instancia y métricas"""
+    instancias = resultados.instancias
+
+    def por_instancia(valor, dtype) -> np.ndarray:  # type: ignore
+        return np.array([valor(instancia) for instancia in instancias], dtype=dtype)
+
+    columnas = {
+        "trabajadores": por_instancia(lambda i: i.cantidad_trabajadores, np.int32),
+        "ordenes": por_instancia(lambda i: len(i.ordenes), np.int32),
+        "conflictos_trabajadores": por_instancia(
+            lambda i: len(i.conflictos_trabajadores), np.int32
+        ),
+        "ordenes_correlativas": por_instancia(
+            lambda i: len(i.ordenes_correlativas), np.int32
+        ),
+        "ordenes_conflictivas": por_instancia(
+            lambda i: len(i.ordenes_conflictivas), np.int32
+        ),
+        "ordenes_repetitivas": por_instancia(
+            lambda i: len(i.ordenes_repetitivas), np.int32
+        ),
+        "beneficio_maximo": por_instancia(lambda i: i.beneficio_maximo(), float),
+        "bmp": por_instancia(lambda i: i.bmp(), float),
+        "ordenes_realizadas": ordenes_realizadas(resultados),
+        "objetivo": np.asarray(resultados.objetivos, dtype=float),
+        "tiempo": np.asarray(resultados.tiempos, dtype=float),
+    }
+
+    if resultados.estados is not None:
+        columnas["optima"] = np.array(
+            [estado.optima for estado in resultados.estados], dtype=bool
+        )
+        columnas["gap"] = np.array(
+            [estado.gap for estado in resultados.estados], dtype=float
+        )
+        columnas["cota"] = np.array(
+            [estado.cota for estado in resultados.estados], dtype=float
+        )
+
+    if resultados.desde_cache is not None:
+        columnas["desde_cache"] = np.array(resultados.desde_cache, dtype=bool)
+
+    return columnas
+
+
+def ordenes_realizadas(resultados: ResultadosExperimento) -> np.ndarray:
+    """Cantidad de órdenes realizadas en cada solución"""
+    soluciones = resultados.soluciones
+    if not isinstance(soluciones, SolucionesCompactas):
+        return np.array(
+            [solucion.cantidad_de_ordenes_realizadas() for solucion in soluciones],
+            dtype=np.int32,
+        )
+
+    # Pares (solución, orden) distintos entre las asignaciones, sin anotarlas
+    solucion_de_fila = np.repeat(np.arange(len(soluciones)), np.diff(soluciones.indptr))
+    pares = np.unique(
+        np.stack([solucion_de_fila, soluciones.asignaciones[:, 0]], axis=1), axis=0
+    )
+    return np.bincount(pares[:, 0], minlength=len(soluciones)).astype(np.int32)
@@ -1,7 +1,21 @@
 import argparse
+import sys
+from dataclasses import replace
+from pathlib import Path
 from pprint import pprint
 
+from src.descomposicion import Benders
+from src.evaluacion import EvaluadorCronogramas, LoteCronogramas
+from src.heuristicas import (
+    LNS,
+    ConfiguracionBusquedaLocal,
+    ConfiguracionLNS,
+    ConfiguracionRelaxAndFix,
+    HeuristicaBusquedaLocal,
+    RelaxAndFix,
+)
 from src.instancia import InstanciaAsignacionCuadrillas
+from src.lagrangeano import RelajacionLagrangeana
 from src.modelo import ModeloAsignacionCuadrillas
 from src.modelo.modelo import ConfiguracionAsignacionCuadrillas
 from src.modelo.restricciones_deseables import (
@@ -12,6 +26,15 @@ from src.modelo.restricciones_deseables import (
     EvitarRepeticiones,
     MultarRepeticiones,
 )
+from src.portafolio import contar_ganadoras, resolver_portafolio
+from src.solver import (
+    PRIORIDADES_ESTRUCTURALES,
+    ConfiguracionCPLEX,
+    ConfiguracionPool,
+    DireccionBranching,
+    ModoRestriccionesPerezosas,
+    PrioridadBranching,
+)
 
 parser = argparse.ArgumentParser(
     description="Resuelve el problema de asignación de cuadrillas"
@@ -43,6 +66,134 @@ parser.add_argument(
     default=None,
     help="Multa por repeticiones",
 )
+parser.add_argument(
+    "--perezosas",
+    type=str,
+    default="matriz",
+    help="Cómo cargar las restricciones de conflictos y órdenes conflictivas",
+    choices=["matriz", "pool", "callback"],
+)
+parser.add_argument(
+    "--heuristica-reparacion",
+    type=int,
+    default=0,
+    help="Cada cuántas llamadas se reparan las relajaciones en incumbentes (0 la desactiva)",
+)
+parser.add_argument(
+    "--prioridades",
+    type=str,
+    nargs="*",
+    default=[],
+    help="Familias de variables para el branching, de mayor a menor prioridad "
+    "(un sufijo + o - indica la dirección preferida, p. ej. r+ w a), o "
+    "'estructurales' para las que aprovechan la estructura del modelo",
+)
+parser.add_argument(
+    "--prioridad-beneficio",
+    action="store_true",
+    help="Priorizar las variables de las órdenes de mayor beneficio",
+)
+parser.add_argument(
+    "--alternativas",
+    type=int,
+    default=None,
+    help="Cantidad de cronogramas casi óptimos alternativos a buscar",
+)
+parser.add_argument(
+    "--gap-alternativas",
+    type=float,
+    default=0.05,
+    help="Gap relativo máximo de los cronogramas alternativos",
+)
+parser.add_argument(
+    "--diversidad-alternativas",
+    type=float,
+    default=None,
+    help="Cantidad mínima de variables r que cambian respecto del mejor cronograma",
+)
+parser.add_argument(
+    "--busqueda-local",
+    type=float,
+    default=None,
+    help="Resolver sin MIP, con la heurística de búsqueda local durante estos segundos",
+)
+parser.add_argument(
+    "--lns",
+    type=float,
+    default=None,
+    help="Mejorar un incumbente goloso con LNS sobre el modelo durante estos segundos",
+)
+parser.add_argument(
+    "--lns-subproblema",
+    type=float,
+    default=5.0,
+    help="Tiempo límite de cada subproblema del LNS en segundos",
+)
+parser.add_argument(
+    "--relax-and-fix",
+    type=int,
+    default=None,
+    help="Resolver con relax-and-fix, con esta cantidad de días enteros por ventana",
+)
+parser.add_argument(
+    "--tiempo-ventana",
+    type=float,
+    default=None,
+    help="Tiempo límite de cada ventana del relax-and-fix en segundos",
+)
+parser.add_argument(
+    "--cota-lagrangeana",
+    action="store_true",
+    help="Calcular una cota superior por relajación lagrangeana y usarla como corte",
+)
+parser.add_argument(
+    "--lp-only",
+    action="store_true",
+    help="Sólo resolver la relajación lineal y fijar variables por costos reducidos",
+)
+parser.add_argument(
+    "--incumbente",
+    type=float,
+    default=None,
+    help="Objetivo de una solución conocida para fijar variables (por defecto, "
+    "el de un cronograma goloso)",
+)
+parser.add_argument(
+    "--exportar",
+    type=str,
+    default=None,
+    help="Path donde escribir el MIP reducido (.lp o .mps)",
+)
+parser.add_argument(
+    "--benders",
+    action="store_true",
+    help="Resolver con descomposición de Benders: el maestro ubica las órdenes y "
+    "el subproblema asigna los trabajadores",
+)
+parser.add_argument(
+    "--portafolio",
+    type=float,
+    default=None,
+    help="Resolver con un portafolio de configuraciones en paralelo, con este "
+    "tiempo límite en segundos",
+)
+parser.add_argument(
+    "--registro-portafolio",
+    type=str,
+    default=None,
+    help="Path del registro (JSON por línea) de las configuraciones ganadoras del "
+    "portafolio, cuyas victorias se muestran al terminar",
+)
+parser.add_argument(
+    "--verificar",
+    action="store_true",
+    help="Recalcular el objetivo y las restricciones violadas de la solución sin el MIP",
+)
+parser.add_argument(
+    "--historial",
+    action="store_true",
+    help="Mostrar el (tiempo, objetivo) de cada mejora del incumbente",
+)
 
 args = parser.parse_args()
 
@@ -59,26 +210,217 @@ estrategia_repeticiones = {
 }[args.repeticiones]
 
 
+if args.prioridades == ["estructurales"]:
+    prioridades_branching = PRIORIDADES_ESTRUCTURALES
+else:
+    prioridades_branching = tuple(
+        PrioridadBranching(
+            familia.rstrip("+-"),
+            {
+                "+": DireccionBranching.ARRIBA,
+                "-": DireccionBranching.ABAJO,
+            }.get(familia[-1], DireccionBranching.GLOBAL),
+        )
+        for familia in args.prioridades
+    )
+
+
 instancia = InstanciaAsignacionCuadrillas.leer_texto(args.instancia)
 
 pprint(instancia)
 print("Cota superior:", instancia.bmp())
 
+configuracion_modelo = ConfiguracionAsignacionCuadrillas(
+    estrategia_conflictos=estrategia_conflictos,
+    estrategia_repetitiva=estrategia_repeticiones,
+)
+
+cota_lagrangeana = None
+if args.cota_lagrangeana:
+    cota_lagrangeana = RelajacionLagrangeana(instancia).resolver().cota
+    print("Cota lagrangeana:", cota_lagrangeana)
+
+if args.busqueda_local is not None:
+    objetivo, anotada = HeuristicaBusquedaLocal(
+        instancia,
+        configuracion_modelo,
+        ConfiguracionBusquedaLocal(tiempo_limite=args.busqueda_local),
+    ).resolver()
+
+    print("Función objetivo:", objetivo)
+    anotada.mostrar()
+    sys.exit()
 
-modelo = ModeloAsignacionCuadrillas(
-    instancia,
-    configuracion=ConfiguracionAsignacionCuadrillas(
-        estrategia_conflictos=estrategia_conflictos,
-        estrategia_repetitiva=estrategia_repeticiones,
-    ),
+if args.benders:
+    resultado_benders = Benders(instancia, configuracion_modelo).resolver()
+
+    if resultado_benders is None:
+        print("Benders no encontró una solución")
+        sys.exit(1)
+
+    print("Función objetivo:", resultado_benders.objetivo)
+    print("Cota:", resultado_benders.cota)
+    print("Cortes de factibilidad:", resultado_benders.cortes_factibilidad)
+    print("Cortes de optimalidad:", resultado_benders.cortes_optimalidad)
+    print("Tiempo:", resultado_benders.tiempo)
+    resultado_benders.solucion.mostrar()
+    sys.exit()
+
+
+configuracion_solver = ConfiguracionCPLEX(
+    restricciones_perezosas={
+        "matriz": ModoRestriccionesPerezosas.MATRIZ,
+        "pool": ModoRestriccionesPerezosas.POOL,
+        "callback": ModoRestriccionesPerezosas.CALLBACK,
+    }[args.perezosas],
+    frecuencia_heuristica_reparacion=args.heuristica_reparacion,
+    prioridades_branching=prioridades_branching,
+    prioridad_por_beneficio=args.prioridad_beneficio,
 )
 
-solver = modelo.armar_solver()
+if args.portafolio is not None:
+    registro = (
+        Path(args.registro_portafolio) if args.registro_portafolio is not None else None
+    )
+    resultado_portafolio = resolver_portafolio(
+        instancia,
+        {
+            "matriz": replace(
+                configuracion_solver,
+                restricciones_perezosas=ModoRestriccionesPerezosas.MATRIZ,
+            ),
+            "pool": replace(
+                configuracion_solver,
+                restricciones_perezosas=ModoRestriccionesPerezosas.POOL,
+            ),
+            "callback": replace(
+                configuracion_solver,
+                restricciones_perezosas=ModoRestriccionesPerezosas.CALLBACK,
+            ),
+            "estructurales": replace(
+                configuracion_solver, prioridades_branching=PRIORIDADES_ESTRUCTURALES
+            ),
+        },
+        args.portafolio,
+        configuracion_modelo,
+        registro=registro,
+    )
+
+    if resultado_portafolio is None:
+        print("Ninguna configuración del portafolio encontró una solución")
+        sys.exit(1)
+
+    print("Función objetivo:", resultado_portafolio.objetivo)
+    print("Configuración ganadora:", resultado_portafolio.ganadora)
+    print("Óptima:", resultado_portafolio.optima)
+    print("Tiempo:", resultado_portafolio.tiempo)
+    ModeloAsignacionCuadrillas(instancia, configuracion_modelo).anotar_solucion(
+        resultado_portafolio.valores
+    ).mostrar()
+
+    if registro is not None:
+        print("Victorias en el registro:")
+        for nombre, victorias in contar_ganadoras(registro).items():
+            print(f"  {nombre}: {victorias}")
+    sys.exit()
+
+
+modelo = ModeloAsignacionCuadrillas(instancia, configuracion=configuracion_modelo)
+
+solver = modelo.armar_solver(configuracion_solver)
+
+if cota_lagrangeana is not None:
+    solver.acotar_objetivo(cota_lagrangeana)
+
+if args.lp_only:
+    incumbente = args.incumbente
+    if incumbente is None:
+        incumbente = (
+            HeuristicaBusquedaLocal(instancia, configuracion_modelo)
+            .construir()
+            .objetivo()
+        )
 
-objetivo, valores = solver.resolver()
+    cota, fijadas = solver.fijar_por_costos_reducidos(incumbente)
+
+    print("Cota de la relajación lineal:", cota)
+    print("Incumbente:", incumbente)
+    print(f"Variables fijadas: {len(fijadas)} de {len(modelo.variables)}")
+
+    if args.exportar is not None:
+        solver.exportar(Path(args.exportar))
+    sys.exit()
+
+if args.lns is not None:
+    lns = LNS(
+        modelo,
+        solver,
+        ConfiguracionLNS(
+            tiempo_limite=args.lns, tiempo_subproblema=args.lns_subproblema
+        ),
+    )
+    objetivo, valores = lns.resolver()
+    historial = lns.historial
+elif args.relax_and_fix is not None:
+    resultado = RelaxAndFix(
+        modelo,
+        solver,
+        ConfiguracionRelaxAndFix(
+            dias_por_ventana=args.relax_and_fix,
+            tiempo_ventana=args.tiempo_ventana,
+        ),
+    ).resolver()
+
+    if resultado is None:
+        print("El relax-and-fix no encontró una solución")
+        sys.exit(1)
+
+    print("Cota de la relajación lineal:", resultado.cota_lp)
+    print("Gap:", resultado.gap)
+    print("Tiempo:", resultado.tiempo)
+    objetivo, valores = resultado.objetivo, resultado.valores
+    historial = [(resultado.tiempo, resultado.objetivo)]
+else:
+    if args.historial:
+        solver.registrar_historial()
+    objetivo, valores = solver.resolver()
+    historial = solver.historial()
 
 
 print("Función objetivo:", objetivo)
 
+if args.historial:
+    print("Historial (tiempo, objetivo):")
+    for tiempo, valor in historial:
+        print(f"  {tiempo:.2f}s: {valor}")
+
+print("Restricciones perezosas (cargadas / separadas):")
+for familia, reporte in solver.reporte_restricciones_perezosas().items():
+    print(f"  {familia}: {reporte.filas_cargadas} / {reporte.filas_separadas}")
+
 anotada = modelo.anotar_solucion(valores)
 anotada.mostrar()
+
+if args.verificar:
+    objetivos, violaciones = EvaluadorCronogramas(
+        instancia, configuracion_modelo
+    ).evaluar(LoteCronogramas.desde_soluciones(instancia, [anotada]))
+
+    print("Objetivo recalculado:", objetivos[0])
+    print("Restricciones violadas:")
+    for familia, cantidad in violaciones.por_familia().items():
+        print(f"  {familia}: {cantidad[0]}")
+
+if args.alternativas is not None:
+    alternativas = modelo.soluciones_alternativas(
+        solver,
+        ConfiguracionPool(
+            cantidad=args.alternativas,
+            gap_relativo=args.gap_alternativas,
+            diversidad_minima=args.diversidad_alternativas,
+        ),
+    )
+
+    for n, alternativa in enumerate(alternativas, start=1):
+        print(f"Alternativa {n}:")
+        alternativa.mostrar()
@@ -0,0 +1,242 @@
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .modelo.modelo import ModeloAsignacionCuadrillas, familia_de
+from .solver import Solver
+
+
+@dataclass
+class PuntoBarrido:
+    """Solución del modelo para un valor de la penalización"""
+
+    penalizacion: float
+    objetivo: float
+
+    """Objetivo sin las multas barridas (beneficio menos remuneraciones y el
+    resto de las multas)"""
+    beneficio: float
+
+    """Cantidad de variables de multa activas de las familias barridas"""
+    multas: float
+
+    conflictos: int
+    repeticiones: int
+    ordenes_realizadas: int
+
+    valores: List[float]
+
+    """Si se resolvió, o se dedujo de los puntos vecinos sin resolver"""
+    resuelto: bool = True
+    tiempo: float = 0.0
+
+    def objetivo_con(self, penalizacion: float) -> float:
+        """Objetivo de la solución con otro valor de la penalización"""
+        return self.beneficio - penalizacion * self.multas
+
+
+class BarridoPenalizaciones:
+    """
+    Resuelve una instancia para muchos valores de la penalización de
+    `MultarConflictos` y/o `MultarRepeticiones` sobre un único modelo armado,
+    cambiando sólo los coeficientes del objetivo de las variables de multa.
+
+    Como la penalización no cambia la región factible, cada solución es un MIP
+    start factible para la siguiente. Además, el objetivo óptimo es el máximo de
+    las rectas `beneficio - penalizacion * multas` de las soluciones, y por lo
+    tanto convexo y lineal a trozos en la penalización: si la solución de un
+    extremo de un intervalo es óptima también en el otro, lo es en todo el
+    intervalo, y no hace falta resolver los valores intermedios. Esto supone que
+    las resoluciones son óptimas (a menos de la tolerancia).
+    """
+
+    def __init__(
+        self,
+        modelo: ModeloAsignacionCuadrillas,
+        solver: Solver,
+        conflictos: bool = True,
+        repeticiones: bool = True,
+        tolerancia: float = 1e-6,
+    ) -> None:
+        """
+        El modelo debe haberse armado con las estrategias que multan las familias
+        que se barren (`conflictos` y/o `repeticiones`); las multas de la otra
+        familia, si la hay, quedan con su penalización original.
+        """
+        self.modelo = modelo
+        self.solver = solver
+        self.tolerancia = tolerancia
+
+        familias = [familia_de(variable.nombre) for variable in modelo.variables]
+        self.indices_conflictos = [i for i, f in enumerate(familias) if f == "c"]
+        self.indices_repeticiones = [i for i, f in enumerate(familias) if f == "re"]
+        self.indices_realizacion = modelo.indices_realizacion()
+
+        self.indices_barridos = (self.indices_conflictos if conflictos else []) + (
+            self.indices_repeticiones if repeticiones else []
+        )
+        assert len(self.indices_barridos) > 0, "El modelo no multa ninguna familia"
+
+    def aplicar(self, penalizacion: float) -> None:
+        """Cambia la penalización de las multas barridas en el objetivo del solver"""
+        self.solver.cpx.objective.set_linear(
+            [(indice, -penalizacion) for indice in self.indices_barridos]
+        )
+
+    def resolver(
+        self, penalizacion: float, inicio: Optional[Sequence[float]] = None
+    ) -> PuntoBarrido:
+        """Resuelve con la penalización dada, partiendo de `inicio` si se indica"""
+        self.aplicar(penalizacion)
+        if inicio is not None:
+            self.solver.establecer_inicio(inicio)
+
+        antes = time.perf_counter()
+        objetivo, valores = self.solver.resolver()
+        despues = time.perf_counter()
+
+        x = np.asarray(valores)
+        multas = float(x[self.indices_barridos].sum())
+
+        return PuntoBarrido(
+            penalizacion=penalizacion,
+            objetivo=objetivo,
+            beneficio=objetivo + penalizacion * multas,
+            multas=multas,
+            conflictos=int(round(x[self.indices_conflictos].sum())),
+            repeticiones=int(round(x[self.indices_repeticiones].sum())),
+            ordenes_realizadas=int(round(x[self.indices_realizacion].sum())),
+            valores=valores,
+            tiempo=despues - antes,
+        )
+
+    def es_optima_en(self, punto: PuntoBarrido, otro: PuntoBarrido) -> bool:
+        """Si la solución de `punto` también es óptima con la penalización de `otro`"""
+        return punto.objetivo_con(otro.penalizacion) >= otro.objetivo - (
+            self.tolerancia * (1 + abs(otro.objetivo))
+        )
+
+    def barrer(self, penalizaciones: Sequence[float]) -> pd.DataFrame:
+        """
+        Curva de la solución en función de la penalización, con una fila por cada
+        valor dado.
+
+        Se resuelven los extremos y se biseca: si la solución de un extremo de un
+        intervalo es óptima en el otro, los valores intermedios se completan con
+        ella sin resolverlos (con `resuelto` en False).
+        """
+        valores = sorted(set(penalizaciones))
+        puntos: List[Optional[PuntoBarrido]] = [None] * len(valores)
+
+        def completar(menor: int, mayor: int) -> None:
+            a, b = puntos[menor], puntos[mayor]
+            assert a is not None and b is not None
+            if mayor - menor <= 1:
+                return
+
+            for optima, otro in ((a, b), (b, a)):
+                if self.es_optima_en(optima, otro):
+                    for medio in range(menor + 1, mayor):
+                        puntos[medio] = replace(
+                            optima,
+                            penalizacion=valores[medio],
+                            objetivo=optima.objetivo_con(valores[medio]),
+                            resuelto=False,
+                            tiempo=0.0,
+                        )
+                    return
+
+            medio = (menor + mayor) // 2
+            puntos[medio] = self.resolver(valores[medio], inicio=a.valores)
+            completar(menor, medio)
+            completar(medio, mayor)
+
+        originales = self.solver.cpx.objective.get_linear(self.indices_barridos)
+        try:
+            puntos[0] = self.resolver(valores[0])
+            puntos[-1] = self.resolver(valores[-1], inicio=puntos[0].valores)
+            completar(0, len(valores) - 1)
+        finally:
+            self.restaurar(originales)
+
+        return pd.DataFrame(
+            [
+                {
+                    columna: getattr(punto, columna)
+                    for columna in (
+                        "penalizacion",
+                        "objetivo",
+                        "beneficio",
+                        "multas",
+                        "conflictos",
+                        "repeticiones",
+                        "ordenes_realizadas",
+                        "resuelto",
+                        "tiempo",
+                    )
+                }
+                for punto in puntos
+                if punto is not None
+            ]
+        )
+
+    def puntos_de_quiebre(self, minimo: float, maximo: float) -> pd.DataFrame:
+        """
+        Todas las soluciones óptimas distintas para penalizaciones entre `minimo`
+        y `maximo`, con una fila por tramo (`desde`, `hasta`) en el que cada una
+        es óptima. Los puntos de quiebre son los extremos de los tramos.
+
+        Cada punto de quiebre se encuentra resolviendo en la intersección de las
+        rectas de las soluciones de los extremos del intervalo (el método de
+        Eisner y Severance), así que se resuelve dos veces por tramo.
+        """
+
+        def buscar(
+            a: PuntoBarrido, b: PuntoBarrido
+        ) -> Tuple[List[PuntoBarrido], List[float]]:
+            """Soluciones de los tramos entre `a` y `b`, y los quiebres entre ellos"""
+            if a.multas - b.multas <= self.tolerancia:
+                # Misma pendiente: la solución de `a` es óptima en todo el intervalo
+                return [a], []
+
+            interseccion = (a.beneficio - b.beneficio) / (a.multas - b.multas)
+            c = self.resolver(interseccion, inicio=a.valores)
+            if self.es_optima_en(a, c):
+                return [a, b], [interseccion]
+
+            tramos_a, quiebres_a = buscar(a, c)
+            tramos_b, quiebres_b = buscar(c, b)
+            return tramos_a[:-1] + tramos_b, quiebres_a + quiebres_b
+
+        originales = self.solver.cpx.objective.get_linear(self.indices_barridos)
+        try:
+            a = self.resolver(minimo)
+            b = self.resolver(maximo, inicio=a.valores)
+            tramos, quiebres = buscar(a, b)
+        finally:
+            self.restaurar(originales)
+
+        return pd.DataFrame(
+            [
+                {
+                    "desde": desde,
+                    "hasta": hasta,
+                    "beneficio": tramo.beneficio,
+                    "multas": tramo.multas,
+                    "conflictos": tramo.conflictos,
+                    "repeticiones": tramo.repeticiones,
+                    "ordenes_realizadas": tramo.ordenes_realizadas,
+                }
+                for tramo, desde, hasta in zip(
+                    tramos, [minimo] + quiebres, quiebres + [maximo]
+                )
+            ]
+        )
+
+    def restaurar(self, coeficientes: List[float]) -> None:
+        self.solver.cpx.objective.set_linear(
+            list(zip(self.indices_barridos, coeficientes))
+        )
@@ -0,0 +1,155 @@
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from cplex.callbacks import HeuristicCallback, LazyConstraintCallback, MIPInfoCallback
+from scipy.sparse import csr_matrix
+
+if TYPE_CHECKING:
+    from .solver import FilaPerezosa
+
+
+TOL_VIOLACION = 1e-6
+
+
+class SeparadorRestriccionesPerezosas(LazyConstraintCallback):
+    """
+    Callback que, para cada solución candidata, agrega las filas violadas de las
+    familias de restricciones perezosas.
+
+    Las filas se indexan de antemano en una matriz rala por familia, de forma que
+    encontrar las violadas es un único producto matriz-vector.
+    """
+
+    def inicializar(
+        self, familias: Dict[str, List["FilaPerezosa"]], cantidad_variables: int
+    ) -> None:
+        self.familias = familias
+        self.matrices: Dict[str, csr_matrix] = {}
+        self.rhs: Dict[str, np.ndarray] = {}
+        self.sentidos: Dict[str, np.ndarray] = {}
+        # familia -> máscara de filas ya separadas
+        self.separadas: Dict[str, np.ndarray] = {}
+
+        for familia, filas in familias.items():
+            indptr = np.cumsum([0] + [len(indices) for indices, _, _, _ in filas])
+            self.matrices[familia] = csr_matrix(
+                (
+                    np.array(
+                        [coef for _, coefs, _, _ in filas for coef in coefs],
+                        dtype=float,
+                    ),
+                    np.array(
+                        [indice for indices, _, _, _ in filas for indice in indices],
+                        dtype=int,
+                    ),
+                    indptr,
+                ),
+                shape=(len(filas), cantidad_variables),
+            )
+            self.rhs[familia] = np.array([rhs for _, _, _, rhs in filas], dtype=float)
+            self.sentidos[familia] = np.array([sentido for _, _, sentido, _ in filas])
+            self.separadas[familia] = np.zeros(len(filas), dtype=bool)
+
+    def cantidad_separadas(self, familia: str) -> int:
+        return int(self.separadas[familia].sum())
+
+    def __call__(self) -> None:
+        x = np.array(self.get_values())
+
+        for familia, matriz in self.matrices.items():
+            izq = matriz @ x
+            rhs = self.rhs[familia]
+            sentidos = self.sentidos[familia]
+
+            violadas = (
+                ((sentidos == "L") & (izq > rhs + TOL_VIOLACION))
+                | ((sentidos == "G") & (izq < rhs - TOL_VIOLACION))
+                | ((sentidos == "E") & (np.abs(izq - rhs) > TOL_VIOLACION))
+            )
+
+            for fila in np.flatnonzero(violadas):
+                indices, coefs, sentido, termino = self.familias[familia][fila]
+                self.add(constraint=[indices, coefs], sense=sentido, rhs=termino)
+
+            self.separadas[familia] |= violadas
+
+
+class HeuristicaReparacion(HeuristicCallback):
+    """
+    Callback que repara la relajación de los nodos del branch-and-bound en una
+    solución factible, y la propone como incumbente si mejora a la actual.
+    """
+
+    def inicializar(
+        self,
+        reparar: Callable[[Sequence[float]], Tuple[float, List[float]]],
+        frecuencia: int,
+    ) -> None:
+        self.reparar = reparar
+        self.frecuencia = frecuencia
+
+        self.llamadas = 0
+        self.incumbentes = 0
+
+    def __call__(self) -> None:
+        self.llamadas += 1
+        if self.llamadas % self.frecuencia != 0:
+            return
+
+        objetivo, valores = self.reparar(self.get_values())
+
+        if (
+            self.has_incumbent()
+            and objetivo <= self.get_incumbent_objective_value() + TOL_VIOLACION
+        ):
+            return
+
+        self.set_solution(
+            [list(range(len(valores))), valores], objective_value=objetivo
+        )
+        self.incumbentes += 1
+
+
+class RegistroIncumbentes(MIPInfoCallback):
+    """
+    Callback que registra el par (tiempo, objetivo) cada vez que cambia el
+    incumbente, para comparar el progreso de la resolución con el de otros métodos.
+
+    CPLEX lo llama periódicamente, por lo que un incumbente que se reemplaza antes
+    de la siguiente llamada puede no quedar registrado.
+    """
+
+    def inicializar(self) -> None:
+        self.historial: List[Tuple[float, float]] = []
+
+    def __call__(self) -> None:
+        if not self.has_incumbent():
+            return
+
+        objetivo = self.get_incumbent_objective_value()
+        if (
+            len(self.historial) > 0
+            and abs(objetivo - self.historial[-1][1]) <= TOL_VIOLACION
+        ):
+            return
+
+        self.historial.append((self.get_time() - self.get_start_time(), objetivo))
+
+
+class CortesBenders(LazyConstraintCallback):
+    """
+    Callback que, para cada solución candidata del maestro de Benders, resuelve el
+    subproblema y agrega los cortes que devuelve `separar`, de forma que toda la
+    descomposición se resuelve en un único branch-and-cut.
+    """
+
+    def inicializar(
+        self, separar: Callable[[Sequence[float]], List["FilaPerezosa"]]
+    ) -> None:
+        self.separar = separar
+        self.cortes = 0
+
+    def __call__(self) -> None:
+        for indices, coefs, sentido, rhs in self.separar(self.get_values()):
+            self.add(constraint=[indices, coefs], sense=sentido, rhs=rhs)
+            self.cortes += 1
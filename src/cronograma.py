@@ -0,0 +1,471 @@
+from itertools import pairwise
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .instancia import COSTOS_REMUNERACION, InstanciaAsignacionCuadrillas
+
+if TYPE_CHECKING:
+    from .modelo.modelo import ConfiguracionAsignacionCuadrillas
+
+
+"""Cantidad máxima de turnos que un trabajador puede trabajar en un día"""
+LIMITE_DIARIO = 4
+
+"""Cantidad máxima de días que un trabajador puede trabajar en la semana"""
+LIMITE_SEMANAL = 5
+
+"""Diferencia máxima entre las órdenes realizadas por dos trabajadores"""
+DIFERENCIA_MAXIMA = 8
+
+"""Órdenes que abarca cada tramo de remuneración (el último no tiene límite)"""
+TAMAÑO_TRAMO = 5
+
+
+def costo_remuneracion(cantidad_ordenes: np.ndarray) -> np.ndarray:
+    """Costo de remunerar a trabajadores que realizan `cantidad_ordenes` órdenes"""
+    cantidad_ordenes = np.asarray(cantidad_ordenes)
+    costo = np.zeros(cantidad_ordenes.shape)
+
+    for tramo, costo_tramo in enumerate(COSTOS_REMUNERACION):
+        cota = TAMAÑO_TRAMO if tramo < len(COSTOS_REMUNERACION) - 1 else np.inf
+        costo += costo_tramo * np.clip(cantidad_ordenes - tramo * TAMAÑO_TRAMO, 0, cota)
+
+    return costo
+
+
+def costo_marginal(cantidad_ordenes: int) -> float:
+    """Costo de que un trabajador que realiza `cantidad_ordenes` realice una más"""
+    tramo = min(cantidad_ordenes // TAMAÑO_TRAMO, len(COSTOS_REMUNERACION) - 1)
+    return COSTOS_REMUNERACION[tramo]
+
+
+class Cronograma:
+    """
+    Asignación compacta de órdenes a (día, turno, trabajadores), que se construye
+    de a una orden por vez.
+
+    Mantiene la ocupación de cada trabajador, de forma que verificar si una
+    asignación respeta las restricciones duras del modelo no requiere recorrer
+    el cronograma entero.
+    """
+
+    def __init__(
+        self,
+        instancia: InstanciaAsignacionCuadrillas,
+        configuracion: "ConfiguracionAsignacionCuadrillas",
+    ) -> None:
+        self.instancia = instancia
+        self.configuracion = configuracion
+
+        self.dias = instancia.indices_dias
+        self.turnos = instancia.indices_turnos
+
+        T = instancia.cantidad_trabajadores
+
+        # (trabajador, día, turno) -> orden (-1 si está libre)
+        self.ocupacion = np.full((T, len(self.dias), len(self.turnos)), -1, dtype=int)
+        # (trabajador, día) -> turnos trabajados
+        self.turnos_por_dia = np.zeros((T, len(self.dias)), dtype=int)
+        # trabajador -> cantidad de órdenes realizadas
+        self.ordenes_por_trabajador = np.zeros(T, dtype=int)
+        # trabajador -> órdenes realizadas
+        self.ordenes_de_trabajador: List[Set[int]] = [set() for _ in range(T)]
+        # orden -> (dia, turno, trabajadores)
+        self.asignacion: Dict[int, Tuple[int, int, FrozenSet[int]]] = {}
+        # Trabajadores que no pueden recibir órdenes (por ejemplo, por ausencia), y
+        # que no cuentan para la diferencia máxima
+        self.ausentes: Set[int] = set()
+
+        self.conflictos: List[Set[int]] = [set() for _ in range(T)]
+        for j1, j2 in instancia.conflictos_trabajadores:
+            self.conflictos[j1].add(j2)
+            self.conflictos[j2].add(j1)
+
+        self.conflictivas: List[Set[int]] = [set() for _ in instancia.indices_ordenes]
+        for i1, i2 in instancia.ordenes_conflictivas:
+            self.conflictivas[i1].add(i2)
+            self.conflictivas[i2].add(i1)
+
+        self.repetitivas: List[Set[int]] = [set() for _ in instancia.indices_ordenes]
+        for i1, i2 in instancia.ordenes_repetitivas:
+            self.repetitivas[i1].add(i2)
+            self.repetitivas[i2].add(i1)
+
+        self.sucesoras: List[List[int]] = [[] for _ in instancia.indices_ordenes]
+        for i1, i2 in instancia.ordenes_correlativas:
+            self.sucesoras[i1].append(i2)
+
+        self.prohibe_conflictos = configuracion.estrategia_conflictos.prohibe_conflictos
+        self.multa_conflictos = configuracion.estrategia_conflictos.penalizacion
+        self.prohibe_repeticiones = (
+            configuracion.estrategia_repetitiva.prohibe_repeticiones
+        )
+        self.multa_repeticiones = configuracion.estrategia_repetitiva.penalizacion
+
+    def posicion(self, k: int, l: int) -> Tuple[int, int]:
+        """Posición del día k y el turno l en los arreglos de ocupación"""
+        return k - self.dias.start, l - self.turnos.start
+
+    def copiar(self) -> "Cronograma":
+        copia = Cronograma.__new__(Cronograma)
+        copia.__dict__.update(self.__dict__)
+
+        copia.ocupacion = self.ocupacion.copy()
+        copia.turnos_por_dia = self.turnos_por_dia.copy()
+        copia.ordenes_por_trabajador = self.ordenes_por_trabajador.copy()
+        copia.ordenes_de_trabajador = [
+            set(ordenes) for ordenes in self.ordenes_de_trabajador
+        ]
+        copia.asignacion = dict(self.asignacion)
+
+        return copia
+
+    ################
+    # Factibilidad #
+    ################
+
+    def trabajador_disponible(self, j: int, i: int, k: int, l: int) -> bool:
+        """
+        Indica si el trabajador j puede sumarse a la orden i el día k en el turno l,
+        considerando sólo las restricciones que dependen de ese trabajador.
+        """
+        d, t = self.posicion(k, l)
+
+        if j in self.ausentes or self.ocupacion[j, d, t] != -1:
+            return False
+
+        if self.turnos_por_dia[j, d] >= LIMITE_DIARIO:
+            return False
+
+        if (
+            self.turnos_por_dia[j, d] == 0
+            and np.count_nonzero(self.turnos_por_dia[j]) >= LIMITE_SEMANAL
+        ):
+            return False
+
+        # Órdenes conflictivas en turnos consecutivos
+        for vecino in (t - 1, t + 1):
+            if (
+                0 <= vecino < len(self.turnos)
+                and self.ocupacion[j, d, vecino] in self.conflictivas[i]
+            ):
+                return False
+
+        if (
+            self.prohibe_repeticiones
+            and self.repetitivas[i] & self.ordenes_de_trabajador[j]
+        ):
+            return False
+
+        return True
+
+    def respeta_correlativas(self, i: int, k: int) -> bool:
+        """
+        Indica si la orden i puede realizarse el día k respecto de sus correlativas.
+
+        Replica la formulación de `restricciones_ordenes_correlativas`: si i1 se
+        realiza el día k, i2 se debe realizar el día k en cada turno que sigue a otro.
+        """
+        return all(
+            self.asignacion.get(i2, (None, None))[:2] == (k, siguiente)
+            for i2 in self.sucesoras[i]
+            for _, siguiente in pairwise(self.turnos)
+        )
+
+    def respeta_diferencia_maxima(self, ordenes_por_trabajador: np.ndarray) -> bool:
+        if len(self.ausentes) > 0:
+            presentes = np.ones(len(ordenes_por_trabajador), dtype=bool)
+            presentes[list(self.ausentes)] = False
+            ordenes_por_trabajador = ordenes_por_trabajador[presentes]
+            if len(ordenes_por_trabajador) == 0:
+                return True
+
+        return (
+            ordenes_por_trabajador.max() - ordenes_por_trabajador.min()
+            <= DIFERENCIA_MAXIMA
+        )
+
+    def puede_asignar(
+        self, i: int, k: int, l: int, trabajadores: Iterable[int]
+    ) -> bool:
+        """
+        Indica si asignar la orden i el día k en el turno l a los trabajadores dados
+        respeta todas las restricciones duras del modelo.
+        """
+        trabajadores = set(trabajadores)
+
+        if (
+            i in self.asignacion
+            or len(trabajadores) != self.instancia.ordenes[i].cant_trab
+        ):
+            return False
+
+        if not all(self.trabajador_disponible(j, i, k, l) for j in trabajadores):
+            return False
+
+        if self.prohibe_conflictos and any(
+            self.conflictos[j] & trabajadores for j in trabajadores
+        ):
+            return False
+
+        if not self.respeta_correlativas(i, k):
+            return False
+
+        ordenes_por_trabajador = self.ordenes_por_trabajador.copy()
+        ordenes_por_trabajador[list(trabajadores)] += 1
+        return self.respeta_diferencia_maxima(ordenes_por_trabajador)
+
+    def puede_quitar(self, i: int) -> bool:
+        """Indica si quitar la orden i deja al cronograma factible"""
+        _, _, trabajadores = self.asignacion[i]
+
+        if any(
+            i in self.sucesoras[predecesora]
+            for predecesora in self.asignacion
+            if predecesora != i
+        ):
+            return False
+
+        ordenes_por_trabajador = self.ordenes_por_trabajador.copy()
+        ordenes_por_trabajador[list(trabajadores)] -= 1
+        return self.respeta_diferencia_maxima(ordenes_por_trabajador)
+
+    #################
+    # Modificación  #
+    #################
+
+    def asignar(self, i: int, k: int, l: int, trabajadores: Iterable[int]) -> None:
+        """Asigna la orden, sin verificar factibilidad (ver `puede_asignar`)"""
+        trabajadores = frozenset(trabajadores)
+        d, t = self.posicion(k, l)
+
+        for j in trabajadores:
+            self.ocupacion[j, d, t] = i
+            self.turnos_por_dia[j, d] += 1
+            self.ordenes_por_trabajador[j] += 1
+            self.ordenes_de_trabajador[j].add(i)
+
+        self.asignacion[i] = (k, l, trabajadores)
+
+    def quitar(self, i: int) -> None:
+        """Quita la orden, sin verificar factibilidad (ver `puede_quitar`)"""
+        k, l, trabajadores = self.asignacion.pop(i)
+        d, t = self.posicion(k, l)
+
+        for j in trabajadores:
+            self.ocupacion[j, d, t] = -1
+            self.turnos_por_dia[j, d] -= 1
+            self.ordenes_por_trabajador[j] -= 1
+            self.ordenes_de_trabajador[j].discard(i)
+
+    def elegir_trabajadores(
+        self,
+        i: int,
+        k: int,
+        l: int,
+        preferencia: Optional[np.ndarray] = None,
+    ) -> Optional[List[int]]:
+        """
+        Elige golosamente trabajadores para la orden i el día k en el turno l:
+        primero los de mayor preferencia, después los que menos multas agregan y
+        por último los que menos órdenes realizan.
+
+        Devuelve None si no hay suficientes trabajadores disponibles.
+        """
+        cant_trab = self.instancia.ordenes[i].cant_trab
+
+        candidatos = sorted(
+            (
+                j
+                for j in self.instancia.indices_trabajadores
+                if self.trabajador_disponible(j, i, k, l)
+            ),
+            key=lambda j: (
+                -preferencia[j] if preferencia is not None else 0,
+                len(self.repetitivas[i] & self.ordenes_de_trabajador[j]),
+                self.ordenes_por_trabajador[j],
+            ),
+        )
+
+        elegidos: List[int] = []
+        for j in candidatos:
+            if len(elegidos) == cant_trab:
+                break
+            if not self.conflictos[j].intersection(elegidos):
+                elegidos.append(j)
+
+        if not self.prohibe_conflictos:
+            # Si faltan trabajadores, se completa con los que están en conflicto
+            for j in candidatos:
+                if len(elegidos) == cant_trab:
+                    break
+                if j not in elegidos:
+                    elegidos.append(j)
+
+        return elegidos if len(elegidos) == cant_trab else None
+
+    def insertar(
+        self,
+        i: int,
+        puntaje_slots: Optional[np.ndarray] = None,
+        preferencia_trabajadores: Optional[np.ndarray] = None,
+    ) -> bool:
+        """
+        Intenta asignar la orden i en el primer (día, turno), de mayor a menor
+        puntaje, en el que sea factible y mejore el objetivo.
+
+        `puntaje_slots` tiene forma (días, turnos) y `preferencia_trabajadores`
+        forma (trabajadores, días, turnos). Devuelve si la orden fue asignada.
+        """
+        if i in self.asignacion or self.instancia.ordenes[i].cant_trab > len(
+            self.instancia.indices_trabajadores
+        ):
+            return False
+
+        if puntaje_slots is None:
+            puntaje_slots = np.zeros((len(self.dias), len(self.turnos)))
+
+        for posicion in np.argsort(-puntaje_slots, axis=None, kind="stable"):
+            d, t = np.unravel_index(posicion, puntaje_slots.shape)
+            k, l = self.dias[d], self.turnos[t]
+
+            trabajadores = self.elegir_trabajadores(
+                i,
+                k,
+                l,
+                (
+                    preferencia_trabajadores[:, d, t]
+                    if preferencia_trabajadores is not None
+                    else None
+                ),
+            )
+
+            if (
+                trabajadores is not None
+                and self.variacion_objetivo_asignar(i, trabajadores) > 0
+                and self.puede_asignar(i, k, l, trabajadores)
+            ):
+                self.asignar(i, k, l, trabajadores)
+                return True
+
+        return False
+
+    ############
+    # Objetivo #
+    ############
+
+    def multas_conflictos(self, trabajadores: Iterable[int]) -> int:
+        """Cantidad de pares de trabajadores en conflicto entre los dados"""
+        trabajadores = set(trabajadores)
+        return sum(len(self.conflictos[j] & trabajadores) for j in trabajadores) // 2
+
+    def multas_repeticiones(self, i: int, trabajadores: Iterable[int]) -> int:
+        """
+        Cantidad de repeticiones que se agregan si los trabajadores dados realizan
+        la orden i
+        """
+        return sum(
+            len(self.repetitivas[i] & self.ordenes_de_trabajador[j])
+            for j in trabajadores
+        )
+
+    def variacion_objetivo_asignar(self, i: int, trabajadores: Iterable[int]) -> float:
+        """Variación de la función objetivo al asignar la orden i a los trabajadores"""
+        trabajadores = list(trabajadores)
+
+        return (
+            self.instancia.ordenes[i].beneficio
+            - sum(costo_marginal(self.ordenes_por_trabajador[j]) for j in trabajadores)
+            - self.multa_conflictos * self.multas_conflictos(trabajadores)
+            - self.multa_repeticiones * self.multas_repeticiones(i, trabajadores)
+        )
+
+    def objetivo(self) -> float:
+        """Valor de la función objetivo del modelo para el cronograma"""
+        beneficio = sum(self.instancia.ordenes[i].beneficio for i in self.asignacion)
+        multa_conflictos = sum(
+            self.multas_conflictos(trabajadores)
+            for _, _, trabajadores in self.asignacion.values()
+        )
+        multa_repeticiones = (
+            sum(
+                len(self.repetitivas[i] & ordenes)
+                for ordenes in self.ordenes_de_trabajador
+                for i in ordenes
+            )
+            // 2
+        )
+
+        return (
+            beneficio
+            - costo_remuneracion(self.ordenes_por_trabajador).sum()
+            - self.multa_conflictos * multa_conflictos
+            - self.multa_repeticiones * multa_repeticiones
+        )
+
+    def valores(self) -> Dict[str, float]:
+        """
+        Valores no nulos de las variables del modelo que corresponden al cronograma.
+        """
+        valores: Dict[str, float] = {}
+
+        for i, (k, l, trabajadores) in self.asignacion.items():
+            valores[f"r_{i}_{k}_{l}"] = 1
+            for j in trabajadores:
+                valores[f"a_{i}_{j}_{k}_{l}"] = 1
+                valores[f"t_{i}_{j}"] = 1
+
+            for j1, j2 in self.instancia.conflictos_trabajadores:
+                if j1 in trabajadores and j2 in trabajadores:
+                    valores[f"c^{j1}_{j2}_{i}"] = 1
+
+        for j in self.instancia.indices_trabajadores:
+            for d, k in enumerate(self.dias):
+                if self.turnos_por_dia[j, d] > 0:
+                    valores[f"d_{j}_{k}"] = 1
+
+            ordenes = self.ordenes_por_trabajador[j]
+            for tramo in range(len(COSTOS_REMUNERACION)):
+                cota = TAMAÑO_TRAMO if tramo < len(COSTOS_REMUNERACION) - 1 else ordenes
+                valor = min(max(ordenes - tramo * TAMAÑO_TRAMO, 0), cota)
+                if valor > 0:
+                    valores[f"o{tramo + 1}_{j}"] = valor
+                if tramo > 0 and ordenes >= tramo * TAMAÑO_TRAMO:
+                    valores[f"w{tramo}_{j}"] = 1
+
+            for i1, i2 in self.instancia.ordenes_repetitivas:
+                if {i1, i2} <= self.ordenes_de_trabajador[j]:
+                    valores[f"re_{i1}_{i2}_{j}"] = 1
+
+        return {nombre: float(valor) for nombre, valor in valores.items()}
+
+
+def construir_cronograma(
+    instancia: InstanciaAsignacionCuadrillas,
+    configuracion: "ConfiguracionAsignacionCuadrillas",
+    puntaje_ordenes: np.ndarray,
+    puntaje_slots: Optional[np.ndarray] = None,
+    preferencia_trabajadores: Optional[np.ndarray] = None,
+) -> Cronograma:
+    """
+    Construye golosamente un cronograma, insertando las órdenes de mayor a menor
+    puntaje.
+
+    `puntaje_slots` tiene forma (órdenes, días, turnos) y `preferencia_trabajadores`
+    forma (órdenes, trabajadores, días, turnos).
+    """
+    cronograma = Cronograma(instancia, configuracion)
+
+    for i in np.argsort(-np.asarray(puntaje_ordenes), kind="stable"):
+        cronograma.insertar(
+            int(i),
+            puntaje_slots[i] if puntaje_slots is not None else None,
+            (
+                preferencia_trabajadores[i]
+                if preferencia_trabajadores is not None
+                else None
+            ),
+        )
+
+    return cronograma
@@ -0,0 +1,16 @@
+from .benders import Benders, ResultadoBenders
+from .generacion_columnas import (
+    ConfiguracionGeneracionColumnas,
+    GeneracionColumnas,
+    HorarioSemanal,
+    ResultadoGeneracionColumnas,
+)
+
+__all__ = [
+    "Benders",
+    "ResultadoBenders",
+    "ConfiguracionGeneracionColumnas",
+    "GeneracionColumnas",
+    "HorarioSemanal",
+    "ResultadoGeneracionColumnas",
+]
@@ -0,0 +1,511 @@
+import time
+from dataclasses import dataclass, replace
+from itertools import pairwise
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import cplex
+import networkx as nx
+import numpy as np
+
+from ..callbacks import CortesBenders
+from ..cronograma import (
+    DIFERENCIA_MAXIMA,
+    LIMITE_DIARIO,
+    LIMITE_SEMANAL,
+    TAMAÑO_TRAMO,
+    construir_cronograma,
+    costo_remuneracion,
+)
+from ..instancia import COSTOS_REMUNERACION, InstanciaAsignacionCuadrillas
+from ..modelo.modelo import (
+    ConfiguracionAsignacionCuadrillas,
+    ModeloAsignacionCuadrillas,
+)
+from ..solucion import SolucionAnotada
+from ..solver import ConfiguracionCPLEX, FilaPerezosa
+
+"""Tolerancia para considerar que la cota del maestro subestima el costo"""
+TOL_CORTE = 1e-6
+
+
+@dataclass
+class ResultadoBenders:
+    """Resultado de la descomposición de Benders"""
+
+    objetivo: float
+    valores: List[float]
+    solucion: SolucionAnotada
+
+    """Mejor cota superior del branch-and-cut del maestro"""
+    cota: float
+
+    cortes_factibilidad: int
+    cortes_optimalidad: int
+
+    """Cantidad de ubicaciones de órdenes distintas para las que se resolvió el subproblema"""
+    subproblemas: int
+
+    tiempo: float
+
+
+class Benders:
+    """
+    Descomposición de Benders basada en lógica (logic-based Benders).
+
+    El maestro decide en qué (día, turno) se realiza cada orden (`r_ikl`), con una
+    variable η que estima el costo de la asignación de trabajadores: la
+    remuneración más las multas. Incluye restricciones válidas de capacidad (por
+    turno, por día y por semana), la cota de Jensen de la remuneración, ya que
+    repartir la carga total en partes iguales es lo más barato posible, y cotas de
+    las multas (ver `cotas_multas`).
+
+    Para cada solución candidata del maestro, un callback de restricciones
+    perezosas resuelve el subproblema de asignar trabajadores a las órdenes ya
+    ubicadas, que es el modelo compacto con las `r` fijas. Si es infactible agrega
+    un corte de factibilidad, y si η subestima su costo, un corte de optimalidad.
+
+    El subproblema se resuelve primero sin la diferencia máxima entre
+    trabajadores, que es lo único que lo hace no monótono, para obtener cortes que
+    valen para todos los superconjuntos de la ubicación (ver `evaluar`). Los
+    resultados del subproblema se guardan por ubicación.
+    """
+
+    def __init__(
+        self,
+        instancia: InstanciaAsignacionCuadrillas,
+        configuracion_modelo: ConfiguracionAsignacionCuadrillas = ConfiguracionAsignacionCuadrillas.default(),
+        configuracion_cplex: ConfiguracionCPLEX = ConfiguracionCPLEX(),
+    ) -> None:
+        self.instancia = instancia
+        self.configuracion_modelo = configuracion_modelo
+        self.configuracion_cplex = configuracion_cplex
+
+        self.beneficios = np.array([orden.beneficio for orden in instancia.ordenes])
+        self.cantidades = np.array([orden.cant_trab for orden in instancia.ordenes])
+        self.realizables = self.cantidades <= instancia.cantidad_trabajadores
+
+        estrategia_conflictos = configuracion_modelo.estrategia_conflictos
+        self.prohibe_conflictos = estrategia_conflictos.prohibe_conflictos
+        self.multa_conflictos = estrategia_conflictos.penalizacion
+        estrategia_repeticiones = configuracion_modelo.estrategia_repetitiva
+        self.prohibe_repeticiones = estrategia_repeticiones.prohibe_repeticiones
+        self.multa_repeticiones = estrategia_repeticiones.penalizacion
+
+        # El subproblema se resuelve a optimalidad y sin tiempo límite, para que
+        # los cortes sean válidos
+        self.modelo = ModeloAsignacionCuadrillas(instancia, configuracion_modelo)
+        self.subproblema = self.modelo.armar_solver(
+            replace(configuracion_cplex, tiempo_limite=None)
+        )
+        self.subproblema.cpx.parameters.mip.tolerances.mipgap.set(0.0)
+        self.indices_r_subproblema = self.modelo.indices_realizacion().ravel()
+        self.cotas_r_subproblema = np.array(
+            [
+                self.modelo.variables[indice].cota_superior
+                for indice in self.indices_r_subproblema
+            ]
+        )
+
+        self.filas_diferencia = self.modelo.filas_diferencia_maxima()
+        # (trabajador, tramo) -> índice de `o{tramo}_{j}`
+        self.indices_remuneracion = np.array(
+            [
+                [
+                    self.modelo.indice_de(f"o{tramo}_{j}")
+                    for tramo in range(1, len(COSTOS_REMUNERACION) + 1)
+                ]
+                for j in instancia.indices_trabajadores
+            ]
+        )
+
+        # ubicación (posiciones de r en 1) -> resultado de `evaluar`
+        self.evaluadas: Dict[
+            FrozenSet[int],
+            Tuple[Optional[float], Optional[Tuple[float, List[float]]]],
+        ] = {}
+        self.cortes_factibilidad = 0
+        self.cortes_optimalidad = 0
+
+        self.armar_maestro()
+
+    def armar_maestro(self) -> None:
+        cpx = cplex.Cplex()
+        self.configuracion_cplex.aplicar(cpx)
+        cpx.objective.set_sense(cpx.objective.sense.maximize)
+        self.maestro = cpx
+
+        instancia = self.instancia
+        O, D, L = (
+            len(instancia.ordenes),
+            len(instancia.indices_dias),
+            len(instancia.indices_turnos),
+        )
+        T = instancia.cantidad_trabajadores
+
+        # r_ikl, en el mismo orden que en `indices_realizacion` del modelo
+        self.indices_r = np.arange(O * D * L).reshape(O, D, L)
+        cpx.variables.add(
+            obj=[float(self.beneficios[i]) for i in range(O) for _ in range(D * L)],
+            lb=[0.0] * (O * D * L),
+            ub=[
+                1.0 if self.realizables[i] else 0.0
+                for i in range(O)
+                for _ in range(D * L)
+            ],
+            types="B" * (O * D * L),
+        )
+        self.libres = np.flatnonzero(
+            np.repeat(self.realizables, D * L).astype(bool)
+        ).tolist()
+
+        # η: costo de la asignación de trabajadores, y su parte de remuneración
+        self.indice_eta = O * D * L
+        indice_remuneracion = O * D * L + 1
+        cpx.variables.add(obj=[-1.0, 0.0], lb=[0.0, 0.0])
+
+        filas: List[FilaPerezosa] = []
+
+        # Cada orden se realiza a lo sumo una vez
+        filas += [
+            (self.indices_r[i].ravel().tolist(), [1.0] * (D * L), "L", 1.0)
+            for i in range(O)
+        ]
+        # Correlatividades, con la misma formulación que el modelo
+        filas += [
+            (
+                [int(self.indices_r[i1, d, t]), int(self.indices_r[i2, d, t_sig])],
+                [1.0, -1.0],
+                "L",
+                0.0,
+            )
+            for _, t_sig in pairwise(range(L))
+            for i1, i2 in instancia.ordenes_correlativas
+            for d in range(D)
+            for t in range(L)
+        ]
+
+        # Capacidad: trabajadores por turno, turnos por día y turnos por semana
+        def carga(indices: np.ndarray) -> Tuple[List[int], List[float]]:
+            return indices.ravel().tolist(), [
+                float(self.cantidades[i])
+                for i in range(O)
+                for _ in range(indices[i].size)
+            ]
+
+        filas += [
+            (*carga(self.indices_r[:, d, t]), "L", float(T))
+            for d in range(D)
+            for t in range(L)
+        ]
+        filas += [
+            (*carga(self.indices_r[:, d, :]), "L", float(LIMITE_DIARIO * T))
+            for d in range(D)
+        ]
+        filas += [
+            (
+                *carga(self.indices_r),
+                "L",
+                float(LIMITE_DIARIO * LIMITE_SEMANAL * T),
+            )
+        ]
+
+        # Cota de Jensen: la remuneración es convexa, con
+        # costo(n) = max_t (c_t n - K_t), por lo que el costo de repartir una carga
+        # W entre T trabajadores es al menos c_t W - T K_t para cada tramo t
+        indices_carga, coefs_carga = carga(self.indices_r)
+        for tramo, costo_tramo in enumerate(COSTOS_REMUNERACION):
+            inicio_tramo = tramo * TAMAÑO_TRAMO
+            K = costo_tramo * inicio_tramo - float(costo_remuneracion(inicio_tramo))
+            filas.append(
+                (
+                    [indice_remuneracion] + indices_carga,
+                    [1.0] + [-costo_tramo * coef for coef in coefs_carga],
+                    "G",
+                    -T * K,
+                )
+            )
+
+        filas += self.cotas_multas(indice_remuneracion)
+
+        cpx.linear_constraints.add(
+            lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+            senses=[sentido for _, _, sentido, _ in filas],
+            rhs=[rhs for _, _, _, rhs in filas],
+        )
+
+        # Como en los demás callbacks de restricciones perezosas, sólo se permiten
+        # reducciones primales en el preprocesamiento
+        cpx.parameters.preprocessing.reduce.set(1)
+        self.callback = cpx.register_callback(CortesBenders)
+        self.callback.inicializar(self.separar)
+
+    def cotas_multas(self, indice_remuneracion: int) -> List[FilaPerezosa]:
+        """
+        Filas que acotan η por la remuneración más cotas de las multas que no
+        dependen de los turnos, o que prohíben las combinaciones de órdenes que
+        las requieren con las estrategias de evitar:
+
+        - Si dos órdenes repetitivas requieren más de T trabajadores en total, al
+          menos `cant_i1 + cant_i2 - T` trabajadores realizan ambas.
+        - Cada arista de un matching máximo (de tamaño ν) del grafo de conflictos
+          tiene un extremo fuera de cualquier conjunto independiente, por lo que
+          `cant_i` trabajadores comparten al menos `cant_i + ν - T` conflictos.
+        """
+        instancia = self.instancia
+        T = instancia.cantidad_trabajadores
+        realizada = [
+            self.indices_r[i].ravel().tolist() for i in instancia.indices_ordenes
+        ]
+        D_L = self.indices_r[0].size
+
+        filas: List[FilaPerezosa] = []
+        # η - remuneración - Σ multas_repeticiones - Σ_i multa_i z_i >= 0
+        indices_eta = [self.indice_eta, indice_remuneracion]
+        coefs_eta = [1.0, -1.0]
+
+        for i1, i2 in instancia.ordenes_repetitivas:
+            exceso = self.cantidades[i1] + self.cantidades[i2] - T
+            if exceso <= 0:
+                continue
+
+            if self.prohibe_repeticiones:
+                filas.append(
+                    (realizada[i1] + realizada[i2], [1.0] * (2 * D_L), "L", 1.0)
+                )
+            elif self.multa_repeticiones > 0:
+                # m >= multa (cant_i1 z_i1 + cant_i2 z_i2 - T)
+                indice_multa = self.maestro.variables.get_num()
+                self.maestro.variables.add(lb=[0.0])
+                filas.append(
+                    (
+                        [indice_multa] + realizada[i1] + realizada[i2],
+                        [1.0]
+                        + [-self.multa_repeticiones * float(self.cantidades[i1])] * D_L
+                        + [-self.multa_repeticiones * float(self.cantidades[i2])] * D_L,
+                        "G",
+                        -float(self.multa_repeticiones * T),
+                    )
+                )
+                indices_eta.append(indice_multa)
+                coefs_eta.append(-1.0)
+
+        grafo = nx.Graph(instancia.conflictos_trabajadores)
+        matching = len(nx.max_weight_matching(grafo, maxcardinality=True))
+        for i in instancia.indices_ordenes:
+            conflictos = self.cantidades[i] + matching - T
+            if conflictos <= 0:
+                continue
+
+            if self.prohibe_conflictos:
+                self.maestro.variables.set_upper_bounds(
+                    [(indice, 0.0) for indice in realizada[i]]
+                )
+            elif self.multa_conflictos > 0:
+                indices_eta += realizada[i]
+                coefs_eta += [-float(self.multa_conflictos * conflictos)] * D_L
+
+        filas.append((indices_eta, coefs_eta, "G", 0.0))
+        return filas
+
+    ###############
+    # Subproblema #
+    ###############
+
+    def resolver_subproblema(
+        self, ubicacion: FrozenSet[int], relajar_diferencia: bool
+    ) -> Optional[Tuple[float, List[float]]]:
+        """
+        Resuelve el modelo compacto con las `r` fijas según la ubicación de órdenes
+        (posiciones de `r` en 1), sin la restricción de diferencia máxima si
+        `relajar_diferencia`. Devuelve el par (costo de la asignación, valores del
+        modelo compacto), o None si no hay asignación factible.
+        """
+        cpx = self.subproblema.cpx
+
+        fijas = np.zeros(len(self.indices_r_subproblema))
+        fijas[list(ubicacion)] = 1.0
+        self.subproblema.fijar_variables(self.indices_r_subproblema, fijas)
+        if relajar_diferencia:
+            cpx.linear_constraints.set_rhs(
+                [(fila, cplex.infinity) for fila in self.filas_diferencia]
+            )
+
+        try:
+            cpx.solve()
+            if not self.subproblema.tiene_solucion():
+                return None
+
+            beneficio = sum(
+                self.beneficios[posicion // self.indices_r[0].size]
+                for posicion in ubicacion
+            )
+            return (
+                float(beneficio - cpx.solution.get_objective_value()),
+                cpx.solution.get_values(),
+            )
+        finally:
+            self.subproblema.establecer_cotas(
+                self.indices_r_subproblema,
+                np.zeros(len(self.indices_r_subproblema)),
+                self.cotas_r_subproblema,
+            )
+            if relajar_diferencia:
+                cpx.linear_constraints.set_rhs(
+                    [(fila, float(DIFERENCIA_MAXIMA)) for fila in self.filas_diferencia]
+                )
+
+    def respeta_diferencia(self, valores: Sequence[float]) -> bool:
+        x = np.asarray(valores)
+        ordenes_por_trabajador = x[self.indices_remuneracion].sum(axis=1)
+        return (
+            ordenes_por_trabajador.max() - ordenes_por_trabajador.min()
+            <= DIFERENCIA_MAXIMA + TOL_CORTE
+        )
+
+    def evaluar(
+        self, ubicacion: FrozenSet[int]
+    ) -> Tuple[Optional[float], Optional[Tuple[float, List[float]]]]:
+        """
+        Evalúa una ubicación de órdenes y devuelve el par (costo sin la diferencia
+        máxima, (costo, valores) con el modelo completo), donde None indica que
+        no hay asignación factible.
+
+        Sin la diferencia máxima, el subproblema es monótono: una asignación para
+        un superconjunto de órdenes se restringe a una para el subconjunto, con un
+        costo menor o igual. Sus cortes valen entonces para todos los
+        superconjuntos de la ubicación. Si la asignación relajada respeta la
+        diferencia máxima, también es óptima para el modelo completo.
+        """
+        if ubicacion in self.evaluadas:
+            return self.evaluadas[ubicacion]
+
+        relajado = self.resolver_subproblema(ubicacion, relajar_diferencia=True)
+        if relajado is None:
+            resultado = (None, None)
+        elif self.respeta_diferencia(relajado[1]):
+            resultado = (relajado[0], relajado)
+        else:
+            resultado = (
+                relajado[0],
+                self.resolver_subproblema(ubicacion, relajar_diferencia=False),
+            )
+
+        self.evaluadas[ubicacion] = resultado
+        return resultado
+
+    def separar(self, valores: Sequence[float]) -> List[FilaPerezosa]:
+        """Cortes que excluyen la solución candidata del maestro, si los hay"""
+        x = np.asarray(valores)
+        ubicacion = frozenset(
+            int(p) for p in np.flatnonzero(x[self.indices_r.ravel()] > 0.5)
+        )
+        eta = x[self.indice_eta]
+
+        costo_relajado, resultado = self.evaluar(ubicacion)
+
+        # Σ_{s ∈ S} r_s vale |S| en la ubicación S y en sus superconjuntos
+        indices_s = [int(self.indices_r.ravel()[p]) for p in sorted(ubicacion)]
+        unos = [1.0] * len(indices_s)
+
+        if costo_relajado is None:
+            self.cortes_factibilidad += 1
+            return [(indices_s, unos, "L", float(len(ubicacion) - 1))]
+
+        # Σ_{s ∈ S} r_s - Σ_{s ∉ S} r_s vale |S| sólo en la ubicación S
+        indices = [int(self.indices_r.ravel()[p]) for p in self.libres]
+        coefs = [1.0 if p in ubicacion else -1.0 for p in self.libres]
+
+        if resultado is None:
+            self.cortes_factibilidad += 1
+            return [(indices, coefs, "L", float(len(ubicacion) - 1))]
+
+        cortes: List[FilaPerezosa] = []
+
+        # η >= costo_relajado (1 - |S| + Σ_{s ∈ S} r_s)
+        if eta < costo_relajado - TOL_CORTE:
+            cortes.append(
+                (
+                    [self.indice_eta] + indices_s,
+                    [1.0] + [-costo_relajado] * len(indices_s),
+                    "G",
+                    costo_relajado * (1 - len(ubicacion)),
+                )
+            )
+
+        # η >= costo (1 - |S| + Σ_{s ∈ S} r_s - Σ_{s ∉ S} r_s)
+        costo, _ = resultado
+        if eta < costo - TOL_CORTE and costo > costo_relajado + TOL_CORTE:
+            cortes.append(
+                (
+                    [self.indice_eta] + indices,
+                    [1.0] + [-costo * coef for coef in coefs],
+                    "G",
+                    costo * (1 - len(ubicacion)),
+                )
+            )
+
+        self.cortes_optimalidad += len(cortes)
+        return cortes
+
+    ##########
+    # Driver #
+    ##########
+
+    def agregar_inicio_goloso(self) -> None:
+        """Usa un cronograma goloso como solución inicial del maestro"""
+        cronograma = construir_cronograma(
+            self.instancia,
+            self.configuracion_modelo,
+            puntaje_ordenes=self.beneficios - 1000 * self.cantidades,
+        )
+
+        dias, turnos = self.instancia.indices_dias, self.instancia.indices_turnos
+        realizadas = [
+            int(self.indices_r[i, dias.index(k), turnos.index(l)])
+            for i, (k, l, _) in cronograma.asignacion.items()
+        ]
+        beneficio = sum(self.beneficios[i] for i in cronograma.asignacion)
+
+        self.maestro.MIP_starts.add(
+            [
+                realizadas + [self.indice_eta],
+                [1.0] * len(realizadas) + [beneficio - cronograma.objetivo()],
+            ],
+            self.maestro.MIP_starts.effort_level.check_feasibility,
+        )
+
+    def resolver(self) -> Optional[ResultadoBenders]:
+        """
+        Resuelve la descomposición en un único branch-and-cut. Devuelve None si no
+        encontró una solución factible.
+        """
+        inicio = time.perf_counter()
+
+        self.agregar_inicio_goloso()
+        self.maestro.solve()
+
+        if not self.maestro.solution.is_primal_feasible():
+            return None
+
+        x = np.asarray(self.maestro.solution.get_values())
+        ubicacion = frozenset(
+            int(p) for p in np.flatnonzero(x[self.indices_r.ravel()] > 0.5)
+        )
+        _, resultado = self.evaluar(ubicacion)
+        assert resultado is not None
+
+        costo, valores = resultado
+        objetivo = float(
+            sum(self.beneficios[p // self.indices_r[0].size] for p in ubicacion) - costo
+        )
+
+        return ResultadoBenders(
+            objetivo=objetivo,
+            valores=valores,
+            solucion=self.modelo.anotar_solucion(valores),
+            cota=self.maestro.solution.MIP.get_best_objective(),
+            cortes_factibilidad=self.cortes_factibilidad,
+            cortes_optimalidad=self.cortes_optimalidad,
+            subproblemas=len(self.evaluadas),
+            tiempo=time.perf_counter() - inicio,
+        )
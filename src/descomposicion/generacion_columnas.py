@@ -0,0 +1,660 @@
+import time
+from dataclasses import dataclass
+from itertools import pairwise
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import cplex
+import numpy as np
+
+from ..cronograma import (
+    DIFERENCIA_MAXIMA,
+    LIMITE_DIARIO,
+    LIMITE_SEMANAL,
+    TAMAÑO_TRAMO,
+    Cronograma,
+    construir_cronograma,
+    costo_marginal,
+    costo_remuneracion,
+)
+from ..instancia import COSTOS_REMUNERACION, InstanciaAsignacionCuadrillas
+from ..modelo.modelo import ConfiguracionAsignacionCuadrillas
+from ..solucion import SolucionAnotada
+from ..solver import ConfiguracionCPLEX
+
+# (orden, día, turno)
+Tarea = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class HorarioSemanal:
+    """Horario semanal de un trabajador: las tareas (orden, día, turno) que realiza"""
+
+    tareas: FrozenSet[Tarea]
+
+    @property
+    def cantidad(self) -> int:
+        return len(self.tareas)
+
+    def ordenes(self) -> Set[int]:
+        return {i for i, _, _ in self.tareas}
+
+
+@dataclass
+class ConfiguracionGeneracionColumnas:
+    """Configuración de la generación de columnas"""
+
+    """Cantidad máxima de iteraciones de la generación de columnas"""
+    iteraciones: int = 500
+
+    """Tiempo límite de la generación de columnas en segundos (None no limita)"""
+    tiempo_limite: Optional[float] = None
+
+    """Tiempo límite del maestro entero (price-and-branch) en segundos"""
+    tiempo_entero: Optional[float] = None
+
+    """Costo reducido mínimo para agregar una columna"""
+    tolerancia: float = 1e-6
+
+
+@dataclass
+class ResultadoGeneracionColumnas:
+    """Resultado de la generación de columnas"""
+
+    """Objetivo de la mejor solución entera encontrada"""
+    objetivo: float
+    solucion: SolucionAnotada
+
+    """Mejor cota superior conocida (la relajación del maestro, si convergió)"""
+    cota: float
+
+    """Objetivo de la relajación del último maestro restringido"""
+    objetivo_relajacion: float
+
+    """Si la generación de columnas convergió (no hay columnas con costo reducido positivo)"""
+    convergio: bool
+
+    iteraciones: int
+    columnas: int
+    tiempo: float
+
+
+class GeneracionColumnas:
+    """
+    Descomposición de Dantzig-Wolfe del modelo, en la que cada columna es el
+    horario semanal factible de un trabajador.
+
+    El maestro decide dónde se realiza cada orden (`r_ikl`) y qué horario usa cada
+    trabajador (`λ_jh`), exigiendo que cada orden realizada tenga `cant_trab`
+    trabajadores en su turno. Además replica las restricciones del modelo que
+    involucran a varios trabajadores: correlatividades, diferencia máxima y
+    conflictos entre trabajadores.
+
+    Los horarios respetan los límites diario y semanal, cada orden a lo sumo una
+    vez, las órdenes conflictivas y las repeticiones, y su costo es la
+    remuneración por tramos más las multas por repeticiones. Se generan con una
+    heurística golosa y, si no encuentra columnas, con un MIP de pricing.
+
+    Las soluciones enteras se obtienen con price-and-branch: se resuelve el
+    maestro entero con las columnas generadas.
+    """
+
+    def __init__(
+        self,
+        instancia: InstanciaAsignacionCuadrillas,
+        configuracion_modelo: ConfiguracionAsignacionCuadrillas = ConfiguracionAsignacionCuadrillas.default(),
+        configuracion: ConfiguracionGeneracionColumnas = ConfiguracionGeneracionColumnas(),
+        configuracion_cplex: ConfiguracionCPLEX = ConfiguracionCPLEX(),
+    ) -> None:
+        self.instancia = instancia
+        self.configuracion_modelo = configuracion_modelo
+        self.configuracion = configuracion
+        self.configuracion_cplex = configuracion_cplex
+
+        self.ordenes = instancia.indices_ordenes
+        self.trabajadores = instancia.indices_trabajadores
+        self.dias = instancia.indices_dias
+        self.turnos = instancia.indices_turnos
+
+        self.beneficios = np.array([orden.beneficio for orden in instancia.ordenes])
+        self.cantidades = np.array([orden.cant_trab for orden in instancia.ordenes])
+        self.realizables = self.cantidades <= instancia.cantidad_trabajadores
+
+        estrategia_conflictos = configuracion_modelo.estrategia_conflictos
+        self.prohibe_conflictos = estrategia_conflictos.prohibe_conflictos
+        self.multa_conflictos = estrategia_conflictos.penalizacion
+        estrategia_repeticiones = configuracion_modelo.estrategia_repetitiva
+        self.prohibe_repeticiones = estrategia_repeticiones.prohibe_repeticiones
+        self.multa_repeticiones = estrategia_repeticiones.penalizacion
+
+        self.conflictivas: List[Set[int]] = [set() for _ in self.ordenes]
+        for i1, i2 in instancia.ordenes_conflictivas:
+            self.conflictivas[i1].add(i2)
+            self.conflictivas[i2].add(i1)
+
+        self.repetitivas: List[Set[int]] = [set() for _ in self.ordenes]
+        for i1, i2 in instancia.ordenes_repetitivas:
+            self.repetitivas[i1].add(i2)
+            self.repetitivas[i2].add(i1)
+
+        # trabajador -> pares de trabajadores en conflicto que lo incluyen
+        self.pares_de: List[List[int]] = [[] for _ in self.trabajadores]
+        for p, (j1, j2) in enumerate(instancia.conflictos_trabajadores):
+            self.pares_de[j1].append(p)
+            self.pares_de[j2].append(p)
+
+        # trabajador -> columnas (índice en el maestro, horario)
+        self.columnas: List[List[Tuple[int, HorarioSemanal]]] = [
+            [] for _ in self.trabajadores
+        ]
+
+        self.armar_maestro()
+        self.armar_pricing()
+
+    def forma_tareas(self) -> Tuple[int, int, int]:
+        return len(self.ordenes), len(self.dias), len(self.turnos)
+
+    def costo(self, horario: HorarioSemanal) -> float:
+        """Remuneración del trabajador más las multas por repeticiones"""
+        ordenes = horario.ordenes()
+        repeticiones = sum(
+            1 for i1, i2 in self.instancia.ordenes_repetitivas if {i1, i2} <= ordenes
+        )
+        return (
+            float(costo_remuneracion(np.array(horario.cantidad)))
+            + self.multa_repeticiones * repeticiones
+        )
+
+    ###########
+    # Maestro #
+    ###########
+
+    def armar_maestro(self) -> None:
+        cpx = cplex.Cplex()
+        self.configuracion_cplex.aplicar(cpx)
+        cpx.objective.set_sense(cpx.objective.sense.maximize)
+        self.maestro = cpx
+
+        O, D, L = self.forma_tareas()
+
+        # r_ikl
+        self.indices_r = np.arange(O * D * L).reshape(O, D, L)
+        cpx.variables.add(
+            obj=[float(self.beneficios[i]) for i in self.ordenes for _ in range(D * L)],
+            lb=[0.0] * (O * D * L),
+            ub=[
+                1.0 if self.realizables[i] else 0.0
+                for i in self.ordenes
+                for _ in range(D * L)
+            ],
+        )
+
+        # Máximo y mínimo de órdenes realizadas por un trabajador
+        self.indice_maximo, self.indice_minimo = O * D * L, O * D * L + 1
+        cpx.variables.add(obj=[0.0, 0.0], lb=[0.0, 0.0])
+
+        # c_pi: el par de trabajadores en conflicto p comparte la orden i
+        pares = self.instancia.conflictos_trabajadores
+        self.indices_c = np.arange(len(pares) * O).reshape(len(pares), O) + (
+            O * D * L + 2
+        )
+        cpx.variables.add(
+            obj=[-self.multa_conflictos] * (len(pares) * O),
+            lb=[0.0] * (len(pares) * O),
+            ub=[0.0 if self.prohibe_conflictos else 1.0] * (len(pares) * O),
+        )
+
+        filas: List[Tuple[List[int], List[float], str, float]] = []
+
+        def agregar_filas(nuevas) -> np.ndarray:
+            inicio = len(filas)
+            filas.extend(nuevas)
+            return np.arange(inicio, len(filas))
+
+        # Cada orden se realiza a lo sumo una vez
+        self.filas_orden = agregar_filas(
+            (self.indices_r[i].ravel().tolist(), [1.0] * (D * L), "L", 1.0)
+            for i in self.ordenes
+        )
+
+        # Cobertura: Σ_jh λ_jh [ikl ∈ h] - cant_i r_ikl = 0
+        self.filas_cobertura = agregar_filas(
+            ([int(self.indices_r[i, d, t])], [-float(self.cantidades[i])], "E", 0.0)
+            for i in self.ordenes
+            for d in range(D)
+            for t in range(L)
+        ).reshape(O, D, L)
+
+        # Cada trabajador usa exactamente un horario
+        self.filas_convexidad = agregar_filas(
+            ([], [], "E", 1.0) for _ in self.trabajadores
+        )
+
+        # Diferencia máxima: mínimo <= n_j <= máximo, máximo - mínimo <= 8
+        self.filas_maximo = agregar_filas(
+            ([self.indice_maximo], [-1.0], "L", 0.0) for _ in self.trabajadores
+        )
+        self.filas_minimo = agregar_filas(
+            ([self.indice_minimo], [-1.0], "G", 0.0) for _ in self.trabajadores
+        )
+        agregar_filas(
+            [
+                (
+                    [self.indice_maximo, self.indice_minimo],
+                    [1.0, -1.0],
+                    "L",
+                    float(DIFERENCIA_MAXIMA),
+                )
+            ]
+        )
+
+        # Correlatividades, con la misma formulación que el modelo
+        agregar_filas(
+            (
+                [int(self.indices_r[i1, d, t]), int(self.indices_r[i2, d, t_sig])],
+                [1.0, -1.0],
+                "L",
+                0.0,
+            )
+            for _, t_sig in pairwise(range(L))
+            for i1, i2 in self.instancia.ordenes_correlativas
+            for d in range(D)
+            for t in range(L)
+        )
+
+        # Conflictos: Σ_h λ_j1h [i ∈ h] + Σ_h λ_j2h [i ∈ h] - c_pi <= 1
+        self.filas_conflicto = agregar_filas(
+            ([int(self.indices_c[p, i])], [-1.0], "L", 1.0)
+            for p in range(len(pares))
+            for i in self.ordenes
+        ).reshape(len(pares), O)
+
+        cpx.linear_constraints.add(
+            lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+            senses=[sentido for _, _, sentido, _ in filas],
+            rhs=[rhs for _, _, _, rhs in filas],
+        )
+
+        for j in self.trabajadores:
+            self.agregar_columna(j, HorarioSemanal(frozenset()))
+
+    def agregar_columna(self, j: int, horario: HorarioSemanal) -> None:
+        """Agrega al maestro la columna del horario para el trabajador j"""
+        filas = [
+            int(self.filas_cobertura[i, k - self.dias.start, l - self.turnos.start])
+            for i, k, l in horario.tareas
+        ]
+        filas += [
+            int(self.filas_convexidad[j]),
+            int(self.filas_maximo[j]),
+            int(self.filas_minimo[j]),
+        ]
+        coefs = [1.0] * len(horario.tareas) + [1.0] + [float(horario.cantidad)] * 2
+
+        for p in self.pares_de[j]:
+            for i in horario.ordenes():
+                filas.append(int(self.filas_conflicto[p, i]))
+                coefs.append(1.0)
+
+        indice = self.maestro.variables.get_num()
+        self.maestro.variables.add(
+            obj=[-self.costo(horario)],
+            lb=[0.0],
+            ub=[1.0],
+            columns=[cplex.SparsePair(ind=filas, val=coefs)],
+        )
+        self.columnas[j].append((indice, horario))
+
+    def valores_tareas(self, duales: np.ndarray, j: int) -> np.ndarray:
+        """
+        Valor de cada tarea (orden, día, turno) para el trabajador j según los
+        duales del maestro, con forma (i, k, l). El costo reducido de un horario es
+        la suma de los valores de sus tareas, menos su costo y el dual de
+        convexidad del trabajador.
+        """
+        valores = -duales[self.filas_cobertura]
+        valores -= duales[self.filas_maximo[j]] + duales[self.filas_minimo[j]]
+        for p in self.pares_de[j]:
+            valores -= duales[self.filas_conflicto[p]][:, None, None]
+
+        valores[~self.realizables] = -np.inf
+        return valores
+
+    ###########
+    # Pricing #
+    ###########
+
+    def armar_pricing(self) -> None:
+        """
+        Arma el MIP de pricing una única vez; en cada llamada sólo cambia el
+        objetivo.
+        """
+        cpx = cplex.Cplex()
+        self.configuracion_cplex.aplicar(cpx)
+        cpx.objective.set_sense(cpx.objective.sense.maximize)
+        self.pricing = cpx
+
+        O, D, L = self.forma_tareas()
+
+        # x_ikl
+        self.indices_x = np.arange(O * D * L).reshape(O, D, L)
+        cpx.variables.add(
+            lb=[0.0] * (O * D * L),
+            ub=[
+                1.0 if self.realizables[i] else 0.0
+                for i in self.ordenes
+                for _ in range(D * L)
+            ],
+            types="B" * (O * D * L),
+        )
+        # y_k: el trabajador trabaja el día k
+        indices_y = list(range(O * D * L, O * D * L + D))
+        cpx.variables.add(lb=[0.0] * D, ub=[1.0] * D, types="B" * D)
+        # Órdenes en cada tramo de remuneración. Como el costo de los tramos es
+        # creciente, se llenan en orden sin necesidad de variables binarias.
+        indices_tramos = list(range(O * D * L + D, O * D * L + D + 4))
+        cpx.variables.add(
+            obj=[-float(costo) for costo in COSTOS_REMUNERACION],
+            lb=[0.0] * 4,
+            ub=[float(TAMAÑO_TRAMO)] * 3 + [cplex.infinity],
+        )
+        # z_p: el trabajador realiza el par de órdenes repetitivas p
+        pares = self.instancia.ordenes_repetitivas
+        indices_z = list(range(O * D * L + D + 4, O * D * L + D + 4 + len(pares)))
+        cpx.variables.add(
+            obj=[-self.multa_repeticiones] * len(pares),
+            lb=[0.0] * len(pares),
+            ub=[1.0] * len(pares),
+        )
+
+        filas: List[Tuple[List[int], List[float], str, float]] = []
+
+        # A lo sumo una orden por turno
+        filas += [
+            (self.indices_x[:, d, t].tolist(), [1.0] * O, "L", 1.0)
+            for d in range(D)
+            for t in range(L)
+        ]
+        # Cada orden a lo sumo una vez
+        filas += [
+            (self.indices_x[i].ravel().tolist(), [1.0] * (D * L), "L", 1.0)
+            for i in self.ordenes
+        ]
+        # Límite diario y definición de y_k
+        filas += [
+            (
+                self.indices_x[:, d].ravel().tolist() + [indices_y[d]],
+                [1.0] * (O * L) + [-float(LIMITE_DIARIO)],
+                "L",
+                0.0,
+            )
+            for d in range(D)
+        ]
+        # Límite semanal
+        filas += [(indices_y, [1.0] * D, "L", float(LIMITE_SEMANAL))]
+        # Remuneración
+        filas += [
+            (
+                self.indices_x.ravel().tolist() + indices_tramos,
+                [1.0] * (O * D * L) + [-1.0] * 4,
+                "E",
+                0.0,
+            )
+        ]
+        # Órdenes conflictivas en turnos consecutivos
+        filas += [
+            (
+                [int(self.indices_x[a, d, t]), int(self.indices_x[b, d, t_sig])],
+                [1.0, 1.0],
+                "L",
+                1.0,
+            )
+            for t, t_sig in pairwise(range(L))
+            for d in range(D)
+            for i1, i2 in self.instancia.ordenes_conflictivas
+            for a, b in ((i1, i2), (i2, i1))
+        ]
+        # Repeticiones
+        filas += [
+            (
+                self.indices_x[[i1, i2]].ravel().tolist() + [indices_z[p]],
+                [1.0] * (2 * D * L) + [-1.0],
+                "L",
+                0.0 if self.prohibe_repeticiones else 1.0,
+            )
+            for p, (i1, i2) in enumerate(pares)
+        ]
+
+        if self.prohibe_repeticiones:
+            cpx.variables.set_upper_bounds([(indice, 0.0) for indice in indices_z])
+
+        cpx.linear_constraints.add(
+            lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+            senses=[sentido for _, _, sentido, _ in filas],
+            rhs=[rhs for _, _, _, rhs in filas],
+        )
+
+    def pricing_goloso(self, valores: np.ndarray) -> HorarioSemanal:
+        """
+        Construye golosamente un horario, agregando las tareas de mayor valor
+        mientras superen el costo marginal de la remuneración.
+        """
+        O, D, L = self.forma_tareas()
+
+        positivas = np.flatnonzero(valores.ravel() > 0)
+        positivas = positivas[np.argsort(-valores.ravel()[positivas])]
+
+        ocupado = np.full((D, L), -1)
+        ordenes: Set[int] = set()
+        tareas: List[Tarea] = []
+
+        for indice in positivas:
+            i, d, t = np.unravel_index(indice, (O, D, L))
+            i, d, t = int(i), int(d), int(t)
+
+            valor = valores[i, d, t]
+            if self.ordenes_repetidas(i, ordenes):
+                if self.prohibe_repeticiones:
+                    continue
+                valor -= self.multa_repeticiones * len(self.repetitivas[i] & ordenes)
+
+            if (
+                valor <= costo_marginal(len(tareas))
+                or ocupado[d, t] != -1
+                or i in ordenes
+                or (ocupado[d] != -1).sum() >= LIMITE_DIARIO
+                or (
+                    (ocupado[d] != -1).sum() == 0
+                    and (ocupado != -1).any(axis=1).sum() >= LIMITE_SEMANAL
+                )
+                or any(
+                    0 <= vecino < L and ocupado[d, vecino] in self.conflictivas[i]
+                    for vecino in (t - 1, t + 1)
+                )
+            ):
+                continue
+
+            ocupado[d, t] = i
+            ordenes.add(i)
+            tareas.append((i, self.dias[d], self.turnos[t]))
+
+        return HorarioSemanal(frozenset(tareas))
+
+    def ordenes_repetidas(self, i: int, ordenes: Set[int]) -> bool:
+        return len(self.repetitivas[i] & ordenes) > 0
+
+    def pricing_exacto(self, valores: np.ndarray) -> HorarioSemanal:
+        """Resuelve el MIP de pricing con los valores de las tareas"""
+        finitos = np.where(np.isfinite(valores), valores, 0.0)
+        self.pricing.objective.set_linear(
+            list(zip(self.indices_x.ravel().tolist(), finitos.ravel().tolist()))
+        )
+        self.pricing.solve()
+
+        x = np.round(
+            self.pricing.solution.get_values(self.indices_x.ravel().tolist())
+        ).reshape(self.indices_x.shape)
+
+        return HorarioSemanal(
+            frozenset(
+                (int(i), self.dias[int(d)], self.turnos[int(t)])
+                for i, d, t in zip(*np.nonzero(x > 0.5))
+            )
+        )
+
+    def costo_reducido(
+        self, horario: HorarioSemanal, valores: np.ndarray, duales: np.ndarray, j: int
+    ) -> float:
+        return (
+            sum(
+                valores[i, k - self.dias.start, l - self.turnos.start]
+                for i, k, l in horario.tareas
+            )
+            - self.costo(horario)
+            - duales[self.filas_convexidad[j]]
+        )
+
+    ##########
+    # Driver #
+    ##########
+
+    def agregar_columnas_iniciales(self) -> None:
+        """Agrega los horarios de un cronograma goloso"""
+        cronograma = construir_cronograma(
+            self.instancia,
+            self.configuracion_modelo,
+            puntaje_ordenes=self.beneficios - 1000 * self.cantidades,
+        )
+
+        tareas: List[List[Tarea]] = [[] for _ in self.trabajadores]
+        for i, (k, l, trabajadores) in cronograma.asignacion.items():
+            for j in trabajadores:
+                tareas[j].append((i, k, l))
+
+        for j in self.trabajadores:
+            if len(tareas[j]) > 0:
+                self.agregar_columna(j, HorarioSemanal(frozenset(tareas[j])))
+
+    def resolver_relajacion(self) -> Tuple[float, float, bool, int]:
+        """
+        Genera columnas hasta que ningún horario tenga costo reducido positivo, o
+        hasta agotar las iteraciones o el tiempo. Devuelve la tupla (objetivo de
+        la relajación, cota superior, convergió, iteraciones).
+
+        Cuando el pricing es exacto para todos los trabajadores, la relajación más
+        la suma de los costos reducidos positivos es una cota superior (Lasdon).
+        """
+        configuracion = self.configuracion
+        inicio = time.perf_counter()
+
+        cota = np.inf
+        objetivo = -np.inf
+        convergio = False
+
+        iteracion = 0
+        while iteracion < configuracion.iteraciones:
+            if (
+                configuracion.tiempo_limite is not None
+                and time.perf_counter() - inicio > configuracion.tiempo_limite
+            ):
+                break
+            iteracion += 1
+
+            self.maestro.solve()
+            objetivo = self.maestro.solution.get_objective_value()
+            duales = np.array(self.maestro.solution.get_dual_values())
+
+            agregadas = 0
+            for j in self.trabajadores:
+                valores = self.valores_tareas(duales, j)
+                horario = self.pricing_goloso(valores)
+                if (
+                    self.costo_reducido(horario, valores, duales, j)
+                    > configuracion.tolerancia
+                ):
+                    self.agregar_columna(j, horario)
+                    agregadas += 1
+
+            if agregadas > 0:
+                continue
+
+            # La heurística no encontró columnas: pricing exacto
+            suma_costos_reducidos = 0.0
+            for j in self.trabajadores:
+                valores = self.valores_tareas(duales, j)
+                horario = self.pricing_exacto(valores)
+                costo_reducido = self.costo_reducido(horario, valores, duales, j)
+                if costo_reducido > configuracion.tolerancia:
+                    self.agregar_columna(j, horario)
+                    agregadas += 1
+                    suma_costos_reducidos += costo_reducido
+
+            cota = min(cota, objetivo + suma_costos_reducidos)
+            if agregadas == 0:
+                convergio = True
+                break
+
+        return objetivo, cota, convergio, iteracion
+
+    def resolver_entero(self) -> Optional[Cronograma]:
+        """
+        Price-and-branch: resuelve el maestro entero con las columnas generadas y
+        devuelve el cronograma correspondiente, o None si no encontró solución.
+        """
+        O, D, L = self.forma_tareas()
+
+        enteras = self.indices_r.ravel().tolist() + [
+            indice for columnas in self.columnas for indice, _ in columnas
+        ]
+        self.maestro.variables.set_types([(indice, "B") for indice in enteras])
+        if self.configuracion.tiempo_entero is not None:
+            self.maestro.parameters.timelimit.set(self.configuracion.tiempo_entero)
+
+        try:
+            self.maestro.solve()
+            if not self.maestro.solution.is_primal_feasible():
+                return None
+            valores = self.maestro.solution.get_values()
+        finally:
+            self.maestro.set_problem_type(self.maestro.problem_type.LP)
+            self.maestro.parameters.timelimit.reset()
+
+        asignacion: Dict[int, Tuple[int, int, Set[int]]] = {}
+        for j, columnas in enumerate(self.columnas):
+            for indice, horario in columnas:
+                if valores[indice] < 0.5:
+                    continue
+                for i, k, l in horario.tareas:
+                    asignacion.setdefault(i, (k, l, set()))[2].add(j)
+
+        cronograma = Cronograma(self.instancia, self.configuracion_modelo)
+        for i, (k, l, trabajadores) in asignacion.items():
+            cronograma.asignar(i, k, l, trabajadores)
+
+        return cronograma
+
+    def resolver(self) -> Optional[ResultadoGeneracionColumnas]:
+        """
+        Genera columnas a partir de un cronograma goloso y obtiene una solución
+        entera con price-and-branch. Devuelve None si no encontró una solución.
+        """
+        inicio = time.perf_counter()
+
+        self.agregar_columnas_iniciales()
+        objetivo_relajacion, cota, convergio, iteraciones = self.resolver_relajacion()
+
+        cronograma = self.resolver_entero()
+        if cronograma is None:
+            return None
+
+        return ResultadoGeneracionColumnas(
+            objetivo=cronograma.objetivo(),
+            solucion=SolucionAnotada(
+                instancia=self.instancia, valores=cronograma.valores()
+            ),
+            cota=objetivo_relajacion if convergio else cota,
+            objetivo_relajacion=objetivo_relajacion,
+            convergio=convergio,
+            iteraciones=iteraciones,
+            columnas=sum(len(columnas) for columnas in self.columnas),
+            tiempo=time.perf_counter() - inicio,
+        )
@@ -0,0 +1,160 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .instancia import COSTOS_REMUNERACION
+from .modelo.modelo import ModeloAsignacionCuadrillas
+from .solver import Solver
+
+
+@dataclass
+class Escenario:
+    """Perturbación de los coeficientes del objetivo (beneficios y remuneraciones)"""
+
+    nombre: str
+
+    """Factor que multiplica el beneficio de todas las órdenes"""
+    factor_beneficios: float = 1.0
+
+    """Orden -> beneficio que reemplaza al de la instancia, antes de aplicar el factor"""
+    beneficios: Dict[int, float] = field(default_factory=dict)
+
+    """Costo por orden de cada tramo de remuneración (None usa los del enunciado)"""
+    costos_remuneracion: Optional[Tuple[float, ...]] = None
+
+    def beneficios_de(self, modelo: ModeloAsignacionCuadrillas) -> np.ndarray:
+        """Beneficio de cada orden en el escenario"""
+        return self.factor_beneficios * np.array(
+            [
+                self.beneficios.get(i, orden.beneficio)
+                for i, orden in enumerate(modelo.instancia.ordenes)
+            ]
+        )
+
+    def costos_de(self) -> np.ndarray:
+        """Costo por orden de cada tramo de remuneración en el escenario"""
+        costos = np.array(
+            (
+                self.costos_remuneracion
+                if self.costos_remuneracion is not None
+                else COSTOS_REMUNERACION
+            ),
+            dtype=float,
+        )
+        assert len(costos) == len(COSTOS_REMUNERACION)
+        return costos
+
+
+class AnalisisEscenarios:
+    """
+    Resuelve una serie de escenarios sobre un único modelo armado, cambiando sólo
+    los coeficientes del objetivo de `r` (beneficios) y de `o` (remuneraciones).
+
+    Como los escenarios no cambian la región factible, la solución de cada uno es
+    un MIP start factible para el siguiente.
+    """
+
+    def __init__(self, modelo: ModeloAsignacionCuadrillas, solver: Solver) -> None:
+        self.modelo = modelo
+        self.solver = solver
+
+        # (orden, día, turno)
+        self.indices_realizacion = modelo.indices_realizacion()
+        # (trabajador, tramo)
+        self.indices_remuneracion = np.array(
+            [
+                [
+                    modelo.indice_de(f"o{tramo}_{j}")
+                    for tramo in range(1, len(COSTOS_REMUNERACION) + 1)
+                ]
+                for j in modelo.instancia.indices_trabajadores
+            ],
+            dtype=int,
+        ).reshape(-1, len(COSTOS_REMUNERACION))
+
+    def indices_escenario(self) -> List[int]:
+        """Índices de las variables cuyos coeficientes cambian entre escenarios"""
+        return (
+            self.indices_realizacion.ravel().tolist()
+            + self.indices_remuneracion.ravel().tolist()
+        )
+
+    def aplicar(self, escenario: Escenario) -> None:
+        """Cambia los coeficientes del objetivo del solver a los del escenario"""
+        beneficios = np.broadcast_to(
+            escenario.beneficios_de(self.modelo)[:, None, None],
+            self.indices_realizacion.shape,
+        )
+        costos = np.broadcast_to(
+            -escenario.costos_de(), self.indices_remuneracion.shape
+        )
+
+        self.solver.cpx.objective.set_linear(
+            list(
+                zip(
+                    self.indices_escenario(),
+                    np.concatenate([beneficios.ravel(), costos.ravel()]).tolist(),
+                )
+            )
+        )
+
+    def resolver(
+        self,
+        escenarios: Sequence[Escenario],
+        inicio: Optional[Sequence[float]] = None,
+    ) -> pd.DataFrame:
+        """
+        Resuelve los escenarios en orden, cada uno partiendo de la solución del
+        anterior (y el primero de `inicio`, si se indica).
+
+        Devuelve una tabla con una fila por escenario. El objetivo del modelo se
+        desglosa en beneficio, remuneración y multas, todo con los coeficientes
+        del escenario; `objetivo_inicio` es el valor del MIP start en el escenario.
+        """
+        cpx = self.solver.cpx
+        originales = cpx.objective.get_linear(self.indices_escenario())
+
+        filas = []
+        valores = list(inicio) if inicio is not None else None
+
+        try:
+            for escenario in escenarios:
+                self.aplicar(escenario)
+
+                objetivo_inicio = None
+                if valores is not None:
+                    self.solver.establecer_inicio(valores)
+                    objetivo_inicio = float(np.dot(cpx.objective.get_linear(), valores))
+
+                antes = time.perf_counter()
+                objetivo, valores = self.solver.resolver()
+                despues = time.perf_counter()
+
+                x = np.asarray(valores)
+                realizadas = x[self.indices_realizacion].sum(axis=(1, 2))
+                beneficio = float(realizadas @ escenario.beneficios_de(self.modelo))
+                remuneracion = float(
+                    (x[self.indices_remuneracion] @ escenario.costos_de()).sum()
+                )
+
+                filas.append(
+                    {
+                        "escenario": escenario.nombre,
+                        "objetivo": objetivo,
+                        "beneficio": beneficio,
+                        "remuneracion": remuneracion,
+                        "multas": beneficio - remuneracion - objetivo,
+                        "ordenes_realizadas": int(round(realizadas.sum())),
+                        "objetivo_inicio": objetivo_inicio,
+                        "cota": self.solver.cota(),
+                        "optima": self.solver.es_optima(),
+                        "tiempo": despues - antes,
+                    }
+                )
+        finally:
+            cpx.objective.set_linear(list(zip(self.indices_escenario(), originales)))
+
+        return pd.DataFrame(filas)
@@ -0,0 +1,267 @@
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Dict, Iterable, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .cronograma import (
+    DIFERENCIA_MAXIMA,
+    LIMITE_DIARIO,
+    LIMITE_SEMANAL,
+    Cronograma,
+    costo_remuneracion,
+)
+from .instancia import InstanciaAsignacionCuadrillas
+from .solucion import SolucionAnotada
+
+if TYPE_CHECKING:
+    from .modelo.modelo import ConfiguracionAsignacionCuadrillas
+
+
+# orden -> (día, turno, trabajadores)
+Asignacion = Mapping[int, Tuple[int, int, Iterable[int]]]
+
+
+@dataclass
+class LoteCronogramas:
+    """
+    Lote de cronogramas en forma compacta, como arreglos que se evalúan de forma
+    vectorizada con `EvaluadorCronogramas`.
+    """
+
+    """(cronograma, orden) -> posición `d * L + t` del (día, turno) en que se realiza la orden, o -1 si no se realiza"""
+    slots: np.ndarray
+
+    """(cronograma, orden, trabajador) -> si el trabajador realiza la orden"""
+    trabajadores: np.ndarray
+
+    def __len__(self) -> int:
+        return self.slots.shape[0]
+
+    @staticmethod
+    def desde_asignaciones(
+        instancia: InstanciaAsignacionCuadrillas, asignaciones: Sequence[Asignacion]
+    ) -> "LoteCronogramas":
+        dias, turnos = instancia.indices_dias, instancia.indices_turnos
+        B, O, T = (
+            len(asignaciones),
+            len(instancia.ordenes),
+            instancia.cantidad_trabajadores,
+        )
+
+        slots = np.full((B, O), -1, dtype=int)
+        trabajadores = np.zeros((B, O, T), dtype=bool)
+
+        for b, asignacion in enumerate(asignaciones):
+            for i, (k, l, trabajadores_orden) in asignacion.items():
+                slots[b, i] = dias.index(k) * len(turnos) + turnos.index(l)
+                trabajadores[b, i, list(trabajadores_orden)] = True
+
+        return LoteCronogramas(slots=slots, trabajadores=trabajadores)
+
+    @staticmethod
+    def desde_cronogramas(
+        instancia: InstanciaAsignacionCuadrillas, cronogramas: Sequence[Cronograma]
+    ) -> "LoteCronogramas":
+        return LoteCronogramas.desde_asignaciones(
+            instancia, [cronograma.asignacion for cronograma in cronogramas]
+        )
+
+    @staticmethod
+    def desde_soluciones(
+        instancia: InstanciaAsignacionCuadrillas,
+        soluciones: Sequence[SolucionAnotada],
+    ) -> "LoteCronogramas":
+        """
+        Lote a partir de soluciones del solver. Una orden con trabajadores en más
+        de un (día, turno) no tiene forma compacta: queda como no realizada pero
+        con todos sus trabajadores, de modo que `cantidad_trabajadores` la cuenta
+        como violación.
+        """
+        lote = LoteCronogramas.desde_asignaciones(
+            instancia, [solucion.asignacion_de_orden for solucion in soluciones]
+        )
+        for b, solucion in enumerate(soluciones):
+            lote.slots[b, list(solucion.ordenes_repartidas)] = -1
+
+        return lote
+
+
+@dataclass
+class Violaciones:
+    """
+    Cantidad de restricciones del modelo violadas por cada cronograma del lote,
+    por familia. Cada familia cuenta las filas del modelo que no se cumplen.
+    """
+
+    """Órdenes realizadas sin exactamente `cant_trab` trabajadores, o con trabajadores sin realizarse"""
+    cantidad_trabajadores: np.ndarray
+    trabajo_simultaneo: np.ndarray
+    limite_diario: np.ndarray
+    limite_semanal: np.ndarray
+    diferencia_maxima: np.ndarray
+    ordenes_correlativas: np.ndarray
+    ordenes_conflictivas: np.ndarray
+
+    """Sólo si la estrategia de conflictos los prohíbe"""
+    conflictos_trabajadores: np.ndarray
+
+    """Sólo si la estrategia de repeticiones las prohíbe"""
+    repeticiones: np.ndarray
+
+    def por_familia(self) -> Dict[str, np.ndarray]:
+        return {campo.name: getattr(self, campo.name) for campo in fields(self)}
+
+    def total(self) -> np.ndarray:
+        return sum(self.por_familia().values())
+
+    def factibles(self) -> np.ndarray:
+        return self.total() == 0
+
+
+class EvaluadorCronogramas:
+    """
+    Evalúa lotes de cronogramas sin pasar por el MIP: calcula el objetivo exacto
+    del modelo (beneficios, remuneración por tramos y multas) y cuenta las
+    restricciones violadas, operando sobre todo el lote a la vez.
+    """
+
+    def __init__(
+        self,
+        instancia: InstanciaAsignacionCuadrillas,
+        configuracion: "ConfiguracionAsignacionCuadrillas",
+    ) -> None:
+        self.instancia = instancia
+        self.configuracion = configuracion
+
+        self.dias = len(instancia.indices_dias)
+        self.turnos = len(instancia.indices_turnos)
+
+        self.beneficios = np.array([orden.beneficio for orden in instancia.ordenes])
+        self.cantidades = np.array([orden.cant_trab for orden in instancia.ordenes])
+
+        def pares(lista: Sequence[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+            arreglo = np.array(lista, dtype=int).reshape(-1, 2)
+            return arreglo[:, 0], arreglo[:, 1]
+
+        self.conflictos_trabajadores = pares(instancia.conflictos_trabajadores)
+        self.ordenes_correlativas = pares(instancia.ordenes_correlativas)
+        self.ordenes_conflictivas = pares(instancia.ordenes_conflictivas)
+        self.ordenes_repetitivas = pares(instancia.ordenes_repetitivas)
+
+        estrategia_conflictos = configuracion.estrategia_conflictos
+        self.prohibe_conflictos = estrategia_conflictos.prohibe_conflictos
+        self.multa_conflictos = estrategia_conflictos.penalizacion
+        estrategia_repeticiones = configuracion.estrategia_repetitiva
+        self.prohibe_repeticiones = estrategia_repeticiones.prohibe_repeticiones
+        self.multa_repeticiones = estrategia_repeticiones.penalizacion
+
+    def asignados(self, lote: LoteCronogramas) -> np.ndarray:
+        """(cronograma, orden, trabajador) -> el trabajador realiza la orden, que se realiza"""
+        return lote.trabajadores & (lote.slots >= 0)[:, :, None]
+
+    def conflictos(self, asignados: np.ndarray) -> np.ndarray:
+        """Cantidad de (par de trabajadores en conflicto, orden) que comparten la orden"""
+        j1, j2 = self.conflictos_trabajadores
+        return (asignados[:, :, j1] & asignados[:, :, j2]).sum(axis=(1, 2))
+
+    def repeticiones(self, asignados: np.ndarray) -> np.ndarray:
+        """Cantidad de (par de órdenes repetitivas, trabajador) que realiza ambas"""
+        i1, i2 = self.ordenes_repetitivas
+        return (asignados[:, i1] & asignados[:, i2]).sum(axis=(1, 2))
+
+    def objetivos(self, lote: LoteCronogramas) -> np.ndarray:
+        """Valor de la función objetivo del modelo para cada cronograma del lote"""
+        asignados = self.asignados(lote)
+
+        return (
+            (lote.slots >= 0) @ self.beneficios
+            - costo_remuneracion(asignados.sum(axis=1)).sum(axis=1)
+            - self.multa_conflictos * self.conflictos(asignados)
+            - self.multa_repeticiones * self.repeticiones(asignados)
+        )
+
+    def violaciones(self, lote: LoteCronogramas) -> Violaciones:
+        """
+        Restricciones violadas por cada cronograma del lote. Replica la formulación
+        del modelo, incluida la de `restricciones_ordenes_correlativas`.
+        """
+        B = len(lote)
+        D, L = self.dias, self.turnos
+        slots = lote.slots
+        realizadas = slots >= 0
+        asignados = self.asignados(lote)
+
+        cantidad = lote.trabajadores.sum(axis=2)
+        cantidad_trabajadores = (
+            (realizadas & (cantidad != self.cantidades))
+            | (~realizadas & (cantidad > 0))
+        ).sum(axis=1)
+
+        # (cronograma, trabajador, día, turno) -> órdenes que realiza
+        en_slot = (slots[:, :, None] == np.arange(D * L)).astype(np.int32)
+        ocupacion = np.einsum("bos,boj->bjs", en_slot, asignados.astype(np.int32))
+        ocupacion = ocupacion.reshape(B, -1, D, L)
+
+        trabajo_simultaneo = (ocupacion > 1).sum(axis=(1, 2, 3))
+
+        por_dia = ocupacion.sum(axis=3)
+        # La definición de d_jk (Σ a <= L d_jk) también se viola con más de L
+        # órdenes en un día, que sólo ocurre si hay trabajo simultáneo
+        limite_diario = (por_dia > LIMITE_DIARIO).sum(axis=(1, 2)) + (por_dia > L).sum(
+            axis=(1, 2)
+        )
+        limite_semanal = ((por_dia > 0).sum(axis=2) > LIMITE_SEMANAL).sum(axis=1)
+
+        ordenes = asignados.sum(axis=1)
+        diferencia_maxima = (
+            ordenes[:, :, None] - ordenes[:, None, :] > DIFERENCIA_MAXIMA
+        ).sum(axis=(1, 2))
+
+        # Si i1 se realiza el día d, hay una fila por cada turno que sigue a otro, que
+        # sólo se cumple si i2 se realiza ese día en ese turno
+        i1, i2 = self.ordenes_correlativas
+        coincide = (
+            realizadas[:, i2]
+            & (slots[:, i2] // L == slots[:, i1] // L)
+            & (slots[:, i2] % L >= 1)
+        )
+        ordenes_correlativas = (realizadas[:, i1] * (L - 1 - coincide)).sum(axis=1)
+
+        # Un trabajador realiza órdenes conflictivas en turnos consecutivos del día
+        i1, i2 = self.ordenes_conflictivas
+        mismo_dia = slots[:, i1] // L == slots[:, i2] // L
+        consecutivas = (
+            realizadas[:, i1]
+            & realizadas[:, i2]
+            & mismo_dia
+            & (np.abs(slots[:, i1] - slots[:, i2]) == 1)
+        )
+        ordenes_conflictivas = (
+            (asignados[:, i1] & asignados[:, i2]) & consecutivas[:, :, None]
+        ).sum(axis=(1, 2))
+
+        sin_violaciones = np.zeros(B, dtype=int)
+
+        return Violaciones(
+            cantidad_trabajadores=cantidad_trabajadores,
+            trabajo_simultaneo=trabajo_simultaneo,
+            limite_diario=limite_diario,
+            limite_semanal=limite_semanal,
+            diferencia_maxima=diferencia_maxima,
+            ordenes_correlativas=ordenes_correlativas,
+            ordenes_conflictivas=ordenes_conflictivas,
+            conflictos_trabajadores=(
+                self.conflictos(asignados)
+                if self.prohibe_conflictos
+                else sin_violaciones
+            ),
+            repeticiones=(
+                self.repeticiones(asignados)
+                if self.prohibe_repeticiones
+                else sin_violaciones
+            ),
+        )
+
+    def evaluar(self, lote: LoteCronogramas) -> Tuple[np.ndarray, Violaciones]:
+        """Objetivos y restricciones violadas de cada cronograma del lote"""
+        return self.objetivos(lote), self.violaciones(lote)
@@ -0,0 +1,18 @@
+from .busqueda_local import ConfiguracionBusquedaLocal, HeuristicaBusquedaLocal
+from .lns import LNS, ConfiguracionLNS, Vecindario
+from .relax_and_fix import (
+    ConfiguracionRelaxAndFix,
+    RelaxAndFix,
+    ResultadoRelaxAndFix,
+)
+
+__all__ = [
+    "ConfiguracionBusquedaLocal",
+    "HeuristicaBusquedaLocal",
+    "ConfiguracionLNS",
+    "LNS",
+    "Vecindario",
+    "ConfiguracionRelaxAndFix",
+    "RelaxAndFix",
+    "ResultadoRelaxAndFix",
+]
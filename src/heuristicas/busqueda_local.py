@@ -0,0 +1,223 @@
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from ..cronograma import Cronograma, construir_cronograma
+from ..instancia import InstanciaAsignacionCuadrillas
+from ..modelo.modelo import ConfiguracionAsignacionCuadrillas
+from ..solucion import SolucionAnotada
+
+
+@dataclass
+class ConfiguracionBusquedaLocal:
+    """Configuración de la heurística constructiva + búsqueda local"""
+
+    """Tiempo límite en segundos"""
+    tiempo_limite: float = 10.0
+
+    """Iteraciones sin mejorar la mejor solución antes de perturbar la actual"""
+    iteraciones_perturbacion: int = 200
+
+    """Proporción de las órdenes asignadas que se quitan al perturbar"""
+    proporcion_perturbacion: float = 0.2
+
+    seed: int = 42
+
+
+class HeuristicaBusquedaLocal:
+    """
+    Heurística que no usa un solver MIP: construye un cronograma golosamente y lo
+    mejora con movimientos de búsqueda local, perturbándolo cuando se estanca.
+
+    Los movimientos son insertar una orden, cambiarla de (día, turno), cambiar
+    uno de sus trabajadores y quitarla. Todos se hacen sobre un `Cronograma`, por
+    lo que respetan las restricciones duras y las estrategias de conflictos y
+    repeticiones del modelo, incluyendo sus multas.
+    """
+
+    def __init__(
+        self,
+        instancia: InstanciaAsignacionCuadrillas,
+        configuracion_modelo: ConfiguracionAsignacionCuadrillas = ConfiguracionAsignacionCuadrillas.default(),
+        configuracion: ConfiguracionBusquedaLocal = ConfiguracionBusquedaLocal(),
+    ) -> None:
+        self.instancia = instancia
+        self.configuracion_modelo = configuracion_modelo
+        self.configuracion = configuracion
+
+        self.rng = np.random.default_rng(configuracion.seed)
+
+        # (tiempo, objetivo) cada vez que mejora la mejor solución
+        self.historial: List[Tuple[float, float]] = []
+
+    def construir(self) -> Cronograma:
+        """
+        Construye un cronograma insertando las órdenes de mayor a menor beneficio
+        neto, pagando el mínimo a cada trabajador.
+        """
+        return construir_cronograma(
+            self.instancia,
+            self.configuracion_modelo,
+            puntaje_ordenes=np.array(
+                [
+                    orden.beneficio - 1000 * orden.cant_trab
+                    for orden in self.instancia.ordenes
+                ]
+            ),
+        )
+
+    def puntaje_slots_aleatorio(self) -> np.ndarray:
+        return self.rng.random(
+            (len(self.instancia.indices_dias), len(self.instancia.indices_turnos))
+        )
+
+    ###############
+    # Movimientos #
+    ###############
+
+    def insertar_orden(self, cronograma: Cronograma, i: int) -> float:
+        """Intenta asignar una orden no asignada. Devuelve la mejora del objetivo."""
+        if not cronograma.insertar(i, self.puntaje_slots_aleatorio()):
+            return 0.0
+
+        k, l, trabajadores = cronograma.asignacion[i]
+        cronograma.quitar(i)
+        aporte = cronograma.variacion_objetivo_asignar(i, trabajadores)
+        cronograma.asignar(i, k, l, trabajadores)
+
+        return aporte
+
+    def cambiar_turno(self, cronograma: Cronograma, i: int) -> float:
+        """
+        Intenta mover una orden asignada a otro (día, turno), eligiendo de nuevo sus
+        trabajadores. Acepta el movimiento si no empeora el objetivo.
+        """
+        if not cronograma.puede_quitar(i):
+            return 0.0
+
+        k, l, trabajadores = cronograma.asignacion[i]
+        cronograma.quitar(i)
+        aporte = cronograma.variacion_objetivo_asignar(i, trabajadores)
+
+        d, t = np.unravel_index(
+            self.rng.integers(len(cronograma.dias) * len(cronograma.turnos)),
+            cronograma.ocupacion.shape[1:],
+        )
+        nuevo_k, nuevo_l = cronograma.dias[d], cronograma.turnos[t]
+        nuevos = cronograma.elegir_trabajadores(i, nuevo_k, nuevo_l)
+
+        if (
+            (nuevo_k, nuevo_l) != (k, l)
+            and nuevos is not None
+            and cronograma.puede_asignar(i, nuevo_k, nuevo_l, nuevos)
+        ):
+            mejora = cronograma.variacion_objetivo_asignar(i, nuevos) - aporte
+            if mejora >= 0:
+                cronograma.asignar(i, nuevo_k, nuevo_l, nuevos)
+                return mejora
+
+        cronograma.asignar(i, k, l, trabajadores)
+        return 0.0
+
+    def cambiar_trabajador(self, cronograma: Cronograma, i: int) -> float:
+        """
+        Intenta reemplazar uno de los trabajadores de una orden asignada por otro.
+        Acepta el movimiento si no empeora el objetivo.
+        """
+        if not cronograma.puede_quitar(i):
+            return 0.0
+
+        k, l, trabajadores = cronograma.asignacion[i]
+        saliente = int(self.rng.choice(sorted(trabajadores)))
+        entrante = int(self.rng.integers(self.instancia.cantidad_trabajadores))
+        if entrante in trabajadores:
+            return 0.0
+
+        cronograma.quitar(i)
+        aporte = cronograma.variacion_objetivo_asignar(i, trabajadores)
+
+        nuevos = (trabajadores - {saliente}) | {entrante}
+        if cronograma.puede_asignar(i, k, l, nuevos):
+            mejora = cronograma.variacion_objetivo_asignar(i, nuevos) - aporte
+            if mejora >= 0:
+                cronograma.asignar(i, k, l, nuevos)
+                return mejora
+
+        cronograma.asignar(i, k, l, trabajadores)
+        return 0.0
+
+    def quitar_orden(self, cronograma: Cronograma, i: int) -> float:
+        """Quita una orden asignada si su aporte al objetivo es negativo"""
+        if not cronograma.puede_quitar(i):
+            return 0.0
+
+        k, l, trabajadores = cronograma.asignacion[i]
+        cronograma.quitar(i)
+        aporte = cronograma.variacion_objetivo_asignar(i, trabajadores)
+
+        if aporte < 0:
+            return -aporte
+
+        cronograma.asignar(i, k, l, trabajadores)
+        return 0.0
+
+    def perturbar(self, cronograma: Cronograma) -> None:
+        """Quita una parte de las órdenes asignadas y reinserta golosamente"""
+        asignadas = list(cronograma.asignacion)
+        cantidad = int(
+            np.ceil(self.configuracion.proporcion_perturbacion * len(asignadas))
+        )
+
+        for i in self.rng.permutation(asignadas)[:cantidad]:
+            if cronograma.puede_quitar(int(i)):
+                cronograma.quitar(int(i))
+
+        for i in self.rng.permutation(self.instancia.indices_ordenes):
+            cronograma.insertar(int(i), self.puntaje_slots_aleatorio())
+
+    ###########
+    # Driver  #
+    ###########
+
+    def resolver(self) -> Tuple[float, SolucionAnotada]:
+        """
+        Busca un cronograma hasta agotar el tiempo límite, y devuelve el par
+        (objetivo, solución anotada) del mejor encontrado.
+        """
+        inicio = time.perf_counter()
+
+        actual = self.construir()
+        objetivo = actual.objetivo()
+        mejor, mejor_objetivo = actual.copiar(), objetivo
+        self.historial = [(time.perf_counter() - inicio, mejor_objetivo)]
+
+        movimientos = [self.cambiar_turno, self.cambiar_trabajador, self.quitar_orden]
+
+        sin_mejora = 0
+        while time.perf_counter() - inicio < self.configuracion.tiempo_limite:
+            i = int(self.rng.integers(len(self.instancia.ordenes)))
+
+            if i not in actual.asignacion:
+                objetivo += self.insertar_orden(actual, i)
+            else:
+                movimiento = movimientos[self.rng.integers(len(movimientos))]
+                objetivo += movimiento(actual, i)
+
+            if objetivo > mejor_objetivo + 1e-6:
+                mejor, mejor_objetivo = actual.copiar(), objetivo
+                self.historial.append((time.perf_counter() - inicio, mejor_objetivo))
+                sin_mejora = 0
+            else:
+                sin_mejora += 1
+
+            if sin_mejora >= self.configuracion.iteraciones_perturbacion:
+                actual = mejor.copiar()
+                self.perturbar(actual)
+                objetivo = actual.objetivo()
+                sin_mejora = 0
+
+        return mejor_objetivo, SolucionAnotada(
+            instancia=self.instancia, valores=mejor.valores()
+        )
@@ -0,0 +1,282 @@
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..modelo.modelo import ModeloAsignacionCuadrillas
+from ..solver import Solver
+from .busqueda_local import HeuristicaBusquedaLocal
+
+"""Mejora mínima del objetivo para aceptar la solución de un subproblema"""
+TOL_MEJORA = 1e-6
+
+
+class Vecindario(Enum):
+    """Partes del incumbente que el LNS libera en cada iteración"""
+
+    # Todas las asignaciones de un día
+    DIA = 0
+    # Todas las asignaciones de un subconjunto de trabajadores
+    TRABAJADORES = 1
+    # Todas las asignaciones de un grupo de órdenes correlativas
+    CORRELATIVAS = 2
+
+
+@dataclass
+class ConfiguracionLNS:
+    """Configuración del LNS (large neighborhood search) sobre el modelo MIP"""
+
+    """Tiempo límite en segundos"""
+    tiempo_limite: float = 60.0
+
+    """Tiempo límite de cada subproblema en segundos"""
+    tiempo_subproblema: float = 5.0
+
+    """Cantidad máxima de iteraciones (None no limita)"""
+    iteraciones: Optional[int] = None
+
+    vecindarios: Tuple[Vecindario, ...] = tuple(Vecindario)
+
+    """Proporción de los trabajadores que se liberan en el vecindario TRABAJADORES"""
+    proporcion_trabajadores: float = 0.3
+
+    """Cantidad de órdenes que se liberan en el vecindario CORRELATIVAS"""
+    tamaño_grupo: int = 6
+
+    seed: int = 42
+
+
+class LNS:
+    """
+    Matheurística que mejora un incumbente resolviendo sub-MIPs: en cada iteración
+    libera un vecindario y fija el resto de las variables `a` y `r` a su valor en
+    el incumbente, mediante cotas sobre el solver ya armado.
+
+    El modelo se arma una única vez; entre iteraciones sólo cambian las cotas y el
+    MIP start, y al terminar se restauran las cotas originales.
+    """
+
+    def __init__(
+        self,
+        modelo: ModeloAsignacionCuadrillas,
+        solver: Solver,
+        configuracion: ConfiguracionLNS = ConfiguracionLNS(),
+    ) -> None:
+        self.modelo = modelo
+        self.solver = solver
+        self.configuracion = configuracion
+
+        self.rng = np.random.default_rng(configuracion.seed)
+
+        self.indices_asignacion = modelo.indices_asignacion()
+        self.indices_realizacion = modelo.indices_realizacion()
+        self.fijables = np.concatenate(
+            [self.indices_asignacion.ravel(), self.indices_realizacion.ravel()]
+        )
+        self.cotas_inferiores = np.array(
+            [modelo.variables[indice].cota_inferior for indice in self.fijables]
+        )
+        self.cotas_superiores = np.array(
+            [modelo.variables[indice].cota_superior for indice in self.fijables]
+        )
+
+        self.correlativas: List[List[int]] = [
+            [] for _ in modelo.instancia.indices_ordenes
+        ]
+        for i1, i2 in modelo.instancia.ordenes_correlativas:
+            self.correlativas[i1].append(i2)
+            self.correlativas[i2].append(i1)
+
+        # (tiempo, objetivo) cada vez que mejora el incumbente
+        self.historial: List[Tuple[float, float]] = []
+        # vecindario -> cantidad de iteraciones en las que mejoró el incumbente
+        self.mejoras: Dict[Vecindario, int] = {}
+
+    def solucion_inicial(self) -> Tuple[float, List[float]]:
+        """Incumbente inicial, construido golosamente sin usar el solver"""
+        cronograma = HeuristicaBusquedaLocal(
+            self.modelo.instancia, self.modelo.configuracion
+        ).construir()
+        return cronograma.objetivo(), self.modelo.valores_de_cronograma(cronograma)
+
+    ###############
+    # Vecindarios #
+    ###############
+
+    # Cada vecindario recibe los valores de `a` (con forma (i, j, k, l)) y de `r`
+    # (con forma (i, k, l)) del incumbente, y devuelve las máscaras de las
+    # variables que se liberan.
+
+    def liberar_dia(
+        self, asignacion: np.ndarray, realizacion: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Libera todas las asignaciones de un día al azar"""
+        libres_asignacion = np.zeros(asignacion.shape, dtype=bool)
+        libres_realizacion = np.zeros(realizacion.shape, dtype=bool)
+
+        d = self.rng.integers(realizacion.shape[1])
+        libres_asignacion[:, :, d, :] = True
+        libres_realizacion[:, d, :] = True
+
+        return libres_asignacion, libres_realizacion
+
+    def liberar_trabajadores(
+        self, asignacion: np.ndarray, realizacion: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Libera las asignaciones de un subconjunto de trabajadores al azar. Las órdenes
+        no realizadas, y las realizadas sólo por esos trabajadores, también pueden
+        cambiar de (día, turno).
+        """
+        libres_asignacion = np.zeros(asignacion.shape, dtype=bool)
+        libres_realizacion = np.zeros(realizacion.shape, dtype=bool)
+
+        T = asignacion.shape[1]
+        cantidad = max(int(np.ceil(self.configuracion.proporcion_trabajadores * T)), 1)
+        trabajadores = self.rng.choice(T, size=min(cantidad, T), replace=False)
+
+        libres_asignacion[:, trabajadores] = True
+
+        # orden -> trabajadores que la realizan
+        realizan = asignacion.sum(axis=(2, 3)) > 0.5
+        fuera = np.ones(T, dtype=bool)
+        fuera[trabajadores] = False
+        libres_realizacion[~(realizan & fuera).any(axis=1)] = True
+
+        return libres_asignacion, libres_realizacion
+
+    def liberar_correlativas(
+        self, asignacion: np.ndarray, realizacion: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Libera un grupo de órdenes conectadas por correlatividad a partir de una
+        orden al azar, completándolo con órdenes al azar si es necesario.
+        """
+        libres_asignacion = np.zeros(asignacion.shape, dtype=bool)
+        libres_realizacion = np.zeros(realizacion.shape, dtype=bool)
+
+        O = realizacion.shape[0]
+        tamaño = min(self.configuracion.tamaño_grupo, O)
+
+        grupo: List[int] = []
+        pendientes = [int(self.rng.integers(O))]
+        while len(grupo) < tamaño:
+            if len(pendientes) == 0:
+                pendientes = [
+                    int(i) for i in self.rng.permutation(O) if int(i) not in grupo
+                ][:1]
+
+            i = pendientes.pop(0)
+            if i in grupo:
+                continue
+
+            grupo.append(i)
+            pendientes += [
+                vecina for vecina in self.correlativas[i] if vecina not in grupo
+            ]
+
+        libres_asignacion[grupo] = True
+        libres_realizacion[grupo] = True
+
+        return libres_asignacion, libres_realizacion
+
+    ##########
+    # Driver #
+    ##########
+
+    def resolver_subproblema(
+        self,
+        valores: Sequence[float],
+        libres_asignacion: np.ndarray,
+        libres_realizacion: np.ndarray,
+        tiempo_limite: float,
+    ) -> Optional[Tuple[float, List[float]]]:
+        """
+        Resuelve el sub-MIP que resulta de fijar las variables no liberadas a su
+        valor en `valores`, partiendo de esa misma solución. Devuelve el par
+        (objetivo, valores) de la mejor solución, o None si no encontró ninguna.
+        """
+        fijas = ~np.concatenate([libres_asignacion.ravel(), libres_realizacion.ravel()])
+        indices = self.fijables[fijas]
+
+        self.solver.fijar_variables(indices, np.round(np.asarray(valores)[indices]))
+        self.solver.establecer_inicio(valores)
+        self.solver.establecer_tiempo_limite(tiempo_limite)
+
+        try:
+            self.solver.cpx.solve()
+
+            if not self.solver.tiene_solucion():
+                return None
+
+            return (
+                self.solver.cpx.solution.get_objective_value(),
+                self.solver.cpx.solution.get_values(),
+            )
+        finally:
+            # Modificar el modelo descarta la solución, por lo que las cotas se
+            # restauran después de leerla
+            self.solver.establecer_cotas(
+                indices, self.cotas_inferiores[fijas], self.cotas_superiores[fijas]
+            )
+
+    def resolver(
+        self, inicial: Optional[Tuple[float, List[float]]] = None
+    ) -> Tuple[float, List[float]]:
+        """
+        Mejora el incumbente `inicial` (o uno construido golosamente) hasta agotar el
+        tiempo límite o las iteraciones, y devuelve el par (objetivo, valores de las
+        variables) del mejor encontrado.
+        """
+        inicio = time.perf_counter()
+
+        objetivo, valores = inicial if inicial is not None else self.solucion_inicial()
+        self.historial = [(time.perf_counter() - inicio, objetivo)]
+        self.mejoras = {vecindario: 0 for vecindario in self.configuracion.vecindarios}
+
+        liberar = {
+            Vecindario.DIA: self.liberar_dia,
+            Vecindario.TRABAJADORES: self.liberar_trabajadores,
+            Vecindario.CORRELATIVAS: self.liberar_correlativas,
+        }
+
+        iteracion = 0
+        try:
+            while (
+                self.configuracion.iteraciones is None
+                or iteracion < self.configuracion.iteraciones
+            ):
+                restante = self.configuracion.tiempo_limite - (
+                    time.perf_counter() - inicio
+                )
+                if restante <= 0:
+                    break
+
+                vecindario = self.configuracion.vecindarios[
+                    self.rng.integers(len(self.configuracion.vecindarios))
+                ]
+                x = np.asarray(valores)
+                libres = liberar[vecindario](
+                    x[self.indices_asignacion], x[self.indices_realizacion]
+                )
+
+                resultado = self.resolver_subproblema(
+                    valores,
+                    *libres,
+                    tiempo_limite=min(self.configuracion.tiempo_subproblema, restante),
+                )
+
+                if resultado is not None and resultado[0] > objetivo + TOL_MEJORA:
+                    objetivo, valores = resultado
+                    self.historial.append((time.perf_counter() - inicio, objetivo))
+                    self.mejoras[vecindario] += 1
+
+                iteracion += 1
+        finally:
+            self.solver.establecer_tiempo_limite(
+                self.solver.configuracion.tiempo_limite
+            )
+
+        return objetivo, valores
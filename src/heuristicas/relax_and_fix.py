@@ -0,0 +1,161 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..modelo.modelo import ModeloAsignacionCuadrillas
+from ..solver import Solver
+
+
+@dataclass
+class ConfiguracionRelaxAndFix:
+    """Configuración del relax-and-fix por días"""
+
+    """Cantidad de días que son enteros en cada ventana"""
+    dias_por_ventana: int = 1
+
+    """Tiempo límite de cada ventana en segundos (None no limita)"""
+    tiempo_ventana: Optional[float] = None
+
+
+@dataclass
+class ResultadoRelaxAndFix:
+    """Resultado del relax-and-fix por días"""
+
+    objetivo: float
+    valores: List[float]
+
+    """Objetivo de la relajación lineal del modelo completo"""
+    cota_lp: float
+
+    """Gap relativo entre el objetivo y la cota de la relajación lineal"""
+    gap: float
+
+    """Tiempo total en segundos"""
+    tiempo: float
+
+
+class RelaxAndFix:
+    """
+    Heurística de horizonte rodante sobre el modelo MIP: recorre los días en
+    ventanas, resolviendo cada vez el modelo con integralidad sólo en los días de
+    la ventana y el resto de los días relajados, y fija las asignaciones de la
+    ventana antes de avanzar a la siguiente.
+
+    Las variables que no corresponden a un día (tramos de remuneración,
+    repeticiones y conflictos) recuperan la integralidad en la última ventana.
+    Como `LNS`, trabaja sobre el solver ya armado y restaura los tipos y cotas de
+    las variables al terminar.
+    """
+
+    def __init__(
+        self,
+        modelo: ModeloAsignacionCuadrillas,
+        solver: Solver,
+        configuracion: ConfiguracionRelaxAndFix = ConfiguracionRelaxAndFix(),
+    ) -> None:
+        self.modelo = modelo
+        self.solver = solver
+        self.configuracion = configuracion
+
+        instancia = modelo.instancia
+        dias = instancia.indices_dias
+
+        indices_asignacion = modelo.indices_asignacion()
+        indices_realizacion = modelo.indices_realizacion()
+
+        # día -> índices de las variables `a` y `r` del día, que se fijan
+        self.fijables: Dict[int, np.ndarray] = {
+            k: np.concatenate(
+                [
+                    indices_asignacion[:, :, d].ravel(),
+                    indices_realizacion[:, d].ravel(),
+                ]
+            )
+            for d, k in enumerate(dias)
+        }
+
+        # día -> índices de todas las variables del día, que se relajan
+        self.del_dia: Dict[int, np.ndarray] = {
+            k: np.concatenate(
+                [
+                    self.fijables[k],
+                    [
+                        modelo.indice_de(f"d_{j}_{k}")
+                        for j in instancia.indices_trabajadores
+                    ],
+                ]
+            ).astype(int)
+            for k in dias
+        }
+
+        self.tipos = solver.cpx.variables.get_types()
+
+        con_dia = set(np.concatenate(list(self.del_dia.values())).tolist())
+        self.sin_dia = [
+            indice
+            for indice, tipo in enumerate(self.tipos)
+            if tipo != "C" and indice not in con_dia
+        ]
+
+    def restaurar_tipos(self, indices: List[int]) -> None:
+        self.solver.establecer_tipos(indices, [self.tipos[i] for i in indices])
+
+    def resolver(self) -> Optional[ResultadoRelaxAndFix]:
+        """
+        Recorre las ventanas de días y devuelve el resultado, o None si alguna
+        ventana resultó infactible o no encontró solución a tiempo.
+        """
+        inicio = time.perf_counter()
+
+        cota_lp = self.solver.cota_relajacion()
+
+        dias = list(self.modelo.instancia.indices_dias)
+        tamaño = self.configuracion.dias_por_ventana
+        ventanas = [dias[p : p + tamaño] for p in range(0, len(dias), tamaño)]
+
+        todas = list(range(len(self.tipos)))
+        fijadas: List[int] = []
+
+        self.solver.establecer_tiempo_limite(self.configuracion.tiempo_ventana)
+        self.solver.establecer_tipos(todas, ["C"] * len(todas))
+
+        try:
+            for numero, ventana in enumerate(ventanas):
+                for k in ventana:
+                    self.restaurar_tipos(self.del_dia[k].tolist())
+                if numero == len(ventanas) - 1:
+                    self.restaurar_tipos(self.sin_dia)
+
+                self.solver.cpx.solve()
+                if not self.solver.tiene_solucion():
+                    return None
+
+                objetivo = self.solver.cpx.solution.get_objective_value()
+                valores = self.solver.cpx.solution.get_values()
+
+                if numero < len(ventanas) - 1:
+                    indices = np.concatenate([self.fijables[k] for k in ventana])
+                    self.solver.fijar_variables(
+                        indices, np.round(np.asarray(valores)[indices])
+                    )
+                    fijadas += indices.tolist()
+        finally:
+            self.restaurar_tipos(todas)
+            self.solver.establecer_cotas(
+                fijadas,
+                [self.modelo.variables[i].cota_inferior for i in fijadas],
+                [self.modelo.variables[i].cota_superior for i in fijadas],
+            )
+            self.solver.establecer_tiempo_limite(
+                self.solver.configuracion.tiempo_limite
+            )
+
+        return ResultadoRelaxAndFix(
+            objetivo=objetivo,
+            valores=valores,
+            cota_lp=cota_lp,
+            gap=abs(cota_lp - objetivo) / (1e-10 + abs(objetivo)),
+            tiempo=time.perf_counter() - inicio,
+        )
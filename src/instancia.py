@@ -1,8 +1,13 @@
+import hashlib
+import io
 from dataclasses import dataclass
 from typing import Iterable, List, Tuple
 
 import networkx as nx
 
+"""Costo por orden de cada tramo de remuneración (órdenes 1-5, 6-10, 11-15 y 16+)"""
+COSTOS_REMUNERACION = (1000, 1200, 1400, 1500)
+
 
 @dataclass
 class Orden:
@@ -129,6 +134,16 @@ class InstanciaAsignacionCuadrillas:
         """
 
         with open(path, "r") as f:
+            return InstanciaAsignacionCuadrillas.desde_texto(f.read())
+
+    @staticmethod
+    def desde_texto(texto: str) -> "InstanciaAsignacionCuadrillas":
+        """
+        Construye la instancia a partir del formato de texto especificado en el
+        enunciado (ver `a_texto`).
+        """
+
+        with io.StringIO(texto) as f:
             # Lectura cantidad de trabajadores
             cantidad_trabajadores = int(f.readline())
 
@@ -192,9 +207,10 @@ class InstanciaAsignacionCuadrillas:
                 ordenes_repetitivas=ordenes_repetitivas,
             )
 
-    def guardar_texto(self, path: str) -> None:
+    def a_texto(self) -> str:
         """
-        Guarda la instancia usando el formato de texto especificado en el enunciado.
+        Representación de la instancia en el formato de texto especificado en el
+        enunciado.
         """
 
         lines = [
@@ -225,5 +241,15 @@ class InstanciaAsignacionCuadrillas:
             *[f"{i1} {i2}" for i1, i2 in self.ordenes_repetitivas],
         ]
 
+        return "\n".join(map(str, lines))
+
+    def huella(self) -> str:
+        """Hash del contenido de la instancia, que la identifica entre ejecuciones"""
+        return hashlib.sha256(self.a_texto().encode()).hexdigest()
+
+    def guardar_texto(self, path: str) -> None:
+        """
+        Guarda la instancia usando el formato de texto especificado en el enunciado.
+        """
         with open(path, "w") as f:
-            f.write("\n".join(map(str, lines)))
+            f.write(self.a_texto())
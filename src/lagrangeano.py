@@ -0,0 +1,284 @@
+import time
+from itertools import combinations
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .cronograma import (
+    LIMITE_DIARIO,
+    LIMITE_SEMANAL,
+    construir_cronograma,
+    costo_remuneracion,
+)
+from .instancia import COSTOS_REMUNERACION, InstanciaAsignacionCuadrillas
+from .modelo.modelo import ConfiguracionAsignacionCuadrillas
+
+
+@dataclass
+class ConfiguracionLagrangeano:
+    """Configuración del método del subgradiente para la cota lagrangeana"""
+
+    """Cantidad máxima de iteraciones"""
+    iteraciones: int = 500
+
+    """Tiempo límite en segundos (None no limita)"""
+    tiempo_limite: Optional[float] = None
+
+    """Factor inicial del paso de Polyak"""
+    factor_inicial: float = 2.0
+
+    """Iteraciones sin mejorar la cota antes de reducir el factor a la mitad"""
+    iteraciones_reduccion: int = 20
+
+    """Factor mínimo, debajo del cual se detiene el método"""
+    factor_minimo: float = 1e-4
+
+
+@dataclass
+class ResultadoLagrangeano:
+    """Resultado del método del subgradiente"""
+
+    """Mejor (menor) cota superior encontrada del objetivo"""
+    cota: float
+
+    """Objetivo de la solución factible usada para calcular los pasos"""
+    cota_inferior: float
+
+    """Multiplicadores de "cada orden se realiza a lo sumo una vez", por orden"""
+    multiplicadores_ordenes: np.ndarray
+
+    """Multiplicadores de la definición de r, con forma (orden, día, turno)"""
+    multiplicadores_realizacion: np.ndarray
+
+    iteraciones: int
+    tiempo: float
+
+    """Cota de cada iteración"""
+    historial: List[float] = field(default_factory=list)
+
+
+class RelajacionLagrangeana:
+    """
+    Cota superior del objetivo por relajación lagrangeana.
+
+    Se dualizan las restricciones que acoplan órdenes y trabajadores: "cada orden
+    se realiza a lo sumo una vez" (multiplicadores λ_i ≥ 0) y la definición de r,
+    `cant_i r_ikl = Σ_j a_ijkl` (multiplicadores μ_ikl libres). Se descartan las
+    restricciones de conflictos, correlatividades, diferencia máxima y las multas,
+    lo que sólo puede aumentar el objetivo. El lagrangeano se separa en:
+
+    - Un término por (orden, día, turno): r_ikl = 1 si b_i - λ_i - cant_i μ_ikl > 0.
+    - Un término por trabajador: elige a lo sumo una orden por turno, a lo sumo
+      4 turnos por día y 5 días, pagando la remuneración por tramos. Como todos
+      los trabajadores son iguales en la relajación, se resuelve una única vez.
+
+    Los multiplicadores se ajustan con pasos de subgradiente de Polyak, partiendo
+    del mejor precio uniforme (ver `precio_uniforme`).
+    """
+
+    def __init__(
+        self,
+        instancia: InstanciaAsignacionCuadrillas,
+        configuracion: ConfiguracionLagrangeano = ConfiguracionLagrangeano(),
+    ) -> None:
+        self.instancia = instancia
+        self.configuracion = configuracion
+
+        self.beneficios = np.array([orden.beneficio for orden in instancia.ordenes])
+        self.cantidades = np.array([orden.cant_trab for orden in instancia.ordenes])
+        # Nunca se realizan las órdenes que requieren más trabajadores que los
+        # disponibles, ni las que preceden a otra: según la formulación de
+        # `restricciones_ordenes_correlativas`, su sucesora tendría que realizarse
+        # en varios turnos del mismo día
+        self.realizables = self.cantidades <= instancia.cantidad_trabajadores
+        for i1, _ in instancia.ordenes_correlativas:
+            self.realizables[i1] = False
+
+        self.forma = (
+            len(instancia.ordenes),
+            len(instancia.indices_dias),
+            len(instancia.indices_turnos),
+        )
+
+    def cota_inferior_golosa(self) -> float:
+        """Objetivo de un cronograma goloso, que acota inferiormente al óptimo"""
+        return construir_cronograma(
+            self.instancia,
+            ConfiguracionAsignacionCuadrillas.default(),
+            puntaje_ordenes=self.beneficios - 1000 * self.cantidades,
+        ).objetivo()
+
+    def subproblema_trabajador(self, valores: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Resuelve el subproblema de un trabajador dados los valores de trabajar en
+        cada (día, turno). Devuelve el par (valor óptimo, máscara de los turnos
+        elegidos).
+        """
+        D, L = valores.shape
+
+        # Los mejores turnos de cada día, de mayor a menor valor
+        orden_turnos = np.argsort(-valores, axis=1)[:, :LIMITE_DIARIO]
+        mejores = np.take_along_axis(valores, orden_turnos, axis=1)
+
+        mejor_valor, mejor_eleccion = 0.0, np.zeros((D, L), dtype=bool)
+
+        # Se descansan los días que sobran respecto del límite semanal, probando
+        # todas las combinaciones (con 6 días y un límite de 5, una por día)
+        for descanso in _combinaciones_descanso(D, D - LIMITE_SEMANAL):
+            dias = np.setdiff1d(np.arange(D), descanso)
+            candidatos = mejores[dias].ravel()
+            orden_candidatos = np.argsort(-candidatos)
+            acumulado = np.cumsum(candidatos[orden_candidatos]) - costo_remuneracion(
+                np.arange(1, len(candidatos) + 1)
+            )
+
+            # La remuneración es convexa, por lo que conviene tomar un prefijo
+            cantidad = int(np.argmax(acumulado)) + 1
+            if acumulado[cantidad - 1] <= mejor_valor:
+                continue
+
+            mejor_valor = float(acumulado[cantidad - 1])
+            mejor_eleccion = np.zeros((D, L), dtype=bool)
+            elegidos = orden_candidatos[:cantidad]
+            mejor_eleccion[
+                dias[elegidos // LIMITE_DIARIO],
+                orden_turnos[dias[elegidos // LIMITE_DIARIO], elegidos % LIMITE_DIARIO],
+            ] = True
+
+        return mejor_valor, mejor_eleccion
+
+    def evaluar(self, mus: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Evalúa el lagrangeano en los multiplicadores μ, con los λ óptimos para
+        esos μ, y devuelve la tupla (cota, λ, subgradiente respecto de μ).
+
+        Para μ fijos, el término de cada orden es `λ_i + Σ_kl (c_ikl - λ_i)⁺` con
+        `c_ikl = b_i - cant_i μ_ikl`, que se minimiza tomando como λ_i el segundo
+        mayor c_ikl (o 0). Así la orden se realiza sólo en su (día, turno) de mayor
+        c_ikl, y aporta ese valor si es positivo.
+        """
+        T = self.instancia.cantidad_trabajadores
+        O = self.forma[0]
+
+        reducidos = (
+            self.beneficios[:, None, None] - self.cantidades[:, None, None] * mus
+        ).reshape(O, -1)
+        reducidos[~self.realizables] = -np.inf
+
+        mejores_slots = np.argmax(reducidos, axis=1)
+        mejores = reducidos[np.arange(O), mejores_slots]
+        segundos = np.partition(reducidos, -2, axis=1)[:, -2]
+        lambdas = np.where(self.realizables, np.maximum(segundos, 0), 0.0)
+
+        realizadas = mejores > 0
+        r = np.zeros(reducidos.shape)
+        r[np.flatnonzero(realizadas), mejores_slots[realizadas]] = 1
+        r = r.reshape(self.forma)
+
+        # En cada (día, turno), el trabajador elige la orden realizable de mayor μ
+        mus_realizables = np.where(self.realizables[:, None, None], mus, -np.inf)
+        ordenes_elegidas = np.argmax(mus_realizables, axis=0)
+        valor_trabajador, turnos = self.subproblema_trabajador(
+            np.take_along_axis(mus_realizables, ordenes_elegidas[None], axis=0)[0]
+        )
+
+        cota = np.maximum(mejores, 0).sum() + T * valor_trabajador
+
+        asignados = np.zeros(self.forma)
+        dias, turnos_elegidos = np.nonzero(turnos)
+        asignados[ordenes_elegidas[dias, turnos_elegidos], dias, turnos_elegidos] = T
+
+        subgradiente = asignados - self.cantidades[:, None, None] * r
+        subgradiente[~self.realizables] = 0
+
+        return cota, lambdas, subgradiente
+
+    def precio_uniforme(self) -> float:
+        """
+        Mejor valor π para multiplicadores uniformes `μ_ikl = π`: el precio de un
+        turno de trabajo. Como las órdenes y los trabajadores sólo se relacionan a
+        través de π, el lagrangeano es lineal por partes en π, con quiebres en los
+        b_i / cant_i y en los costos de remuneración, y basta evaluar esos puntos.
+        Con π igual al costo mínimo de un trabajador, la cota es a lo sumo
+        `bmp_realizables()`.
+        """
+        candidatos = np.unique(
+            np.concatenate(
+                [
+                    (self.beneficios / self.cantidades)[self.realizables],
+                    COSTOS_REMUNERACION,
+                ]
+            )
+        )
+        cotas = [self.evaluar(np.full(self.forma, precio))[0] for precio in candidatos]
+        return float(candidatos[int(np.argmin(cotas))])
+
+    def resolver(self, cota_inferior: Optional[float] = None) -> ResultadoLagrangeano:
+        """
+        Minimiza el lagrangeano con el método del subgradiente. La `cota_inferior`
+        (el objetivo de una solución factible) se usa para calcular el paso; si no
+        se indica, se construye un cronograma goloso.
+        """
+        inicio = time.perf_counter()
+        configuracion = self.configuracion
+
+        if cota_inferior is None:
+            cota_inferior = self.cota_inferior_golosa()
+
+        mus = np.full(self.forma, self.precio_uniforme())
+
+        mejor = (np.inf, np.zeros(self.forma[0]), mus)
+        historial: List[float] = []
+        factor = configuracion.factor_inicial
+        sin_mejora = 0
+
+        iteracion = 0
+        while iteracion < configuracion.iteraciones and factor >= (
+            configuracion.factor_minimo
+        ):
+            if (
+                configuracion.tiempo_limite is not None
+                and time.perf_counter() - inicio > configuracion.tiempo_limite
+            ):
+                break
+
+            cota, lambdas, subgradiente = self.evaluar(mus)
+            historial.append(cota)
+            iteracion += 1
+
+            if cota < mejor[0] - 1e-9:
+                mejor = (cota, lambdas, mus.copy())
+                sin_mejora = 0
+            else:
+                sin_mejora += 1
+                if sin_mejora >= configuracion.iteraciones_reduccion:
+                    factor /= 2
+                    sin_mejora = 0
+
+            norma = (subgradiente**2).sum()
+            if norma == 0 or cota - cota_inferior <= 1e-9:
+                # Los multiplicadores son óptimos, o la cota coincide con la solución
+                break
+
+            mus = mus - factor * (cota - cota_inferior) / norma * subgradiente
+
+        cota, lambdas, mus = mejor
+
+        return ResultadoLagrangeano(
+            cota=cota,
+            cota_inferior=cota_inferior,
+            multiplicadores_ordenes=lambdas,
+            multiplicadores_realizacion=mus,
+            iteraciones=iteracion,
+            tiempo=time.perf_counter() - inicio,
+            historial=historial,
+        )
+
+
+def _combinaciones_descanso(dias: int, cantidad: int) -> List[np.ndarray]:
+    """Todas las formas de elegir `cantidad` días de descanso"""
+    return [
+        np.array(descanso, dtype=int)
+        for descanso in combinations(range(dias), max(cantidad, 0))
+    ]
@@ -1,10 +1,13 @@
 from collections.abc import Iterable
+import re
 from dataclasses import dataclass
-from typing import Dict, List
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import cplex
+import numpy as np
 
-from ..solver import ConfiguracionCPLEX, Solver
+from ..solver import ConfiguracionCPLEX, ConfiguracionPool, DireccionBranching, Solver
 
 from .restricciones_deseables import (
     EstrategiaConflictos,
@@ -13,6 +16,7 @@ from .restricciones_deseables import (
     IgnorarRepeticiones,
 )
 
+from ..cronograma import Cronograma, construir_cronograma
 from ..instancia import InstanciaAsignacionCuadrillas
 from ..solucion import SolucionAnotada
 from .objetivo import (
@@ -42,6 +46,23 @@ from .variables import (
     variables_trabajo_trabajador_dia,
 )
 
+"""Familias de variables cuyo primer índice es una orden"""
+FAMILIAS_POR_ORDEN = {"a", "r", "t"}
+
+
+def familia_de(nombre: str) -> str:
+    """Familia de una variable, a partir de su nombre (p. ej. "o2_3" -> "o")"""
+    coincidencia = re.match(r"[a-z]+", nombre)
+    assert coincidencia is not None
+    return coincidencia.group()
+
+
+def orden_de(nombre: str) -> Optional[int]:
+    """Orden a la que corresponde una variable, si su familia la tiene como índice"""
+    if familia_de(nombre) not in FAMILIAS_POR_ORDEN:
+        return None
+    return int(nombre.split("_")[1])
+
 
 @dataclass
 class ConfiguracionAsignacionCuadrillas:
@@ -55,6 +76,15 @@ class ConfiguracionAsignacionCuadrillas:
             estrategia_repetitiva=IgnorarRepeticiones(),
         )
 
+    def a_dict(self) -> Dict[str, Any]:
+        """Representación de la configuración con tipos primitivos"""
+        return {
+            "estrategia_conflictos": type(self.estrategia_conflictos).__name__,
+            "penalizacion_conflictos": self.estrategia_conflictos.penalizacion,
+            "estrategia_repetitiva": type(self.estrategia_repetitiva).__name__,
+            "penalizacion_repeticiones": self.estrategia_repetitiva.penalizacion,
+        }
+
 
 class ModeloAsignacionCuadrillas:
     def __init__(
@@ -63,12 +93,21 @@ class ModeloAsignacionCuadrillas:
         configuracion: ConfiguracionAsignacionCuadrillas = ConfiguracionAsignacionCuadrillas.default(),
     ) -> None:
         self.instancia = instancia
+        self.configuracion = configuracion
 
         self.variables: List[Variable] = []
         self.restricciones: List[Restriccion] = []
+        # familia -> restricciones que casi nunca están activas, y que pueden
+        # cargarse de forma perezosa en el solver
+        self.restricciones_perezosas: Dict[str, List[Restriccion]] = {}
         self.objetivo: List[tuple[float, str]] = []
 
         self.nombre_a_indice: Dict[str, int] = {}
+        # (índices de `r`, índices de `a`, beneficios), que `reparar_solucion`
+        # calcula en su primera llamada
+        self.datos_reparacion: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = (
+            None
+        )
 
         self.agregar_variables_base()
         self.agregar_restricciones_base()
@@ -92,6 +131,11 @@ class ModeloAsignacionCuadrillas:
         for restr in restricciones:
             self.agregar_restriccion(restr)
 
+    def agregar_restricciones_perezosas(
+        self, familia: str, restricciones: Iterable[Restriccion]
+    ) -> None:
+        self.restricciones_perezosas.setdefault(familia, []).extend(restricciones)
+
     def agregar_objetivo(self, terminos: TerminosObjetivo) -> None:
         self.objetivo += terminos
 
@@ -112,7 +156,6 @@ class ModeloAsignacionCuadrillas:
             restricciones_limite_semanal,
             restricciones_definicion_r_ikl,
             restricciones_repeticion_de_ordenes,
-            restricciones_ordenes_conflictivas,
             restricciones_ordenes_correlativas,
             restricciones_linearizacion_remuneracion,
             restricciones_definicion_remuneracion,
@@ -120,6 +163,10 @@ class ModeloAsignacionCuadrillas:
         ]:
             self.agregar_restricciones(restr_conj_fn(self.instancia))
 
+        self.agregar_restricciones_perezosas(
+            "ordenes_conflictivas", restricciones_ordenes_conflictivas(self.instancia)
+        )
+
     def agregar_objetivo_base(self) -> None:
         self.agregar_objetivo(objetivo_beneficio_ordenes(self.instancia))
         self.agregar_objetivo(objetivo_costo_trabajadores(self.instancia))
@@ -151,21 +198,161 @@ class ModeloAsignacionCuadrillas:
             )
 
         for restr in self.restricciones:
-            expresion_traspuesta = []
-            expresion_traspuesta += [
-                (self.indice_de(var), coef) for coef, var in restr.terminos_izq
-            ]
-            expresion_traspuesta += [
-                (self.indice_de(var), -coef) for coef, var in restr.terminos_der
-            ]
-
             cpx.linear_constraints.add(
-                lin_expr=[list(zip(*expresion_traspuesta))],
+                lin_expr=[self.expresion_de(restr)],
                 senses=[restr.sentido],
                 rhs=[restr.term_independiente],
             )
 
-        return Solver(cpx, configuracion=configuracion)
+        solver = Solver(cpx, configuracion=configuracion)
+
+        solver.establecer_prioridades(self.prioridades_branching(configuracion))
+
+        solver.registrar_heuristica_reparacion(self.reparar_solucion)
+
+        solver.cargar_restricciones_perezosas(
+            {
+                familia: [
+                    (*self.expresion_de(restr), restr.sentido, restr.term_independiente)
+                    for restr in restricciones
+                ]
+                for familia, restricciones in self.restricciones_perezosas.items()
+            }
+        )
+
+        return solver
+
+    def prioridades_branching(
+        self, configuracion: ConfiguracionCPLEX
+    ) -> List[Tuple[int, int, DireccionBranching]]:
+        """
+        Calcula las prioridades de branching de las variables, como tuplas
+        (índice, prioridad, dirección).
+
+        Las familias configuradas primero reciben mayor prioridad. Si se prioriza por
+        beneficio, dentro de cada familia las variables de las órdenes de mayor
+        beneficio tienen mayor prioridad.
+        """
+        familias = configuracion.prioridades_branching
+        cantidad_ordenes = len(self.instancia.ordenes)
+
+        # orden -> posición en el ranking de beneficios (0 es el menor beneficio)
+        ranking_beneficio = {
+            i: posicion
+            for posicion, i in enumerate(
+                sorted(
+                    self.instancia.indices_ordenes,
+                    key=lambda i: self.instancia.ordenes[i].beneficio,
+                )
+            )
+        }
+
+        prioridades = []
+        for indice, var in enumerate(self.variables):
+            for posicion, prioridad in enumerate(familias):
+                if familia_de(var.nombre) != prioridad.familia:
+                    continue
+
+                valor = (len(familias) - posicion) * (cantidad_ordenes + 1)
+
+                orden = orden_de(var.nombre)
+                if configuracion.prioridad_por_beneficio and orden is not None:
+                    valor += ranking_beneficio[orden] + 1
+
+                prioridades.append((indice, valor, prioridad.direccion))
+
+        return prioridades
+
+    def expresion_de(self, restr: Restriccion) -> Tuple[List[int], List[float]]:
+        """
+        Devuelve la expresión `izq - der` de la restricción como un par
+        (índices de las variables, coeficientes).
+        """
+        expresion_traspuesta = []
+        expresion_traspuesta += [
+            (self.indice_de(var), coef) for coef, var in restr.terminos_izq
+        ]
+        expresion_traspuesta += [
+            (self.indice_de(var), -coef) for coef, var in restr.terminos_der
+        ]
+
+        indices, coeficientes = zip(*expresion_traspuesta)
+        return list(indices), list(coeficientes)
+
+    def indices_asignacion(self) -> np.ndarray:
+        """Índices de las variables `a_{i}_{j}_{k}_{l}`, con forma (i, j, k, l)"""
+        indices = (
+            self.instancia.indices_ordenes,
+            self.instancia.indices_trabajadores,
+            self.instancia.indices_dias,
+            self.instancia.indices_turnos,
+        )
+        return np.array(
+            [self.indice_de(f"a_{i}_{j}_{k}_{l}") for i, j, k, l in product(*indices)],
+            dtype=int,
+        ).reshape([len(rango) for rango in indices])
+
+    def indices_realizacion(self) -> np.ndarray:
+        """Índices de las variables `r_{i}_{k}_{l}`, con forma (i, k, l)"""
+        indices = (
+            self.instancia.indices_ordenes,
+            self.instancia.indices_dias,
+            self.instancia.indices_turnos,
+        )
+        return np.array(
+            [self.indice_de(f"r_{i}_{k}_{l}") for i, k, l in product(*indices)],
+            dtype=int,
+        ).reshape([len(rango) for rango in indices])
+
+    def filas_diferencia_maxima(self) -> List[int]:
+        """
+        Posiciones en `restricciones` de las filas de diferencia máxima entre
+        trabajadores: las únicas que sólo involucran variables `o`.
+        """
+        return [
+            fila
+            for fila, restr in enumerate(self.restricciones)
+            if all(
+                familia_de(var) == "o"
+                for _, var in restr.terminos_izq + restr.terminos_der
+            )
+        ]
+
+    def valores_de_cronograma(self, cronograma: Cronograma) -> List[float]:
+        """Valores de todas las variables del modelo para el cronograma"""
+        valores = cronograma.valores()
+        return [valores.get(var.nombre, 0.0) for var in self.variables]
+
+    def reparar_solucion(self, solucion: Sequence[float]) -> Tuple[float, List[float]]:
+        """
+        Redondea y repara una solución posiblemente fraccionaria (por ejemplo, la
+        relajación de un nodo) en un cronograma factible.
+
+        Las órdenes se insertan de mayor a menor beneficio esperado según `r`, cada
+        una en los (día, turno) de mayor `r` y con los trabajadores de mayor `a`.
+        Devuelve el par (objetivo, valores de las variables) del cronograma.
+        """
+        if self.datos_reparacion is None:
+            self.datos_reparacion = (
+                self.indices_realizacion(),
+                self.indices_asignacion(),
+                np.array([orden.beneficio for orden in self.instancia.ordenes]),
+            )
+        indices_realizacion, indices_asignacion, beneficios = self.datos_reparacion
+
+        x = np.asarray(solucion)
+        realizacion = x[indices_realizacion]
+        asignacion = x[indices_asignacion]
+
+        cronograma = construir_cronograma(
+            self.instancia,
+            self.configuracion,
+            puntaje_ordenes=realizacion.sum(axis=(1, 2)) * beneficios,
+            puntaje_slots=realizacion,
+            preferencia_trabajadores=asignacion,
+        )
+
+        return cronograma.objetivo(), self.valores_de_cronograma(cronograma)
 
     def anotar_solucion(self, solucion: List[float]) -> SolucionAnotada:
         assert len(solucion) == len(self.variables)
@@ -173,3 +360,18 @@ class ModeloAsignacionCuadrillas:
             instancia=self.instancia,
             valores={self.nombre_de(i): valor for i, valor in enumerate(solucion)},
         )
+
+    def soluciones_alternativas(
+        self, solver: Solver, configuracion: ConfiguracionPool
+    ) -> List[SolucionAnotada]:
+        """
+        Busca hasta `configuracion.cantidad` cronogramas casi óptimos en una única
+        búsqueda, midiendo la diversidad sobre dónde se realiza cada orden.
+        """
+        return [
+            self.anotar_solucion(valores)
+            for _, valores in solver.poblar(
+                configuracion,
+                variables_diversidad=self.indices_realizacion().ravel().tolist(),
+            )
+        ]
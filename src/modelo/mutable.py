@@ -0,0 +1,262 @@
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from ..instancia import InstanciaAsignacionCuadrillas
+from ..solver import ConfiguracionCPLEX, FilaPerezosa
+from .modelo import ConfiguracionAsignacionCuadrillas, ModeloAsignacionCuadrillas
+from .objetivo import TerminosObjetivo
+from .restricciones import Restriccion
+from .restricciones_deseables import (
+    EstrategiaConflictos,
+    EstrategiaRepeticiones,
+    IgnorarConflictos,
+    IgnorarRepeticiones,
+)
+from .variables import Variable
+
+
+class Bloque:
+    """
+    Variables, filas, filas perezosas y términos del objetivo que una estrategia
+    agrega al modelo.
+
+    Tiene la misma interfaz que `ModeloAsignacionCuadrillas` para agregarlos, de
+    forma que las estrategias se pueden aplicar sobre un bloque.
+    """
+
+    def __init__(self) -> None:
+        self.variables: List[Variable] = []
+        self.restricciones: List[Restriccion] = []
+        self.restricciones_perezosas: Dict[str, List[Restriccion]] = {}
+        self.objetivo: List[Tuple[float, str]] = []
+
+    def agregar_variables(self, variables: Iterable[Variable]) -> None:
+        self.variables.extend(variables)
+
+    def agregar_restricciones(self, restricciones: Iterable[Restriccion]) -> None:
+        self.restricciones.extend(restricciones)
+
+    def agregar_restricciones_perezosas(
+        self, familia: str, restricciones: Iterable[Restriccion]
+    ) -> None:
+        self.restricciones_perezosas.setdefault(familia, []).extend(restricciones)
+
+    def agregar_objetivo(self, terminos: TerminosObjetivo) -> None:
+        self.objetivo += terminos
+
+    def misma_estructura(self, otro: "Bloque") -> bool:
+        """Si los bloques sólo difieren en los coeficientes del objetivo"""
+        return (
+            self.variables == otro.variables
+            and self.restricciones == otro.restricciones
+            and self.restricciones_perezosas == otro.restricciones_perezosas
+        )
+
+
+Estrategia = Union[EstrategiaConflictos, EstrategiaRepeticiones]
+
+
+class ModeloMutable:
+    """
+    Modelo armado en un solver, cuyas estrategias de conflictos y de repeticiones
+    se cambian en el lugar, sin volver a armar el modelo base.
+
+    Lo que agrega cada estrategia se carga en el solver como un bloque con nombre
+    ("conflictos" y "repeticiones"), que se puede quitar o reemplazar. Entre
+    estrategias que sólo difieren en la penalización (por ejemplo, dos
+    `MultarConflictos`) sólo se cambian los coeficientes del objetivo.
+
+    `modelo` describe siempre el modelo cargado en `solver`, por lo que se puede
+    seguir usando para indexar y anotar soluciones.
+    """
+
+    def __init__(
+        self,
+        instancia: InstanciaAsignacionCuadrillas,
+        configuracion: ConfiguracionAsignacionCuadrillas = ConfiguracionAsignacionCuadrillas.default(),
+        configuracion_solver: ConfiguracionCPLEX = ConfiguracionCPLEX(),
+    ) -> None:
+        self.instancia = instancia
+        self.configuracion_solver = configuracion_solver
+
+        self.modelo = ModeloAsignacionCuadrillas(
+            instancia,
+            ConfiguracionAsignacionCuadrillas(
+                estrategia_conflictos=IgnorarConflictos(),
+                estrategia_repetitiva=IgnorarRepeticiones(),
+            ),
+        )
+        self.solver = self.modelo.armar_solver(configuracion_solver)
+
+        self.bloques: Dict[str, Bloque] = {}
+
+        self.cambiar_estrategia_conflictos(configuracion.estrategia_conflictos)
+        self.cambiar_estrategia_repeticiones(configuracion.estrategia_repetitiva)
+
+    @property
+    def configuracion(self) -> ConfiguracionAsignacionCuadrillas:
+        return self.modelo.configuracion
+
+    def cambiar_estrategia_conflictos(self, estrategia: EstrategiaConflictos) -> None:
+        self.cambiar_estrategia("conflictos", estrategia)
+        self.modelo.configuracion = replace(
+            self.modelo.configuracion, estrategia_conflictos=estrategia
+        )
+
+    def cambiar_estrategia_repeticiones(
+        self, estrategia: EstrategiaRepeticiones
+    ) -> None:
+        self.cambiar_estrategia("repeticiones", estrategia)
+        self.modelo.configuracion = replace(
+            self.modelo.configuracion, estrategia_repetitiva=estrategia
+        )
+
+    def cambiar_estrategia(self, nombre: str, estrategia: Estrategia) -> None:
+        """Reemplaza el bloque `nombre` por el que agrega la estrategia"""
+        bloque = Bloque()
+        estrategia(self.instancia, bloque)  # type: ignore
+
+        anterior = self.bloques.get(nombre)
+        if anterior is not None and anterior.misma_estructura(bloque):
+            self.cambiar_objetivo(nombre, bloque)
+            return
+
+        if anterior is not None:
+            self.quitar_bloque(nombre)
+        self.agregar_bloque(nombre, bloque)
+
+    def agregar_bloque(self, nombre: str, bloque: Bloque) -> None:
+        assert nombre not in self.bloques
+        modelo, cpx = self.modelo, self.solver.cpx
+
+        cantidad_variables = len(modelo.variables)
+
+        objetivo: Dict[str, float] = {}
+        for coef, variable in bloque.objetivo:
+            objetivo[variable] = objetivo.get(variable, 0) + coef
+
+        modelo.agregar_variables(bloque.variables)
+        if len(bloque.variables) > 0:
+            cpx.variables.add(
+                obj=[objetivo.get(var.nombre, 0) for var in bloque.variables],
+                lb=[var.cota_inferior for var in bloque.variables],
+                ub=[var.cota_superior for var in bloque.variables],
+                types=[var.tipo for var in bloque.variables],
+                names=[var.nombre for var in bloque.variables],
+            )
+        modelo.agregar_objetivo(bloque.objetivo)
+
+        modelo.agregar_restricciones(bloque.restricciones)
+        if len(bloque.restricciones) > 0:
+            cpx.linear_constraints.add(
+                lin_expr=[modelo.expresion_de(restr) for restr in bloque.restricciones],
+                senses=[restr.sentido for restr in bloque.restricciones],
+                rhs=[restr.term_independiente for restr in bloque.restricciones],
+                names=self.nombres_filas(nombre, len(bloque.restricciones)),
+            )
+
+        for familia, restricciones in bloque.restricciones_perezosas.items():
+            modelo.agregar_restricciones_perezosas(familia, restricciones)
+        self.solver.agregar_restricciones_perezosas(
+            self.filas_perezosas(bloque.restricciones_perezosas)
+        )
+
+        self.solver.establecer_prioridades(
+            [
+                prioridad
+                for prioridad in modelo.prioridades_branching(self.configuracion_solver)
+                if prioridad[0] >= cantidad_variables
+            ]
+        )
+
+        self.bloques[nombre] = bloque
+
+    def quitar_bloque(self, nombre: str) -> None:
+        bloque = self.bloques.pop(nombre)
+        modelo, cpx = self.modelo, self.solver.cpx
+
+        if len(bloque.restricciones) > 0:
+            cpx.linear_constraints.delete(
+                self.nombres_filas(nombre, len(bloque.restricciones))
+            )
+        quitadas = {id(restr) for restr in bloque.restricciones}
+        modelo.restricciones = [
+            restr for restr in modelo.restricciones if id(restr) not in quitadas
+        ]
+
+        for familia in bloque.restricciones_perezosas:
+            del modelo.restricciones_perezosas[familia]
+
+        nombres = {var.nombre for var in bloque.variables}
+        if len(nombres) > 0:
+            cpx.variables.delete([var.nombre for var in bloque.variables])
+        modelo.variables = [
+            var for var in modelo.variables if var.nombre not in nombres
+        ]
+        modelo.nombre_a_indice = {
+            var.nombre: indice for indice, var in enumerate(modelo.variables)
+        }
+        modelo.objetivo = [
+            (coef, variable)
+            for coef, variable in modelo.objetivo
+            if variable not in nombres
+        ]
+
+        # Las filas perezosas que quedan se reindexan, porque se quitaron variables
+        self.solver.quitar_restricciones_perezosas(
+            list(bloque.restricciones_perezosas),
+            self.filas_perezosas(modelo.restricciones_perezosas),
+        )
+
+    def cambiar_objetivo(self, nombre: str, bloque: Bloque) -> None:
+        """Cambia los coeficientes del objetivo del bloque por los de `bloque`"""
+        modelo = self.modelo
+
+        objetivo: Dict[str, float] = {var.nombre: 0.0 for var in bloque.variables}
+        for coef, variable in bloque.objetivo:
+            objetivo[variable] = objetivo.get(variable, 0) + coef
+
+        if len(objetivo) > 0:
+            self.solver.cpx.objective.set_linear(
+                [
+                    (modelo.indice_de(variable), coef)
+                    for variable, coef in objetivo.items()
+                ]
+            )
+
+        # Los términos del objetivo de un bloque son sobre sus propias variables
+        modelo.objetivo = [
+            (coef, variable)
+            for coef, variable in modelo.objetivo
+            if variable not in objetivo
+        ] + bloque.objetivo
+
+        # Se conserva el bloque cargado, cuyas filas son las que están en el modelo
+        self.bloques[nombre].objetivo = bloque.objetivo
+
+    def filas_perezosas(
+        self, familias: Dict[str, List[Restriccion]]
+    ) -> Dict[str, List[FilaPerezosa]]:
+        return {
+            familia: [
+                (
+                    *self.modelo.expresion_de(restr),
+                    restr.sentido,
+                    restr.term_independiente,
+                )
+                for restr in restricciones
+            ]
+            for familia, restricciones in familias.items()
+        }
+
+    @staticmethod
+    def nombres_filas(nombre: str, cantidad: int) -> List[str]:
+        return [f"{nombre}#{fila}" for fila in range(cantidad)]
+
+    def resolver(
+        self, inicio: Optional[List[float]] = None
+    ) -> Tuple[float, List[float]]:
+        """Resuelve con las estrategias actuales, partiendo de `inicio` si se indica"""
+        if inicio is not None:
+            self.solver.establecer_inicio(inicio)
+        return self.solver.resolver()
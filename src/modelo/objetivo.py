@@ -1,7 +1,7 @@
 from collections.abc import Iterable
 from typing import Tuple
 
-from ..instancia import InstanciaAsignacionCuadrillas
+from ..instancia import COSTOS_REMUNERACION, InstanciaAsignacionCuadrillas
 
 
 TerminosObjetivo = Iterable[Tuple[float, str]]
@@ -31,9 +31,7 @@ def objetivo_costo_trabajadores(
         termino
         for j in instancia.indices_trabajadores
         for termino in [
-            (-1000, f"o1_{j}"),
-            (-1200, f"o2_{j}"),
-            (-1400, f"o3_{j}"),
-            (-1500, f"o4_{j}"),
+            (-costo, f"o{tramo}_{j}")
+            for tramo, costo in enumerate(COSTOS_REMUNERACION, start=1)
         ]
     ]
@@ -208,6 +208,12 @@ def objetivo_multa_repeticiones(
 
 
 class EstrategiaConflictos(ABC):
+    """Si la estrategia prohíbe que dos trabajadores en conflicto compartan una orden"""
+    prohibe_conflictos: bool = False
+
+    """Multa por cada par de trabajadores en conflicto que comparten una orden"""
+    penalizacion: float = 0.0
+
     @abstractmethod
     def __call__(
         self,
@@ -229,12 +235,16 @@ class IgnorarConflictos(EstrategiaConflictos):
 
 
 class EvitarConflictos(EstrategiaConflictos):
+    prohibe_conflictos = True
+
     def __call__(
         self,
         instancia: InstanciaAsignacionCuadrillas,
         modelo: "ModeloAsignacionCuadrillas",
     ) -> None:
-        modelo.agregar_restricciones(restricciones_evitar_conflictos(instancia))
+        modelo.agregar_restricciones_perezosas(
+            "evitar_conflictos", restricciones_evitar_conflictos(instancia)
+        )
 
 
 class MultarConflictos(EstrategiaConflictos):
@@ -257,6 +267,12 @@ class MultarConflictos(EstrategiaConflictos):
 
 
 class EstrategiaRepeticiones(ABC):
+    """Si la estrategia prohíbe que un trabajador realice dos órdenes repetitivas"""
+    prohibe_repeticiones: bool = False
+
+    """Multa por cada trabajador que realiza un par de órdenes repetitivas"""
+    penalizacion: float = 0.0
+
     @abstractmethod
     def __call__(
         self,
@@ -287,6 +303,8 @@ class IgnorarRepeticiones(EstrategiaRepeticiones):
 
 
 class EvitarRepeticiones(EstrategiaRepeticiones):
+    prohibe_repeticiones = True
+
     def __call__(
         self,
         instancia: InstanciaAsignacionCuadrillas,
@@ -0,0 +1,212 @@
+import json
+import multiprocessing as mp
+import os
+import queue
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .instancia import InstanciaAsignacionCuadrillas
+from .modelo.modelo import (
+    ConfiguracionAsignacionCuadrillas,
+    ModeloAsignacionCuadrillas,
+)
+from .solver import ConfiguracionCPLEX
+
+"""Tiempo extra que se espera a los procesos después del límite, para recibir sus
+incumbentes"""
+MARGEN_ESPERA = 5.0
+
+
+@dataclass
+class ResultadoPortafolio:
+    """Resultado de resolver una instancia con un portafolio de configuraciones"""
+
+    """Nombre de la configuración ganadora"""
+    ganadora: str
+    configuracion: ConfiguracionCPLEX
+
+    objetivo: float
+    valores: List[float]
+
+    """Si la configuración ganadora probó la optimalidad"""
+    optima: bool
+
+    """Tiempo hasta que se obtuvo el resultado"""
+    tiempo: float
+
+    """Configuración -> (objetivo, óptima, tiempo) de las que terminaron a tiempo"""
+    terminadas: Dict[str, Tuple[Optional[float], bool, float]]
+
+
+def _resolver_configuracion(
+    nombre: str,
+    instancia: InstanciaAsignacionCuadrillas,
+    configuracion_modelo: ConfiguracionAsignacionCuadrillas,
+    configuracion: ConfiguracionCPLEX,
+    fin: float,
+    resultados: "mp.Queue",
+) -> None:
+    """Resuelve la instancia con una configuración del portafolio, hasta `fin`"""
+    objetivo, valores, optima = None, None, False
+
+    try:
+        modelo = ModeloAsignacionCuadrillas(instancia, configuracion_modelo)
+        solver = modelo.armar_solver(
+            replace(configuracion, tiempo_limite=max(fin - time.time(), 0.0))
+        )
+
+        solver.cpx.solve()
+
+        if solver.tiene_solucion():
+            objetivo = solver.cpx.solution.get_objective_value()
+            valores = solver.cpx.solution.get_values()
+            optima = solver.es_optima()
+    finally:
+        # Siempre se informa el resultado, para no esperar a un proceso que falló
+        resultados.put((nombre, objetivo, valores, optima))
+
+
+def resolver_portafolio(
+    instancia: InstanciaAsignacionCuadrillas,
+    configuraciones: Dict[str, ConfiguracionCPLEX],
+    tiempo_limite: float,
+    configuracion_modelo: ConfiguracionAsignacionCuadrillas = ConfiguracionAsignacionCuadrillas.default(),
+    registro: Optional[Path] = None,
+) -> Optional[ResultadoPortafolio]:
+    """
+    Resuelve la instancia con todas las configuraciones a la vez, cada una en su
+    propio proceso.
+
+    Gana la primera configuración que prueba la optimalidad y, si ninguna lo hace
+    antes del tiempo límite, la de mejor incumbente. Las demás se abortan.
+    Si se indica un `registro`, se agrega una línea con la configuración ganadora.
+
+    Las configuraciones que no fijan sus `hilos` se reparten los procesadores del
+    equipo, para no competir por ellos.
+
+    Devuelve None si ninguna configuración encontró una solución.
+    """
+    hilos = max(1, (os.cpu_count() or 1) // len(configuraciones))
+    configuraciones = {
+        nombre: (
+            configuracion
+            if configuracion.hilos is not None
+            else replace(configuracion, hilos=hilos)
+        )
+        for nombre, configuracion in configuraciones.items()
+    }
+
+    inicio = time.time()
+    fin = inicio + tiempo_limite
+
+    resultados: "mp.Queue" = mp.Queue()
+    procesos = {
+        nombre: mp.Process(
+            target=_resolver_configuracion,
+            args=(
+                nombre,
+                instancia,
+                configuracion_modelo,
+                configuracion,
+                fin,
+                resultados,
+            ),
+            daemon=True,
+        )
+        for nombre, configuracion in configuraciones.items()
+    }
+
+    for proceso in procesos.values():
+        proceso.start()
+
+    mejor: Optional[Tuple[str, float, List[float], bool, float]] = None
+    terminadas: Dict[str, Tuple[Optional[float], bool, float]] = {}
+
+    try:
+        while len(terminadas) < len(procesos):
+            restante = fin + MARGEN_ESPERA - time.time()
+            if restante <= 0:
+                break
+
+            try:
+                nombre, objetivo, valores, optima = resultados.get(timeout=restante)
+            except queue.Empty:
+                break
+
+            tiempo = time.time() - inicio
+            terminadas[nombre] = (objetivo, optima, tiempo)
+
+            if objetivo is not None and (mejor is None or objetivo > mejor[1]):
+                mejor = (nombre, objetivo, valores, optima, tiempo)
+
+            if optima:
+                mejor = (nombre, objetivo, valores, optima, tiempo)
+                break
+    finally:
+        for proceso in procesos.values():
+            if proceso.is_alive():
+                proceso.terminate()
+            proceso.join()
+
+    if mejor is None:
+        return None
+
+    nombre, objetivo, valores, optima, tiempo = mejor
+    resultado = ResultadoPortafolio(
+        ganadora=nombre,
+        configuracion=configuraciones[nombre],
+        objetivo=objetivo,
+        valores=valores,
+        optima=optima,
+        tiempo=tiempo,
+        terminadas=terminadas,
+    )
+
+    if registro is not None:
+        registrar_ganadora(registro, instancia, resultado)
+
+    return resultado
+
+
+def registrar_ganadora(
+    registro: Path,
+    instancia: InstanciaAsignacionCuadrillas,
+    resultado: ResultadoPortafolio,
+) -> None:
+    """
+    Agrega al registro (un archivo JSON por línea) la configuración ganadora, junto
+    con las características de la instancia.
+    """
+    with open(registro, "a") as f:
+        f.write(
+            json.dumps(
+                {
+                    "cantidad_trabajadores": instancia.cantidad_trabajadores,
+                    "cantidad_ordenes": len(instancia.ordenes),
+                    "conflictos_trabajadores": len(instancia.conflictos_trabajadores),
+                    "ordenes_correlativas": len(instancia.ordenes_correlativas),
+                    "ordenes_conflictivas": len(instancia.ordenes_conflictivas),
+                    "ordenes_repetitivas": len(instancia.ordenes_repetitivas),
+                    "ganadora": resultado.ganadora,
+                    "configuracion": resultado.configuracion.a_dict(),
+                    "objetivo": resultado.objetivo,
+                    "optima": resultado.optima,
+                    "tiempo": resultado.tiempo,
+                }
+            )
+            + "\n"
+        )
+
+
+def contar_ganadoras(registro: Path) -> Dict[str, int]:
+    """Cantidad de veces que ganó cada configuración en el registro"""
+    ganadoras: Dict[str, int] = {}
+
+    with open(registro, "r") as f:
+        for linea in f:
+            nombre = json.loads(linea)["ganadora"]
+            ganadoras[nombre] = ganadoras.get(nombre, 0) + 1
+
+    return ganadoras
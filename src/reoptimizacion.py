@@ -0,0 +1,409 @@
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .cronograma import Cronograma
+from .instancia import InstanciaAsignacionCuadrillas, Orden
+from .modelo.modelo import ModeloAsignacionCuadrillas, familia_de
+from .modelo.restricciones import Restriccion
+from .solucion import SolucionAnotada
+from .solver import FilaPerezosa, Solver
+
+
+@dataclass
+class DeltaInstancia:
+    """
+    Cambios sobre una instancia ya resuelta.
+
+    Las órdenes canceladas y los trabajadores ausentes siguen en la instancia, para
+    que los índices de las variables no cambien: el modelo les prohíbe trabajar.
+    """
+
+    """Órdenes a agregar, que reciben los índices siguientes a las existentes"""
+    ordenes_nuevas: List[Orden] = field(default_factory=list)
+
+    """Índices de las órdenes que ya no deben realizarse"""
+    ordenes_canceladas: Set[int] = field(default_factory=set)
+
+    """Índices de los trabajadores que no pueden recibir órdenes"""
+    trabajadores_ausentes: Set[int] = field(default_factory=set)
+
+    """Relaciones nuevas, que pueden involucrar a las órdenes nuevas"""
+    ordenes_correlativas: List[Tuple[int, int]] = field(default_factory=list)
+    ordenes_conflictivas: List[Tuple[int, int]] = field(default_factory=list)
+    ordenes_repetitivas: List[Tuple[int, int]] = field(default_factory=list)
+
+    def aplicar(
+        self, instancia: InstanciaAsignacionCuadrillas
+    ) -> InstanciaAsignacionCuadrillas:
+        """Instancia que resulta de agregar las órdenes y relaciones nuevas"""
+        return replace(
+            instancia,
+            ordenes=instancia.ordenes
+            + [
+                replace(orden, id=len(instancia.ordenes) + posicion)
+                for posicion, orden in enumerate(self.ordenes_nuevas)
+            ],
+            ordenes_correlativas=instancia.ordenes_correlativas
+            + self.ordenes_correlativas,
+            ordenes_conflictivas=instancia.ordenes_conflictivas
+            + self.ordenes_conflictivas,
+            ordenes_repetitivas=instancia.ordenes_repetitivas
+            + self.ordenes_repetitivas,
+        )
+
+
+@dataclass
+class ConfiguracionReoptimizacion:
+    """Configuración de `Reoptimizador`"""
+
+    """
+    Beneficio por cada asignación (orden, trabajador, día, turno) del cronograma
+    anterior que se mantiene. Equivale a penalizar cada una que cambia.
+    """
+    penalizacion_cambios: float = 0.0
+
+    """Tiempo límite de cada reoptimización en segundos (None no limita)"""
+    tiempo_limite: Optional[float] = None
+
+
+@dataclass
+class ResultadoReoptimizacion:
+    """Resultado de reoptimizar ante un delta de la instancia"""
+
+    """Objetivo del modelo, sin el beneficio por estabilidad"""
+    objetivo: float
+    valores: List[float]
+    solucion: SolucionAnotada
+
+    """Objetivo del cronograma anterior reparado, que se usa como MIP start"""
+    objetivo_inicio: float
+
+    """Asignaciones (orden, trabajador, día, turno) agregadas o quitadas"""
+    cambios: int
+
+    """Tiempo de actualizar el modelo y reparar el cronograma anterior"""
+    tiempo_actualizacion: float
+    tiempo_resolucion: float
+
+
+# (sentido, variables ya existentes con el signo de su coeficiente)
+ClaveFila = Tuple[str, FrozenSet[Tuple[str, bool]]]
+
+
+def _terminos(restr: Restriccion) -> List[Tuple[float, str]]:
+    """Términos de la expresión `izq - der` de la restricción"""
+    return restr.terminos_izq + [(-coef, var) for coef, var in restr.terminos_der]
+
+
+class Reoptimizador:
+    """
+    Reoptimiza un modelo ya armado ante cambios en la instancia, sin rearmarlo.
+
+    Las columnas y filas nuevas se agregan al solver y las existentes se
+    modifican en el lugar. El cronograma anterior, reparado, entra como MIP start.
+    """
+
+    def __init__(
+        self,
+        modelo: ModeloAsignacionCuadrillas,
+        solver: Solver,
+        configuracion: ConfiguracionReoptimizacion = ConfiguracionReoptimizacion(),
+    ) -> None:
+        self.modelo = modelo
+        self.solver = solver
+        self.configuracion = configuracion
+
+        # restricción del modelo -> fila del solver
+        self.filas: List[int] = list(range(len(modelo.restricciones)))
+
+        self.canceladas: Set[int] = set()
+        self.ausentes: Set[int] = set()
+
+    def restringir(self, modelo: ModeloAsignacionCuadrillas) -> None:
+        """
+        Prohíbe las órdenes canceladas y a los trabajadores ausentes en el modelo,
+        y quita a los ausentes de la diferencia máxima entre trabajadores.
+        """
+        for var in modelo.variables:
+            familia = familia_de(var.nombre)
+            if familia not in ("a", "r"):
+                continue
+
+            indices = [int(indice) for indice in var.nombre.split("_")[1:]]
+            if indices[0] in self.canceladas or (
+                familia == "a" and indices[1] in self.ausentes
+            ):
+                var.cota_superior = 0.0
+
+        for fila in modelo.filas_diferencia_maxima():
+            restr = modelo.restricciones[fila]
+            if any(
+                int(var.split("_")[1]) in self.ausentes for _, var in restr.terminos_izq
+            ):
+                restr.term_independiente = float(len(modelo.instancia.ordenes))
+
+    def actualizar(self, delta: DeltaInstancia) -> None:
+        """Aplica el delta al modelo y al solver, en el lugar"""
+        cpx = self.solver.cpx
+        anterior = self.modelo
+
+        self.canceladas |= delta.ordenes_canceladas
+        self.ausentes |= delta.trabajadores_ausentes
+
+        nuevo = ModeloAsignacionCuadrillas(
+            delta.aplicar(anterior.instancia), anterior.configuracion
+        )
+        self.restringir(nuevo)
+
+        def coeficientes(modelo: ModeloAsignacionCuadrillas) -> Dict[str, float]:
+            objetivo: Dict[str, float] = {}
+            for coef, nombre in modelo.objetivo:
+                objetivo[nombre] = objetivo.get(nombre, 0) + coef
+            return objetivo
+
+        objetivo_anterior, objetivo_nuevo = coeficientes(anterior), coeficientes(nuevo)
+
+        # Columnas: las existentes conservan su índice y las nuevas van al final
+        variables = list(anterior.variables)
+        agregadas = []
+        cambios_cotas: List[int] = []
+        cambios_objetivo: List[Tuple[int, float]] = []
+        for var in nuevo.variables:
+            indice = anterior.nombre_a_indice.get(var.nombre)
+            if indice is None:
+                agregadas.append(var)
+                continue
+
+            previa = variables[indice]
+            if (previa.cota_inferior, previa.cota_superior) != (
+                var.cota_inferior,
+                var.cota_superior,
+            ):
+                cambios_cotas.append(indice)
+            coef = objetivo_nuevo.get(var.nombre, 0)
+            if coef != objetivo_anterior.get(var.nombre, 0):
+                cambios_objetivo.append((indice, float(coef)))
+            variables[indice] = var
+
+        self.solver.establecer_cotas(
+            cambios_cotas,
+            [variables[indice].cota_inferior for indice in cambios_cotas],
+            [variables[indice].cota_superior for indice in cambios_cotas],
+        )
+        if len(cambios_objetivo) > 0:
+            cpx.objective.set_linear(cambios_objetivo)
+
+        if len(agregadas) > 0:
+            cpx.variables.add(
+                obj=[float(objetivo_nuevo.get(var.nombre, 0)) for var in agregadas],
+                lb=[var.cota_inferior for var in agregadas],
+                ub=[var.cota_superior for var in agregadas],
+                types=[var.tipo for var in agregadas],
+                names=[var.nombre for var in agregadas],
+            )
+
+        existentes = set(anterior.nombre_a_indice)
+
+        nuevo.variables = variables + agregadas
+        nuevo.nombre_a_indice = {
+            var.nombre: indice for indice, var in enumerate(nuevo.variables)
+        }
+
+        # Filas: cada restricción nueva reemplaza a una anterior con las mismas
+        # variables existentes, o se agrega si no hay ninguna
+        def clave(restr: Restriccion) -> ClaveFila:
+            return restr.sentido, frozenset(
+                (var, coef > 0) for coef, var in _terminos(restr) if var in existentes
+            )
+
+        pendientes: Dict[ClaveFila, List[int]] = {}
+        for posicion, restr in enumerate(anterior.restricciones):
+            pendientes.setdefault(clave(restr), []).append(posicion)
+
+        filas: List[Optional[int]] = []
+        cambios_coeficientes: List[Tuple[int, int, float]] = []
+        cambios_rhs: List[Tuple[int, float]] = []
+        sin_fila: List[Restriccion] = []
+
+        for restr in nuevo.restricciones:
+            candidatas = pendientes.get(clave(restr))
+            if not candidatas:
+                filas.append(None)
+                sin_fila.append(restr)
+                continue
+
+            posicion = candidatas.pop(0)
+            fila = self.filas[posicion]
+            previa = anterior.restricciones[posicion]
+
+            coefs_previos = dict(zip(*nuevo.expresion_de(previa)))
+            coefs = dict(zip(*nuevo.expresion_de(restr)))
+            cambios_coeficientes += [
+                (fila, indice, coef)
+                for indice, coef in coefs.items()
+                if coefs_previos.get(indice) != coef
+            ] + [(fila, indice, 0.0) for indice in coefs_previos if indice not in coefs]
+            if previa.term_independiente != restr.term_independiente:
+                cambios_rhs.append((fila, restr.term_independiente))
+
+            filas.append(fila)
+
+        assert all(
+            len(candidatas) == 0 for candidatas in pendientes.values()
+        ), "El delta no puede quitar restricciones del modelo"
+
+        if len(cambios_coeficientes) > 0:
+            cpx.linear_constraints.set_coefficients(cambios_coeficientes)
+        if len(cambios_rhs) > 0:
+            cpx.linear_constraints.set_rhs(cambios_rhs)
+
+        primera = cpx.linear_constraints.get_num()
+        if len(sin_fila) > 0:
+            cpx.linear_constraints.add(
+                lin_expr=[nuevo.expresion_de(restr) for restr in sin_fila],
+                senses=[restr.sentido for restr in sin_fila],
+                rhs=[restr.term_independiente for restr in sin_fila],
+            )
+        agregadas_filas = iter(range(primera, primera + len(sin_fila)))
+        self.filas = [
+            fila if fila is not None else next(agregadas_filas) for fila in filas
+        ]
+
+        # Restricciones perezosas: sólo se agregan las que no estaban
+        def firma(restr: Restriccion) -> Tuple:
+            return (
+                restr.sentido,
+                restr.term_independiente,
+                frozenset((var, coef) for coef, var in _terminos(restr)),
+            )
+
+        perezosas: Dict[str, List[FilaPerezosa]] = {}
+        for familia, restricciones in nuevo.restricciones_perezosas.items():
+            cargadas = {
+                firma(restr)
+                for restr in anterior.restricciones_perezosas.get(familia, [])
+            }
+            perezosas[familia] = [
+                (*nuevo.expresion_de(restr), restr.sentido, restr.term_independiente)
+                for restr in restricciones
+                if firma(restr) not in cargadas
+            ]
+        # En modo callback, también vuelve a indexar las filas con las columnas nuevas
+        self.solver.agregar_restricciones_perezosas(perezosas)
+
+        anterior.instancia = nuevo.instancia
+        anterior.variables = nuevo.variables
+        anterior.nombre_a_indice = nuevo.nombre_a_indice
+        anterior.restricciones = nuevo.restricciones
+        anterior.restricciones_perezosas = nuevo.restricciones_perezosas
+        anterior.objetivo = nuevo.objetivo
+        anterior.datos_reparacion = None
+
+    def reparar(self, anterior: SolucionAnotada) -> Cronograma:
+        """
+        Repara el cronograma anterior en uno factible para la instancia actual.
+
+        Se conservan las asignaciones que siguen siendo factibles. Las órdenes que
+        perdieron trabajadores se completan en el mismo (día, turno), y las que no
+        entran se insertan golosamente junto con las nuevas.
+        """
+        instancia = self.modelo.instancia
+        cronograma = Cronograma(instancia, self.modelo.configuracion)
+        cronograma.ausentes = set(self.ausentes)
+
+        def beneficio(i: int) -> float:
+            return -instancia.ordenes[i].beneficio
+
+        for i in sorted(anterior.asignacion_de_orden, key=beneficio):
+            if i in self.canceladas:
+                continue
+
+            k, l, trabajadores = anterior.asignacion_de_orden[i]
+            restantes = set(trabajadores) - self.ausentes
+
+            if cronograma.puede_asignar(i, k, l, restantes):
+                cronograma.asignar(i, k, l, restantes)
+                continue
+
+            preferencia = np.zeros(instancia.cantidad_trabajadores)
+            preferencia[list(restantes)] = 1
+            elegidos = cronograma.elegir_trabajadores(i, k, l, preferencia)
+            if elegidos is not None and cronograma.puede_asignar(i, k, l, elegidos):
+                cronograma.asignar(i, k, l, elegidos)
+
+        for i in sorted(instancia.indices_ordenes, key=beneficio):
+            if i not in self.canceladas:
+                cronograma.insertar(i)
+
+        return cronograma
+
+    def reoptimizar(
+        self, anterior: SolucionAnotada, delta: Optional[DeltaInstancia] = None
+    ) -> ResultadoReoptimizacion:
+        """
+        Aplica el delta y vuelve a resolver partiendo del cronograma anterior.
+        """
+        cpx = self.solver.cpx
+        inicio = time.perf_counter()
+
+        if delta is not None:
+            self.actualizar(delta)
+
+        cronograma = self.reparar(anterior)
+        self.solver.establecer_inicio(self.modelo.valores_de_cronograma(cronograma))
+
+        # Asignaciones del cronograma anterior, y las que todavía pueden mantenerse
+        previas = [
+            self.modelo.indice_de(f"a_{i}_{j}_{k}_{l}")
+            for i, (k, l, trabajadores) in anterior.asignacion_de_orden.items()
+            for j in trabajadores
+        ]
+        mantenibles = [
+            indice
+            for indice in previas
+            if self.modelo.variables[indice].cota_superior > 0
+        ]
+        coeficientes = cpx.objective.get_linear(mantenibles) if mantenibles else []
+        penalizacion = self.configuracion.penalizacion_cambios
+
+        despues_actualizar = time.perf_counter()
+
+        try:
+            if penalizacion > 0 and len(mantenibles) > 0:
+                cpx.objective.set_linear(
+                    [
+                        (indice, coef + penalizacion)
+                        for indice, coef in zip(mantenibles, coeficientes)
+                    ]
+                )
+            self.solver.establecer_tiempo_limite(self.configuracion.tiempo_limite)
+
+            objetivo, valores = self.solver.resolver()
+        finally:
+            if penalizacion > 0 and len(mantenibles) > 0:
+                cpx.objective.set_linear(list(zip(mantenibles, coeficientes)))
+            self.solver.establecer_tiempo_limite(
+                self.solver.configuracion.tiempo_limite
+            )
+
+        despues_resolver = time.perf_counter()
+
+        x = np.asarray(valores)
+        if penalizacion > 0 and len(mantenibles) > 0:
+            objetivo -= penalizacion * x[mantenibles].sum()
+
+        indices_asignacion = self.modelo.indices_asignacion().ravel()
+        nuevas = set(indices_asignacion[x[indices_asignacion] > 0.5].tolist())
+
+        return ResultadoReoptimizacion(
+            objetivo=objetivo,
+            valores=valores,
+            solucion=self.modelo.anotar_solucion(valores),
+            objetivo_inicio=cronograma.objetivo(),
+            cambios=len(nuevas.symmetric_difference(previas)),
+            tiempo_actualizacion=despues_actualizar - inicio,
+            tiempo_resolucion=despues_resolver - despues_actualizar,
+        )
@@ -0,0 +1,381 @@
+import json
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import wilcoxon
+
+from .instancia import InstanciaAsignacionCuadrillas
+from .modelo.modelo import (
+    ConfiguracionAsignacionCuadrillas,
+    ModeloAsignacionCuadrillas,
+)
+from .solver import (
+    ConfiguracionCPLEX,
+    PlanosDeCorte,
+    SeleccionDeNodo,
+    SeleccionDeVariable,
+)
+
+"""Directorio donde se guardan los perfiles de configuración con nombre"""
+PATH_PERFILES = Path(__file__).resolve().parent.parent / "perfiles"
+
+"""Valores posibles de cada parámetro de `ConfiguracionCPLEX` que se sintoniza"""
+ESPACIO_PARAMETROS: Dict[str, Tuple[Any, ...]] = {
+    "estrategia_seleccion_nodo": tuple(SeleccionDeNodo),
+    "estrategia_seleccion_variable": tuple(SeleccionDeVariable),
+    "preprocesamiento": (True, False),
+    "heuristic_effort": (0.0, 0.5, 1.0, 2.0, 5.0),
+    "planos_de_corte": tuple(PlanosDeCorte),
+    "gub": tuple(PlanosDeCorte),
+    "gomory": tuple(PlanosDeCorte),
+    "bqp": tuple(PlanosDeCorte),
+    "clique": tuple(PlanosDeCorte),
+    "cover": tuple(PlanosDeCorte),
+    "disjunctive": tuple(PlanosDeCorte),
+}
+
+
+@dataclass
+class ConfiguracionSintonizacion:
+    """Configuración de la búsqueda por successive halving"""
+
+    """Cantidad de configuraciones aleatorias que compiten con la base"""
+    candidatos: int = 15
+
+    """En cada ronda sobrevive `1 / eta` de los candidatos y se multiplica por
+    `eta` la cantidad de instancias"""
+    eta: int = 2
+
+    """Cantidad de instancias de la primera ronda"""
+    instancias_iniciales: int = 4
+
+    """Tiempo límite de cada resolución, en segundos"""
+    tiempo_limite: float = 10.0
+
+    """Factor del tiempo límite que cuesta una resolución que no prueba la
+    optimalidad (PAR10 con el valor por defecto)"""
+    penalizacion: float = 10.0
+
+    """Cantidad de procesos que resuelven en paralelo (cada uno con un hilo)"""
+    procesos: int = 1
+
+    """Nivel de confianza del intervalo de la mejora sobre la base"""
+    confianza: float = 0.95
+
+    """Fracción de las instancias que se reserva para comparar la mejor
+    configuración con la base, si no se dan instancias de validación"""
+    fraccion_validacion: float = 0.25
+
+    seed: int = 42
+
+
+@dataclass
+class ResultadoSintonizacion:
+    """Resultado de la sintonización de parámetros"""
+
+    mejor: ConfiguracionCPLEX
+    base: ConfiguracionCPLEX
+
+    """Una fila por resolución: candidato, instancia, costo, óptima, tiempo y si
+    la instancia es de validación"""
+    evaluaciones: pd.DataFrame
+
+    """Una fila por candidato: costo medio, instancias evaluadas y ronda en la que
+    se descartó (None para el mejor)"""
+    resumen: pd.DataFrame
+
+    """Instancias de validación en las que se compararon la mejor configuración y
+    la base"""
+    instancias_comparadas: int
+
+    """Diferencia media de costo entre la mejor configuración y la base"""
+    mejora_media: float
+
+    """Intervalo de confianza (bootstrap) de la diferencia media de costo"""
+    intervalo: Tuple[float, float]
+
+    """p-valor del test de Wilcoxon pareado de que la mejor cuesta menos que la base"""
+    p_valor: float
+
+
+def _evaluar(
+    instancia: InstanciaAsignacionCuadrillas,
+    configuracion_modelo: ConfiguracionAsignacionCuadrillas,
+    configuracion: ConfiguracionCPLEX,
+    penalizacion: float,
+) -> Tuple[float, bool, float]:
+    """(costo, óptima, tiempo) de resolver la instancia con la configuración"""
+    modelo = ModeloAsignacionCuadrillas(instancia, configuracion_modelo)
+    solver = modelo.armar_solver(configuracion)
+
+    antes = time.perf_counter()
+    solver.cpx.solve()
+    tiempo = time.perf_counter() - antes
+
+    optima = solver.tiene_solucion() and solver.es_optima()
+    assert configuracion.tiempo_limite is not None
+    costo = tiempo if optima else penalizacion * configuracion.tiempo_limite
+
+    return costo, optima, tiempo
+
+
+class SintonizadorCPLEX:
+    """
+    Sintoniza los parámetros de `ConfiguracionCPLEX` sobre un conjunto de
+    instancias de entrenamiento, con successive halving.
+
+    Compiten la configuración base y `candidatos` configuraciones aleatorias del
+    espacio de parámetros. En cada ronda los sobrevivientes se resuelven en las
+    primeras instancias (cada vez más) y sobreviven los de menor costo medio,
+    hasta que queda uno o se agotan las instancias. El costo de una resolución
+    es su tiempo si prueba la optimalidad, y si no el tiempo límite penalizado.
+
+    Al final, la mejor configuración se compara con la base con un test pareado
+    en instancias de validación, que no se usaron para elegirla: las dadas en
+    `validacion`, o si no una fracción de `instancias` que se reserva al azar.
+    """
+
+    def __init__(
+        self,
+        instancias: Sequence[InstanciaAsignacionCuadrillas],
+        configuracion: ConfiguracionSintonizacion = ConfiguracionSintonizacion(),
+        base: ConfiguracionCPLEX = ConfiguracionCPLEX(),
+        configuracion_modelo: ConfiguracionAsignacionCuadrillas = ConfiguracionAsignacionCuadrillas.default(),
+        espacio: Dict[str, Tuple[Any, ...]] = ESPACIO_PARAMETROS,
+        validacion: Optional[Sequence[InstanciaAsignacionCuadrillas]] = None,
+    ) -> None:
+        if validacion is None:
+            reservadas = math.ceil(configuracion.fraccion_validacion * len(instancias))
+            orden = random.Random(configuracion.seed).sample(
+                range(len(instancias)), len(instancias)
+            )
+            validacion = [instancias[i] for i in orden[:reservadas]]
+            instancias = [instancias[i] for i in sorted(orden[reservadas:])]
+
+        assert len(instancias) > 0 and len(validacion) > 0
+
+        # Las instancias de entrenamiento y después las de validación, para
+        # indexar las evaluaciones
+        self.instancias = list(instancias) + list(validacion)
+        self.entrenamiento = len(instancias)
+        self.configuracion = configuracion
+        self.base = replace(
+            base, sin_output=True, hilos=1, tiempo_limite=configuracion.tiempo_limite
+        )
+        self.configuracion_modelo = configuracion_modelo
+        self.espacio = espacio
+
+        # (candidato, instancia) -> (costo, óptima, tiempo)
+        self.evaluaciones: Dict[Tuple[int, int], Tuple[float, bool, float]] = {}
+
+    def generar_candidatos(self) -> List[ConfiguracionCPLEX]:
+        """La base y configuraciones aleatorias distintas del espacio"""
+        rng = random.Random(self.configuracion.seed)
+        candidatos = [self.base]
+
+        distintas = math.prod(len(valores) for valores in self.espacio.values())
+        while len(candidatos) < min(self.configuracion.candidatos + 1, distintas):
+            candidato = replace(
+                self.base,
+                **{
+                    nombre: rng.choice(valores)
+                    for nombre, valores in self.espacio.items()
+                },
+            )
+            if candidato not in candidatos:
+                candidatos.append(candidato)
+
+        return candidatos
+
+    def evaluar(
+        self, candidatos: List[ConfiguracionCPLEX], pares: List[Tuple[int, int]]
+    ) -> None:
+        """Resuelve los pares (candidato, instancia) que todavía no se evaluaron"""
+        pares = [par for par in pares if par not in self.evaluaciones]
+        if len(pares) == 0:
+            return
+
+        argumentos = [
+            (
+                self.instancias[instancia],
+                self.configuracion_modelo,
+                candidatos[candidato],
+                self.configuracion.penalizacion,
+            )
+            for candidato, instancia in pares
+        ]
+
+        if self.configuracion.procesos <= 1:
+            resultados = [_evaluar(*args) for args in argumentos]
+        else:
+            with ProcessPoolExecutor(max_workers=self.configuracion.procesos) as pool:
+                resultados = list(pool.map(_evaluar, *zip(*argumentos)))
+
+        self.evaluaciones.update(zip(pares, resultados))
+
+    def costo_medio(self, candidato: int, instancias: int) -> float:
+        return float(
+            np.mean([self.evaluaciones[candidato, i][0] for i in range(instancias)])
+        )
+
+    def sintonizar(self) -> ResultadoSintonizacion:
+        candidatos = self.generar_candidatos()
+        eta = self.configuracion.eta
+
+        vivos = list(range(len(candidatos)))
+        # Candidato -> (ronda en la que se descartó, instancias en las que se evaluó)
+        descartados: Dict[int, Tuple[Optional[int], int]] = {}
+
+        ronda = 0
+        instancias = min(self.configuracion.instancias_iniciales, self.entrenamiento)
+        while True:
+            self.evaluar(candidatos, [(c, i) for c in vivos for i in range(instancias)])
+            vivos.sort(key=lambda c: self.costo_medio(c, instancias))
+
+            if len(vivos) == 1 or instancias == self.entrenamiento:
+                break
+
+            sobrevivientes = max(len(vivos) // eta, 1)
+            for candidato in vivos[sobrevivientes:]:
+                descartados[candidato] = (ronda, instancias)
+            vivos = vivos[:sobrevivientes]
+
+            ronda += 1
+            instancias = min(instancias * eta, self.entrenamiento)
+
+        mejor = vivos[0]
+        descartados[mejor] = (None, instancias)
+        for candidato in vivos[1:]:
+            descartados[candidato] = (ronda, instancias)
+
+        # La base se compara con la mejor en las instancias de validación
+        validacion = range(self.entrenamiento, len(self.instancias))
+        self.evaluar(candidatos, [(c, i) for c in {0, mejor} for i in validacion])
+        diferencias = np.array(
+            [
+                self.evaluaciones[mejor, i][0] - self.evaluaciones[0, i][0]
+                for i in validacion
+            ]
+        )
+
+        resumen = pd.DataFrame(
+            [
+                {
+                    "candidato": candidato,
+                    "costo_medio": self.costo_medio(candidato, evaluadas),
+                    "instancias": evaluadas,
+                    "ronda_descarte": ronda_descarte,
+                    **{
+                        nombre: candidatos[candidato].a_dict()[nombre]
+                        for nombre in self.espacio
+                    },
+                }
+                for candidato, (ronda_descarte, evaluadas) in descartados.items()
+            ]
+        )
+
+        return ResultadoSintonizacion(
+            mejor=candidatos[mejor],
+            base=self.base,
+            evaluaciones=pd.DataFrame(
+                [
+                    (
+                        candidato,
+                        instancia,
+                        *evaluacion,
+                        instancia >= self.entrenamiento,
+                    )
+                    for (candidato, instancia), evaluacion in self.evaluaciones.items()
+                ],
+                columns=[
+                    "candidato",
+                    "instancia",
+                    "costo",
+                    "optima",
+                    "tiempo",
+                    "validacion",
+                ],
+            ),
+            resumen=resumen.sort_values(
+                ["instancias", "costo_medio"], ascending=[False, True]
+            ),
+            instancias_comparadas=len(validacion),
+            mejora_media=float(diferencias.mean()),
+            intervalo=self.intervalo_bootstrap(diferencias),
+            p_valor=self.p_valor(diferencias),
+        )
+
+    def intervalo_bootstrap(
+        self, diferencias: np.ndarray, remuestras: int = 10000
+    ) -> Tuple[float, float]:
+        """Intervalo de confianza de la media de las diferencias, por bootstrap"""
+        rng = np.random.default_rng(self.configuracion.seed)
+        medias = rng.choice(
+            diferencias, size=(remuestras, len(diferencias)), replace=True
+        ).mean(axis=1)
+
+        alfa = 1 - self.configuracion.confianza
+        return (
+            float(np.quantile(medias, alfa / 2)),
+            float(np.quantile(medias, 1 - alfa / 2)),
+        )
+
+    @staticmethod
+    def p_valor(diferencias: np.ndarray) -> float:
+        """p-valor del test de Wilcoxon de que las diferencias son negativas"""
+        if np.all(diferencias == 0):
+            # La mejor es la base, o empatan en todas las instancias
+            return 1.0
+        return float(wilcoxon(diferencias, alternative="less").pvalue)
+
+
+def guardar_perfil(
+    nombre: str,
+    resultado: ResultadoSintonizacion,
+    directorio: Path = PATH_PERFILES,
+) -> Path:
+    """
+    Guarda la mejor configuración como un perfil con nombre, junto con la
+    comparación con la base. Los parámetros de la resolución (tiempo límite,
+    hilos y output) no forman parte del perfil.
+    """
+    configuracion = resultado.mejor.a_dict()
+    for parametro in ("sin_output", "tiempo_limite", "hilos"):
+        configuracion.pop(parametro)
+
+    directorio.mkdir(parents=True, exist_ok=True)
+    path = directorio / f"{nombre}.json"
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "configuracion": configuracion,
+                "instancias_comparadas": resultado.instancias_comparadas,
+                "mejora_media": resultado.mejora_media,
+                "intervalo": list(resultado.intervalo),
+                "p_valor": resultado.p_valor,
+            },
+            f,
+            indent=4,
+        )
+
+    return path
+
+
+def cargar_perfil(
+    nombre: str,
+    directorio: Path = PATH_PERFILES,
+    tiempo_limite: Optional[float] = None,
+    hilos: Optional[int] = None,
+) -> ConfiguracionCPLEX:
+    """Configuración de un perfil guardado con `guardar_perfil`"""
+    with open(directorio / f"{nombre}.json") as f:
+        configuracion = ConfiguracionCPLEX.desde_dict(json.load(f)["configuracion"])
+
+    return replace(configuracion, tiempo_limite=tiempo_limite, hilos=hilos)
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from itertools import product
 from typing import Dict, Set, Tuple
 
+import numpy as np
+
 from .instancia import InstanciaAsignacionCuadrillas
 from .solver import TOL
 
@@ -19,6 +21,8 @@ class SolucionAnotada:
         }
         # orden -> (dia, turno, trabajadores)
         self.asignacion_de_orden: Dict[int, Tuple[int, int, Set[int]]] = {}
+        # Órdenes con trabajadores en más de un (día, turno)
+        self.ordenes_repartidas: Set[int] = set()
 
         for i, j, k, l in product(
             self.instancia.indices_ordenes,
@@ -26,10 +30,43 @@ class SolucionAnotada:
             self.instancia.indices_dias,
             self.instancia.indices_turnos,
         ):
-            if self.valores[f"a_{i}_{j}_{k}_{l}"] > 1 - TOL:
+            # Las variables que no aparecen en `valores` valen 0
+            if self.valores.get(f"a_{i}_{j}_{k}_{l}", 0.0) > 1 - TOL:
                 self.ordenes_realizadas.add(i)
                 self.ordenes_realizadas_por_trabajador[j].add(i)
-                self.asignacion_de_orden.setdefault(i, (k, l, set()))[2].add(j)
+                k_orden, l_orden, trabajadores = self.asignacion_de_orden.setdefault(
+                    i, (k, l, set())
+                )
+                trabajadores.add(j)
+                if (k_orden, l_orden) != (k, l):
+                    self.ordenes_repartidas.add(i)
+
+    def asignaciones(self) -> np.ndarray:
+        """
+        Asignaciones de la solución como un arreglo de filas (orden, trabajador,
+        día, turno), que es la forma compacta de guardarla.
+        """
+        return np.array(
+            [
+                (i, j, k, l)
+                for i, (k, l, trabajadores) in self.asignacion_de_orden.items()
+                for j in sorted(trabajadores)
+            ],
+            dtype=np.int32,
+        ).reshape(-1, 4)
+
+    @staticmethod
+    def desde_asignaciones(
+        instancia: InstanciaAsignacionCuadrillas, asignaciones: np.ndarray
+    ) -> "SolucionAnotada":
+        """
+        Reconstruye la solución a partir de sus asignaciones (ver `asignaciones`).
+        Sólo las variables `a` tienen valores, que es lo que se anota.
+        """
+        return SolucionAnotada(
+            instancia=instancia,
+            valores={f"a_{i}_{j}_{k}_{l}": 1.0 for i, j, k, l in asignaciones.tolist()},
+        )
 
     def cantidad_de_ordenes_realizadas(self) -> int:
         return len(self.ordenes_realizadas)
@@ -1,11 +1,21 @@
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import List, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Tuple
 import cplex
 
+from .callbacks import (
+    HeuristicaReparacion,
+    RegistroIncumbentes,
+    SeparadorRestriccionesPerezosas,
+)
 
 TOL = 1e-10
 
+"""Tolerancia para comparar valores y cotas de la relajación lineal"""
+TOL_COSTOS_REDUCIDOS = 1e-6
+
 
 class SeleccionDeNodo(Enum):
     """Estrategias para la selección de nodos en el árbol de branch-and-bound"""
@@ -36,6 +46,59 @@ class PlanosDeCorte(Enum):
     AGRESIVO = 2
 
 
+class ModoRestriccionesPerezosas(Enum):
+    """Formas de cargar las familias de restricciones que casi nunca están activas"""
+
+    # Se cargan en la matriz, como el resto de las restricciones
+    MATRIZ = 0
+    # Se cargan en el pool de restricciones perezosas de CPLEX
+    POOL = 1
+    # Se separan bajo demanda desde un callback de restricciones perezosas
+    CALLBACK = 2
+
+
+class DireccionBranching(Enum):
+    """Dirección preferida al hacer branching sobre una variable"""
+
+    GLOBAL = 0
+    ABAJO = -1
+    ARRIBA = 1
+
+
+@dataclass
+class PrioridadBranching:
+    """Prioridad de branching para una familia de variables"""
+
+    """Prefijo de las variables de la familia (por ejemplo, "r", "w" o "a")"""
+    familia: str
+
+    direccion: DireccionBranching = DireccionBranching.GLOBAL
+
+
+"""Prioridades que aprovechan la estructura del modelo: primero dónde se realiza
+cada orden, después los tramos de remuneración y por último las asignaciones"""
+PRIORIDADES_ESTRUCTURALES = (
+    PrioridadBranching("r", DireccionBranching.ARRIBA),
+    PrioridadBranching("w"),
+    PrioridadBranching("a"),
+)
+
+
+# (índices, coeficientes, sentido, término independiente)
+FilaPerezosa = Tuple[List[int], List[float], Literal["L", "G", "E"], float]
+
+
+@dataclass
+class ReporteRestriccionesPerezosas:
+    """Resumen del uso de una familia de restricciones perezosas"""
+
+    """Filas cargadas en el modelo (en la matriz o en el pool)"""
+    filas_cargadas: int
+
+    """Filas separadas por el callback (None si no se usó el callback)"""
+    filas_separadas: Optional[int]
+
+
 @dataclass
 class ConfiguracionCPLEX:
     """Configuración para resolver CPlex"""
@@ -49,6 +112,11 @@ class ConfiguracionCPLEX:
 
     heuristic_effort: float = 1.0
 
+    # Tiempo límite en segundos (None no limita)
+    tiempo_limite: Optional[float] = None
+    # Cantidad de hilos que puede usar CPLEX (None deja que CPLEX decida)
+    hilos: Optional[int] = None
+
     planos_de_corte: PlanosDeCorte = PlanosDeCorte.AUTO
     gub: PlanosDeCorte = PlanosDeCorte.AUTO
     gomory: PlanosDeCorte = PlanosDeCorte.AUTO
@@ -57,6 +125,20 @@ class ConfiguracionCPLEX:
     cover: PlanosDeCorte = PlanosDeCorte.AUTO
     disjunctive: PlanosDeCorte = PlanosDeCorte.AUTO
 
+    restricciones_perezosas: ModoRestriccionesPerezosas = (
+        ModoRestriccionesPerezosas.MATRIZ
+    )
+
+    # Cada cuántas llamadas al callback de heurísticas se repara la relajación del
+    # nodo en un incumbente (0 desactiva la heurística)
+    frecuencia_heuristica_reparacion: int = 0
+
+    # Familias de variables sobre las que se hace branching, de mayor a menor
+    # prioridad. Las familias que no aparecen no tienen prioridad.
+    prioridades_branching: Tuple[PrioridadBranching, ...] = ()
+    # Dentro de cada familia, priorizar las variables de las órdenes de mayor beneficio
+    prioridad_por_beneficio: bool = False
+
     def aplicar(self, cpx: cplex.Cplex) -> None:
         """Aplica la configuración al solver"""
 
@@ -83,6 +165,65 @@ class ConfiguracionCPLEX:
 
         cpx.parameters.mip.strategy.heuristiceffort.set(self.heuristic_effort)
 
+        if self.tiempo_limite is not None:
+            cpx.parameters.timelimit.set(self.tiempo_limite)
+
+        if self.hilos is not None:
+            cpx.parameters.threads.set(self.hilos)
+
+    def a_dict(self) -> Dict[str, Any]:
+        """Representación de la configuración con tipos primitivos"""
+
+        def primitivo(valor: Any) -> Any:
+            if isinstance(valor, Enum):
+                return valor.name
+            if isinstance(valor, dict):
+                return {clave: primitivo(v) for clave, v in valor.items()}
+            if isinstance(valor, (list, tuple)):
+                return [primitivo(v) for v in valor]
+            return valor
+
+        return primitivo(asdict(self))
+
+    @staticmethod
+    def desde_dict(datos: Dict[str, Any]) -> "ConfiguracionCPLEX":
+        """Configuración a partir de su representación con `a_dict`"""
+        por_defecto = ConfiguracionCPLEX()
+        valores: Dict[str, Any] = {}
+
+        for nombre, valor in datos.items():
+            actual = getattr(por_defecto, nombre)
+            if isinstance(actual, Enum):
+                valor = type(actual)[valor]
+            elif nombre == "prioridades_branching":
+                valor = tuple(
+                    PrioridadBranching(
+                        prioridad["familia"],
+                        DireccionBranching[prioridad["direccion"]],
+                    )
+                    for prioridad in valor
+                )
+            valores[nombre] = valor
+
+        return ConfiguracionCPLEX(**valores)
+
+
+@dataclass
+class ConfiguracionPool:
+    """Configuración para buscar soluciones alternativas con el pool de CPLEX"""
+
+    """Cantidad máxima de soluciones a devolver"""
+    cantidad: int = 10
+
+    """Gap relativo máximo de las soluciones respecto de la mejor"""
+    gap_relativo: float = 0.05
+
+    """
+    Distancia mínima de las soluciones a la mejor, medida como la cantidad de
+    variables de diversidad que cambian de valor (None no filtra)
+    """
+    diversidad_minima: Optional[float] = None
+
 
 class Solver:
     """
@@ -93,12 +234,533 @@ class Solver:
 
     def __init__(self, cpx: cplex.Cplex, configuracion: ConfiguracionCPLEX) -> None:
         self.cpx = cpx
+        self.configuracion = configuracion
         configuracion.aplicar(self.cpx)
 
+        self.filas_perezosas: Dict[str, int] = {}
+        # Filas de cada familia perezosa, con los índices actuales de las variables
+        self.perezosas: Dict[str, List[FilaPerezosa]] = {}
+        self.separador: Optional[SeparadorRestriccionesPerezosas] = None
+        self.heuristica: Optional[HeuristicaReparacion] = None
+        self.registro: Optional[RegistroIncumbentes] = None
+
+    def establecer_prioridades(
+        self, prioridades: List[Tuple[int, int, DireccionBranching]]
+    ) -> None:
+        """
+        Establece las prioridades de branching, como tuplas
+        (índice de la variable, prioridad, dirección).
+        """
+        if len(prioridades) == 0:
+            return
+
+        self.cpx.order.set(
+            [
+                (indice, prioridad, direccion.value)
+                for indice, prioridad, direccion in prioridades
+            ]
+        )
+
+    def registrar_heuristica_reparacion(
+        self, reparar: Callable[[Sequence[float]], Tuple[float, List[float]]]
+    ) -> None:
+        """
+        Registra la heurística que repara la relajación de los nodos en incumbentes,
+        si está habilitada en la configuración.
+        """
+        if self.configuracion.frecuencia_heuristica_reparacion <= 0:
+            return
+
+        self.heuristica = self.cpx.register_callback(HeuristicaReparacion)
+        self.heuristica.inicializar(
+            reparar, frecuencia=self.configuracion.frecuencia_heuristica_reparacion
+        )
+
+    def cargar_restricciones_perezosas(
+        self, familias: Dict[str, List[FilaPerezosa]]
+    ) -> None:
+        """
+        Carga las familias de restricciones perezosas según el modo configurado.
+        """
+        modo = self.configuracion.restricciones_perezosas
+        self.perezosas = {familia: list(filas) for familia, filas in familias.items()}
+
+        for familia, filas in familias.items():
+            if modo == ModoRestriccionesPerezosas.MATRIZ:
+                self.cpx.linear_constraints.add(
+                    lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+                    senses=[sentido for _, _, sentido, _ in filas],
+                    rhs=[rhs for _, _, _, rhs in filas],
+                    names=self.nombres_perezosas(familia, 0, len(filas)),
+                )
+            elif modo == ModoRestriccionesPerezosas.POOL and len(filas) > 0:
+                self.cpx.linear_constraints.advanced.add_lazy_constraints(
+                    lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+                    senses=[sentido for _, _, sentido, _ in filas],
+                    rhs=[rhs for _, _, _, rhs in filas],
+                )
+
+            self.filas_perezosas[familia] = (
+                len(filas) if modo != ModoRestriccionesPerezosas.CALLBACK else 0
+            )
+
+        if modo == ModoRestriccionesPerezosas.CALLBACK:
+            # Las reducciones duales del presolve pueden eliminar soluciones
+            # que sólo las restricciones separadas después hacen infactibles
+            self.cpx.parameters.preprocessing.reduce.set(1)
+
+            self.separador = self.cpx.register_callback(SeparadorRestriccionesPerezosas)
+            self.separador.inicializar(
+                familias, cantidad_variables=self.cpx.variables.get_num()
+            )
+
+    def agregar_restricciones_perezosas(
+        self, familias: Dict[str, List[FilaPerezosa]]
+    ) -> None:
+        """
+        Agrega filas a las familias de restricciones perezosas ya cargadas, según el
+        modo configurado. En modo callback vuelve a indexar todas las filas, por lo
+        que también debe llamarse después de agregar variables.
+        """
+        modo = self.configuracion.restricciones_perezosas
+        for familia, filas in familias.items():
+            self.perezosas.setdefault(familia, []).extend(filas)
+
+        if modo != ModoRestriccionesPerezosas.CALLBACK:
+            for familia, filas in familias.items():
+                if modo == ModoRestriccionesPerezosas.MATRIZ and len(filas) > 0:
+                    cargadas = self.filas_perezosas.get(familia, 0)
+                    self.cpx.linear_constraints.add(
+                        lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+                        senses=[sentido for _, _, sentido, _ in filas],
+                        rhs=[rhs for _, _, _, rhs in filas],
+                        names=self.nombres_perezosas(
+                            familia, cargadas, cargadas + len(filas)
+                        ),
+                    )
+                elif modo == ModoRestriccionesPerezosas.POOL and len(filas) > 0:
+                    self.cpx.linear_constraints.advanced.add_lazy_constraints(
+                        lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+                        senses=[sentido for _, _, sentido, _ in filas],
+                        rhs=[rhs for _, _, _, rhs in filas],
+                    )
+
+                self.filas_perezosas[familia] = self.filas_perezosas.get(
+                    familia, 0
+                ) + len(filas)
+            return
+
+        assert self.separador is not None
+        anteriores = self.separador.familias
+        separadas = self.separador.separadas
+
+        self.separador.inicializar(
+            {
+                familia: anteriores.get(familia, []) + familias.get(familia, [])
+                for familia in {*anteriores, *familias}
+            },
+            cantidad_variables=self.cpx.variables.get_num(),
+        )
+        for familia, mascara in separadas.items():
+            self.separador.separadas[familia][: len(mascara)] = mascara
+        if any(len(filas) > 0 for filas in familias.values()):
+            self.descartar_solucion()
+
+        for familia in familias:
+            self.filas_perezosas.setdefault(familia, 0)
+
+    def quitar_restricciones_perezosas(
+        self, quitadas: Sequence[str], familias: Dict[str, List[FilaPerezosa]]
+    ) -> None:
+        """
+        Quita las familias de restricciones perezosas `quitadas`. Las `familias`
+        que quedan se vuelven a cargar con los índices actuales de las variables,
+        por lo que también debe llamarse después de quitar variables (en modo
+        matriz, CPLEX ya reindexa las filas que quedan).
+        """
+        modo = self.configuracion.restricciones_perezosas
+        self.perezosas = {familia: list(filas) for familia, filas in familias.items()}
+
+        if modo == ModoRestriccionesPerezosas.MATRIZ:
+            nombres = [
+                nombre
+                for familia in quitadas
+                for nombre in self.nombres_perezosas(
+                    familia, 0, self.filas_perezosas.get(familia, 0)
+                )
+            ]
+            if len(nombres) > 0:
+                self.cpx.linear_constraints.delete(nombres)
+
+        elif modo == ModoRestriccionesPerezosas.POOL:
+            self.cpx.linear_constraints.advanced.free_lazy_constraints()
+            for filas in familias.values():
+                if len(filas) > 0:
+                    self.cpx.linear_constraints.advanced.add_lazy_constraints(
+                        lin_expr=[[indices, coefs] for indices, coefs, _, _ in filas],
+                        senses=[sentido for _, _, sentido, _ in filas],
+                        rhs=[rhs for _, _, _, rhs in filas],
+                    )
+
+        else:
+            assert self.separador is not None
+            separadas = self.separador.separadas
+
+            self.separador.inicializar(
+                familias, cantidad_variables=self.cpx.variables.get_num()
+            )
+            for familia in familias:
+                if familia in separadas:
+                    self.separador.separadas[familia] = separadas[familia]
+            self.descartar_solucion()
+
+        for familia in quitadas:
+            self.filas_perezosas.pop(familia, None)
+
+    def descartar_solucion(self) -> None:
+        """
+        Hace que CPLEX descarte la solución de la última resolución. Las filas que
+        separa el callback no forman parte del problema de CPLEX, así que al
+        cambiarlas CPLEX no sabe que debe volver a resolver; volver a fijar una
+        cota (con su mismo valor) lo fuerza.
+        """
+        if self.cpx.variables.get_num() == 0:
+            return
+        self.cpx.variables.set_upper_bounds(0, self.cpx.variables.get_upper_bounds(0))
+
+    @staticmethod
+    def nombres_perezosas(familia: str, desde: int, hasta: int) -> List[str]:
+        """Nombres de las filas de una familia perezosa cargadas en la matriz"""
+        return [f"{familia}#{fila}" for fila in range(desde, hasta)]
+
+    def reporte_restricciones_perezosas(
+        self,
+    ) -> Dict[str, ReporteRestriccionesPerezosas]:
+        """
+        Devuelve, por familia, cuántas filas se cargaron y cuántas se separaron.
+        """
+        return {
+            familia: ReporteRestriccionesPerezosas(
+                filas_cargadas=cargadas,
+                filas_separadas=(
+                    self.separador.cantidad_separadas(familia)
+                    if self.separador is not None
+                    else None
+                ),
+            )
+            for familia, cargadas in self.filas_perezosas.items()
+        }
+
+    def registrar_historial(self) -> None:
+        """Registra el callback que guarda el (tiempo, objetivo) de los incumbentes"""
+        self.registro = self.cpx.register_callback(RegistroIncumbentes)
+        self.registro.inicializar()
+
+    def historial(self) -> List[Tuple[float, float]]:
+        """Pares (tiempo, objetivo) de los incumbentes de la última resolución"""
+        if self.registro is None:
+            return []
+        return list(self.registro.historial)
+
+    def fijar_variables(self, indices: Sequence[int], valores: Sequence[float]) -> None:
+        """Fija las variables a los valores dados, igualando sus cotas"""
+        self.establecer_cotas(indices, valores, valores)
+
+    def establecer_cotas(
+        self,
+        indices: Sequence[int],
+        inferiores: Sequence[float],
+        superiores: Sequence[float],
+    ) -> None:
+        """Cambia las cotas de las variables, sin rearmar el modelo"""
+        indices = [int(indice) for indice in indices]
+        if len(indices) == 0:
+            return
+
+        self.cpx.variables.set_lower_bounds(
+            list(zip(indices, [float(cota) for cota in inferiores]))
+        )
+        self.cpx.variables.set_upper_bounds(
+            list(zip(indices, [float(cota) for cota in superiores]))
+        )
+
+    def establecer_tipos(self, indices: Sequence[int], tipos: Sequence[str]) -> None:
+        """Cambia el tipo de las variables ("C", "B" o "I"), sin rearmar el modelo"""
+        if len(indices) == 0:
+            return
+
+        self.cpx.variables.set_types(
+            list(zip([int(indice) for indice in indices], tipos))
+        )
+
+    def resolver_relajacion(self) -> Tuple[float, List[float], List[float]]:
+        """
+        Resuelve la relajación lineal del modelo y devuelve la tupla (objetivo,
+        valores, costos reducidos). El objetivo es una cota superior del óptimo.
+
+        Se resuelve sobre una copia, porque pasar el problema a LP descarta las
+        prioridades de branching y los MIP starts.
+        """
+        relajacion = cplex.Cplex(self.cpx)
+        self.configuracion.aplicar(relajacion)
+        relajacion.set_problem_type(relajacion.problem_type.LP)
+
+        relajacion.solve()
+        return (
+            relajacion.solution.get_objective_value(),
+            relajacion.solution.get_values(),
+            relajacion.solution.get_reduced_costs(),
+        )
+
+    def cota_relajacion(self) -> float:
+        """Objetivo de la relajación lineal, que es una cota superior del óptimo"""
+        return self.resolver_relajacion()[0]
+
+    def fijar_por_costos_reducidos(self, incumbente: float) -> Tuple[float, List[int]]:
+        """
+        Fija permanentemente las variables enteras que no pueden cambiar de valor
+        en ninguna solución mejor que `incumbente`.
+
+        Si una variable está en una cota en la relajación lineal, moverla una
+        unidad empeora la cota de la relajación en su costo reducido; si la cota
+        resultante no supera al incumbente, la variable queda fija en esa cota.
+        Devuelve el par (cota de la relajación, índices de las variables fijadas).
+        """
+        tipos = self.cpx.variables.get_types()
+        inferiores = self.cpx.variables.get_lower_bounds()
+        superiores = self.cpx.variables.get_upper_bounds()
+
+        cota, valores, costos = self.resolver_relajacion()
+
+        fijadas, valores_fijados = [], []
+        for indice, (tipo, valor, costo) in enumerate(zip(tipos, valores, costos)):
+            inferior, superior = inferiores[indice], superiores[indice]
+            if tipo == "C" or inferior == superior:
+                continue
+
+            # Al maximizar, las variables en la cota inferior tienen costo reducido
+            # no positivo, y las que están en la superior no negativo
+            if (
+                abs(valor - inferior) <= TOL_COSTOS_REDUCIDOS
+                and cota + costo < incumbente - TOL_COSTOS_REDUCIDOS
+            ):
+                fijadas.append(indice)
+                valores_fijados.append(inferior)
+            elif (
+                abs(valor - superior) <= TOL_COSTOS_REDUCIDOS
+                and cota - costo < incumbente - TOL_COSTOS_REDUCIDOS
+            ):
+                fijadas.append(indice)
+                valores_fijados.append(superior)
+
+        self.fijar_variables(fijadas, valores_fijados)
+
+        return cota, fijadas
+
+    def exportar(self, path: Path) -> None:
+        """
+        Escribe el modelo en `path` (el formato depende de la extensión, por
+        ejemplo .lp o .mps), sin las variables fijas: su aporte pasa al término
+        independiente de las restricciones y al objetivo.
+
+        Fuera del modo matriz, las familias perezosas se escriben como
+        restricciones perezosas del archivo: CPLEX descarta las del pool al
+        quitar columnas, y las del callback no forman parte del problema.
+        """
+        copia = cplex.Cplex(self.cpx)
+        self.configuracion.aplicar(copia)
+        if (
+            self.configuracion.restricciones_perezosas
+            != ModoRestriccionesPerezosas.MATRIZ
+        ):
+            copia.linear_constraints.advanced.free_lazy_constraints()
+
+        inferiores = copia.variables.get_lower_bounds()
+        superiores = copia.variables.get_upper_bounds()
+        fijas = [
+            indice
+            for indice, (inferior, superior) in enumerate(zip(inferiores, superiores))
+            if inferior == superior
+        ]
+
+        if len(fijas) > 0:
+            rhs = copia.linear_constraints.get_rhs()
+            objetivo = copia.objective.get_linear()
+            desplazamiento = copia.objective.get_offset()
+
+            for indice, columna in zip(fijas, copia.variables.get_cols(fijas)):
+                valor = inferiores[indice]
+                for fila, coef in zip(columna.ind, columna.val):
+                    rhs[fila] -= coef * valor
+                desplazamiento += objetivo[indice] * valor
+
+            copia.linear_constraints.set_rhs(list(enumerate(rhs)))
+            copia.objective.set_offset(desplazamiento)
+            copia.variables.delete(fijas)
+
+        if (
+            self.configuracion.restricciones_perezosas
+            != ModoRestriccionesPerezosas.MATRIZ
+        ):
+            fijos = {indice: inferiores[indice] for indice in fijas}
+            # Índice de cada variable que queda, después de quitar las fijas
+            nuevos = {
+                indice: nuevo
+                for nuevo, indice in enumerate(
+                    indice for indice in range(len(inferiores)) if indice not in fijos
+                )
+            }
+
+            for familia, filas in self.perezosas.items():
+                if len(filas) == 0:
+                    continue
+                copia.linear_constraints.advanced.add_lazy_constraints(
+                    lin_expr=[
+                        [
+                            [nuevos[i] for i in indices if i not in fijos],
+                            [c for i, c in zip(indices, coefs) if i not in fijos],
+                        ]
+                        for indices, coefs, _, _ in filas
+                    ],
+                    senses=[sentido for _, _, sentido, _ in filas],
+                    rhs=[
+                        rhs
+                        - sum(
+                            c * fijos[i] for i, c in zip(indices, coefs) if i in fijos
+                        )
+                        for indices, coefs, _, rhs in filas
+                    ],
+                    names=self.nombres_perezosas(familia, 0, len(filas)),
+                )
+
+        copia.write(str(path))
+
+    def acotar_objetivo(self, cota_superior: float) -> None:
+        """
+        Acota el objetivo por una cota superior válida (por ejemplo, la de una
+        relajación) con el parámetro `uppercutoff` de CPLEX, que poda los nodos
+        cuya relajación la supera sin agregar filas al modelo.
+        """
+        self.cpx.parameters.mip.tolerances.uppercutoff.set(cota_superior)
+
+    def establecer_inicio(self, valores: Sequence[float]) -> None:
+        """
+        Reemplaza los MIP starts por una solución completa, que CPLEX usa como
+        primer incumbente si es factible.
+        """
+        self.cpx.MIP_starts.delete()
+        self.cpx.MIP_starts.add(
+            [list(range(len(valores))), [float(valor) for valor in valores]],
+            self.cpx.MIP_starts.effort_level.check_feasibility,
+        )
+
+    def establecer_tiempo_limite(self, tiempo_limite: Optional[float]) -> None:
+        """Cambia el tiempo límite de las próximas resoluciones (None no limita)"""
+        if tiempo_limite is None:
+            self.cpx.parameters.timelimit.reset()
+        else:
+            self.cpx.parameters.timelimit.set(tiempo_limite)
+
     def resolver(self) -> Tuple[float, List[float]]:
         """
         Resuelve el problema, y devuelve un par (objetivo, valores de las variables).
         """
 
+        if self.registro is not None:
+            self.registro.inicializar()
+
+        inicio = time.perf_counter()
         self.cpx.solve()
-        return self.cpx.solution.get_objective_value(), self.cpx.solution.get_values()
+
+        objetivo = self.cpx.solution.get_objective_value()
+        if self.registro is not None and (
+            len(self.registro.historial) == 0
+            or abs(objetivo - self.registro.historial[-1][1]) > TOL
+        ):
+            # El callback de información no se llama si no hay branching
+            self.registro.historial.append((time.perf_counter() - inicio, objetivo))
+
+        return objetivo, self.cpx.solution.get_values()
+
+    def tiene_solucion(self) -> bool:
+        """Indica si la última resolución encontró una solución factible"""
+        return self.cpx.solution.is_primal_feasible()
+
+    def es_optima(self) -> bool:
+        """Indica si la última resolución probó la optimalidad de su solución"""
+        return self.cpx.solution.get_status() in (
+            self.cpx.solution.status.MIP_optimal,
+            self.cpx.solution.status.optimal_tolerance,
+            self.cpx.solution.status.optimal,
+        )
+
+    def cota(self) -> float:
+        """Mejor cota superior conocida del objetivo"""
+        return self.cpx.solution.MIP.get_best_objective()
+
+    def gap(self) -> float:
+        """Gap relativo entre la mejor solución y la mejor cota"""
+        return self.cpx.solution.MIP.get_mip_relative_gap()
+
+    def poblar(
+        self,
+        configuracion: ConfiguracionPool,
+        variables_diversidad: Sequence[int] = (),
+    ) -> List[Tuple[float, List[float]]]:
+        """
+        Busca soluciones alternativas en una única búsqueda con el pool de CPLEX, y
+        devuelve los pares (objetivo, valores de las variables), de mejor a peor.
+        """
+        pool = self.cpx.parameters.mip.pool
+        populate = self.cpx.parameters.mip.limits.populate
+        # Los parámetros se restauran al terminar, para no afectar otras resoluciones
+        anteriores = [
+            (parametro, parametro.get())
+            for parametro in (pool.capacity, pool.relgap, pool.replace, populate)
+        ]
+
+        pool.capacity.set(configuracion.cantidad)
+        pool.relgap.set(configuracion.gap_relativo)
+        # Cuando el pool se llena, reemplazar las soluciones más parecidas
+        pool.replace.set(2)
+        populate.set(configuracion.cantidad)
+
+        filtro = None
+        try:
+            if (
+                configuracion.diversidad_minima is not None
+                and len(variables_diversidad) > 0
+            ):
+                # La diversidad se mide respecto de la mejor solución, así que
+                # primero se resuelve para obtenerla. No es una resolución de más:
+                # `populate_solution_pool` sigue desde el árbol de esta resolución
+                # en lugar de volver a empezar.
+                self.cpx.solve()
+                if self.tiene_solucion():
+                    referencia = self.cpx.solution.get_values(
+                        list(variables_diversidad)
+                    )
+                    filtro = "diversidad"
+                    self.cpx.solution.pool.filter.add_diversity_filter(
+                        configuracion.diversidad_minima,
+                        len(variables_diversidad),
+                        [list(variables_diversidad), referencia],
+                        name=filtro,
+                    )
+
+            self.cpx.populate_solution_pool()
+        finally:
+            if filtro is not None:
+                self.cpx.solution.pool.filter.delete(filtro)
+            for parametro, valor in anteriores:
+                parametro.set(valor)
+
+        soluciones = [
+            (
+                self.cpx.solution.pool.get_objective_value(indice),
+                self.cpx.solution.pool.get_values(indice),
+            )
+            for indice in range(self.cpx.solution.pool.get_num())
+        ]
+
+        return sorted(soluciones, key=lambda solucion: -solucion[0])
@@ -0,0 +1,59 @@
+import pytest
+
+from src.barrido import BarridoPenalizaciones
+from src.modelo.modelo import (
+    ConfiguracionAsignacionCuadrillas,
+    ModeloAsignacionCuadrillas,
+)
+from src.modelo.restricciones_deseables import MultarConflictos, MultarRepeticiones
+from src.solver import ConfiguracionCPLEX
+from tests.utilidades import instancia_chica, mismo_objetivo
+
+PENALIZACIONES = [0, 50, 100, 200, 400, 800, 1600, 3200, 6400, 12800]
+
+
+def multar(penalizacion: float) -> ConfiguracionAsignacionCuadrillas:
+    return ConfiguracionAsignacionCuadrillas(
+        MultarConflictos(penalizacion), MultarRepeticiones(penalizacion)
+    )
+
+
+def optimo(instancia, penalizacion: float) -> float:
+    modelo = ModeloAsignacionCuadrillas(instancia, multar(penalizacion))
+    objetivo, _ = modelo.armar_solver(ConfiguracionCPLEX()).resolver()
+    return objetivo
+
+
+@pytest.fixture(params=range(3))
+def barrido(request):
+    instancia = instancia_chica(request.param, trabajadores=4, ordenes=4)
+    modelo = ModeloAsignacionCuadrillas(instancia, multar(1.0))
+    return BarridoPenalizaciones(modelo, modelo.armar_solver(ConfiguracionCPLEX()))
+
+
+def test_barrer_equivale_a_resolver_cada_penalizacion(barrido):
+    originales = barrido.solver.cpx.objective.get_linear(barrido.indices_barridos)
+
+    curva = barrido.barrer(PENALIZACIONES)
+
+    assert list(curva.penalizacion) == PENALIZACIONES
+    for penalizacion, objetivo in zip(curva.penalizacion, curva.objetivo):
+        assert mismo_objetivo(objetivo, optimo(barrido.modelo.instancia, penalizacion))
+
+    # Las penalizaciones originales se restauran al terminar
+    assert (
+        barrido.solver.cpx.objective.get_linear(barrido.indices_barridos) == originales
+    )
+
+
+def test_cada_tramo_es_optimo_en_sus_extremos(barrido):
+    tramos = barrido.puntos_de_quiebre(0, 20000)
+
+    assert tramos.desde.iloc[0] == 0 and tramos.hasta.iloc[-1] == 20000
+    assert (tramos.desde.iloc[1:].values == tramos.hasta.iloc[:-1].values).all()
+    for tramo in tramos.itertuples():
+        for penalizacion in (tramo.desde, tramo.hasta):
+            assert mismo_objetivo(
+                tramo.beneficio - penalizacion * tramo.multas,
+                optimo(barrido.modelo.instancia, penalizacion),
+            )
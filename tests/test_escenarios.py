@@ -0,0 +1,69 @@
+from dataclasses import replace
+
+import pytest
+
+from src.escenarios import AnalisisEscenarios, Escenario
+from src.modelo.modelo import ModeloAsignacionCuadrillas
+from src.solver import ConfiguracionCPLEX
+from tests.utilidades import CONFIGURACIONES_MODELO, instancia_chica, mismo_objetivo
+
+ESCENARIOS = [
+    Escenario("base"),
+    Escenario("-10%", factor_beneficios=0.9),
+    Escenario("+30%", factor_beneficios=1.3, beneficios={0: 20000.0}),
+    Escenario("base otra vez"),
+]
+
+
+@pytest.mark.parametrize("estrategias", list(CONFIGURACIONES_MODELO))
+@pytest.mark.parametrize("semilla", range(3))
+def test_escenarios_equivalen_a_instancias_con_otros_beneficios(estrategias, semilla):
+    instancia = instancia_chica(semilla, trabajadores=3, ordenes=3)
+    configuracion = CONFIGURACIONES_MODELO[estrategias]
+    modelo = ModeloAsignacionCuadrillas(instancia, configuracion)
+    solver = modelo.armar_solver(ConfiguracionCPLEX())
+    objetivo_original, valores = solver.resolver()
+
+    tabla = AnalisisEscenarios(modelo, solver).resolver(ESCENARIOS, inicio=valores)
+
+    for escenario, objetivo in zip(ESCENARIOS, tabla.objetivo):
+        perturbada = replace(
+            instancia,
+            ordenes=[
+                replace(orden, beneficio=beneficio)
+                for orden, beneficio in zip(
+                    instancia.ordenes, escenario.beneficios_de(modelo)
+                )
+            ],
+        )
+        referencia, _ = (
+            ModeloAsignacionCuadrillas(perturbada, configuracion)
+            .armar_solver(ConfiguracionCPLEX())
+            .resolver()
+        )
+        assert mismo_objetivo(objetivo, referencia)
+
+    # Los coeficientes originales se restauran al terminar
+    assert mismo_objetivo(solver.resolver()[0], objetivo_original)
+
+
+def test_escenario_con_otras_remuneraciones_mejora_su_inicio():
+    modelo = ModeloAsignacionCuadrillas(
+        instancia_chica(0, trabajadores=3, ordenes=3),
+        CONFIGURACIONES_MODELO["multar"],
+    )
+    solver = modelo.armar_solver(ConfiguracionCPLEX())
+    _, valores = solver.resolver()
+    escenario = Escenario("horas extra", costos_remuneracion=(1000, 1500, 2000, 2500))
+
+    analisis = AnalisisEscenarios(modelo, solver)
+    fila = analisis.resolver([escenario], inicio=valores).iloc[0]
+
+    # El inicio se valúa con los coeficientes del escenario
+    analisis.aplicar(escenario)
+    valor_inicio = sum(
+        coef * valor for coef, valor in zip(solver.cpx.objective.get_linear(), valores)
+    )
+    assert mismo_objetivo(fila.objetivo_inicio, valor_inicio)
+    assert fila.objetivo >= valor_inicio - 1e-6
+    assert fila.remuneracion >= 0
@@ -0,0 +1,29 @@
+from src.evaluacion import EvaluadorCronogramas, LoteCronogramas
+from src.solucion import SolucionAnotada
+from tests.utilidades import CONFIGURACIONES_MODELO, instancia_chica
+
+
+def test_orden_repartida_en_dos_turnos_cuenta_como_violacion():
+    instancia = instancia_chica(0, trabajadores=3, ordenes=3)
+    evaluador = EvaluadorCronogramas(instancia, CONFIGURACIONES_MODELO["ignorar"])
+    cantidad = instancia.ordenes[0].cant_trab
+
+    # La orden 0 con sus trabajadores en el turno (1, 1), salvo uno en (2, 3)
+    valores = {f"a_0_{j}_1_1": 1.0 for j in range(cantidad - 1)}
+    valores[f"a_0_{cantidad - 1}_2_3"] = 1.0
+    solucion = SolucionAnotada(instancia, valores)
+    lote = LoteCronogramas.desde_soluciones(instancia, [solucion])
+
+    assert solucion.ordenes_repartidas == {0}
+    assert lote.slots[0, 0] == -1
+    assert lote.trabajadores[0, 0].sum() == cantidad
+    assert evaluador.violaciones(lote).cantidad_trabajadores[0] == 1
+
+    # Con todos en el mismo turno la orden se realiza sin violaciones
+    valores = {f"a_0_{j}_1_1": 1.0 for j in range(cantidad)}
+    solucion = SolucionAnotada(instancia, valores)
+    lote = LoteCronogramas.desde_soluciones(instancia, [solucion])
+
+    assert solucion.ordenes_repartidas == set()
+    assert lote.slots[0, 0] == 0
+    assert evaluador.violaciones(lote).cantidad_trabajadores[0] == 0
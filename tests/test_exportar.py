@@ -0,0 +1,39 @@
+import cplex
+import pytest
+
+from src.heuristicas import HeuristicaBusquedaLocal
+from src.modelo.modelo import ModeloAsignacionCuadrillas
+from src.solver import ConfiguracionCPLEX, ModoRestriccionesPerezosas
+from tests.utilidades import CONFIGURACIONES_MODELO, instancia_chica, mismo_objetivo
+
+
+def optimo_exportado(path) -> float:
+    cpx = cplex.Cplex(str(path))
+    for stream in ("log", "error", "warning", "results"):
+        getattr(cpx, f"set_{stream}_stream")(None)
+    cpx.solve()
+    return cpx.solution.get_objective_value()
+
+
+@pytest.mark.parametrize("modo", list(ModoRestriccionesPerezosas))
+@pytest.mark.parametrize("semilla", [2, 3, 5])
+@pytest.mark.parametrize("fijar", [False, True])
+def test_el_modelo_exportado_tiene_el_mismo_optimo(tmp_path, modo, semilla, fijar):
+    instancia = instancia_chica(semilla)
+    configuracion_modelo = CONFIGURACIONES_MODELO["evitar"]
+    modelo = ModeloAsignacionCuadrillas(instancia, configuracion_modelo)
+    solver = modelo.armar_solver(ConfiguracionCPLEX(restricciones_perezosas=modo))
+
+    if fijar:
+        incumbente = (
+            HeuristicaBusquedaLocal(instancia, configuracion_modelo)
+            .construir()
+            .objetivo()
+        )
+        solver.fijar_por_costos_reducidos(incumbente)
+
+    path = tmp_path / "modelo.lp"
+    solver.exportar(path)
+    objetivo, _ = solver.resolver()
+
+    assert mismo_objetivo(optimo_exportado(path), objetivo)
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from src.modelo.modelo import (
+    ConfiguracionAsignacionCuadrillas,
+    ModeloAsignacionCuadrillas,
+)
+from src.modelo.mutable import ModeloMutable
+from src.modelo.restricciones_deseables import (
+    EvitarConflictos,
+    EvitarRepeticiones,
+    IgnorarConflictos,
+    IgnorarRepeticiones,
+    MultarConflictos,
+    MultarRepeticiones,
+)
+from src.solver import ConfiguracionCPLEX, ModoRestriccionesPerezosas
+from tests.utilidades import filas_violadas, instancia_chica, mismo_objetivo
+
+ESTRATEGIAS_CONFLICTOS = [
+    IgnorarConflictos(),
+    EvitarConflictos(),
+    MultarConflictos(300.0),
+    MultarConflictos(50.0),
+]
+ESTRATEGIAS_REPETICIONES = [
+    IgnorarRepeticiones(),
+    EvitarRepeticiones(),
+    MultarRepeticiones(200.0),
+    MultarRepeticiones(10.0),
+]
+
+
+def optimo_desde_cero(instancia, configuracion, configuracion_solver) -> float:
+    modelo = ModeloAsignacionCuadrillas(instancia, configuracion)
+    objetivo, _ = modelo.armar_solver(configuracion_solver).resolver()
+    return objetivo
+
+
+@pytest.mark.parametrize("modo", list(ModoRestriccionesPerezosas))
+@pytest.mark.parametrize("semilla", range(3))
+def test_secuencia_de_cambios_equivale_a_armar_de_cero(modo, semilla):
+    rng = random.Random(semilla)
+    instancia = instancia_chica(semilla, trabajadores=4)
+    configuracion_solver = ConfiguracionCPLEX(
+        restricciones_perezosas=modo, frecuencia_heuristica_reparacion=5
+    )
+    mutable = ModeloMutable(
+        instancia,
+        ConfiguracionAsignacionCuadrillas(
+            MultarConflictos(100.0), EvitarRepeticiones()
+        ),
+        configuracion_solver,
+    )
+
+    for _ in range(6):
+        conflictos = rng.choice(ESTRATEGIAS_CONFLICTOS)
+        repeticiones = rng.choice(ESTRATEGIAS_REPETICIONES)
+        mutable.cambiar_estrategia_conflictos(conflictos)
+        mutable.cambiar_estrategia_repeticiones(repeticiones)
+
+        objetivo, valores = mutable.resolver()
+
+        referencia = ModeloAsignacionCuadrillas(
+            instancia, ConfiguracionAsignacionCuadrillas(conflictos, repeticiones)
+        )
+        assert mismo_objetivo(
+            objetivo,
+            optimo_desde_cero(
+                instancia, referencia.configuracion, configuracion_solver
+            ),
+        )
+        assert [
+            var.nombre for var in mutable.modelo.variables
+        ] == mutable.solver.cpx.variables.get_names()
+        assert len(mutable.modelo.restricciones) == len(referencia.restricciones)
+        assert filas_violadas(mutable.modelo, valores) == 0
+
+
+@pytest.mark.parametrize("modo", list(ModoRestriccionesPerezosas))
+@pytest.mark.parametrize("semilla", range(15))
+@pytest.mark.parametrize(
+    "anterior, nueva",
+    [
+        (IgnorarConflictos(), EvitarConflictos()),
+        (EvitarConflictos(), IgnorarConflictos()),
+        (IgnorarConflictos(), MultarConflictos(50.0)),
+        (MultarConflictos(50.0), EvitarConflictos()),
+    ],
+)
+def test_cambio_entre_resoluciones_no_devuelve_la_solucion_anterior(
+    modo, semilla, anterior, nueva
+):
+    # En modo callback, las filas separadas no forman parte del problema de CPLEX,
+    # que debe descartar su solución al cambiar la estrategia
+    instancia = instancia_chica(semilla)
+    configuracion_solver = ConfiguracionCPLEX(restricciones_perezosas=modo)
+    mutable = ModeloMutable(
+        instancia,
+        ConfiguracionAsignacionCuadrillas(anterior, IgnorarRepeticiones()),
+        configuracion_solver,
+    )
+    mutable.resolver()
+
+    mutable.cambiar_estrategia_conflictos(nueva)
+    objetivo, valores = mutable.resolver()
+
+    configuracion = ConfiguracionAsignacionCuadrillas(nueva, IgnorarRepeticiones())
+    assert mismo_objetivo(
+        objetivo, optimo_desde_cero(instancia, configuracion, configuracion_solver)
+    )
+    assert filas_violadas(mutable.modelo, valores) == 0
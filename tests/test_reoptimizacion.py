@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from src.instancia import Orden
+from src.modelo.modelo import ModeloAsignacionCuadrillas
+from src.reoptimizacion import (
+    ConfiguracionReoptimizacion,
+    DeltaInstancia,
+    Reoptimizador,
+)
+from src.solver import ConfiguracionCPLEX, ModoRestriccionesPerezosas
+from tests.utilidades import (
+    CONFIGURACIONES_MODELO,
+    filas_violadas,
+    instancia_chica,
+    mismo_objetivo,
+)
+
+
+def delta_aleatorio(rng: random.Random, modelo: ModeloAsignacionCuadrillas):
+    ordenes = len(modelo.instancia.ordenes)
+    nuevas = [
+        Orden(0, rng.uniform(1000, 12000), rng.randint(1, 3))
+        for _ in range(rng.randint(0, 1))
+    ]
+    return DeltaInstancia(
+        ordenes_nuevas=nuevas,
+        ordenes_canceladas=set(rng.sample(range(ordenes), rng.randint(0, 1))),
+        trabajadores_ausentes=set(
+            rng.sample(range(modelo.instancia.cantidad_trabajadores), rng.randint(0, 1))
+        ),
+        ordenes_conflictivas=(
+            [(ordenes, rng.randrange(ordenes))] if nuevas and rng.random() < 0.5 else []
+        ),
+        ordenes_repetitivas=(
+            [(rng.randrange(ordenes), ordenes)] if nuevas and rng.random() < 0.5 else []
+        ),
+    )
+
+
+@pytest.mark.parametrize("modo", list(ModoRestriccionesPerezosas))
+@pytest.mark.parametrize("estrategias", list(CONFIGURACIONES_MODELO))
+@pytest.mark.parametrize("semilla", range(3))
+def test_reoptimizar_equivale_a_resolver_de_cero(modo, estrategias, semilla):
+    rng = random.Random(semilla)
+    configuracion = CONFIGURACIONES_MODELO[estrategias]
+    modelo = ModeloAsignacionCuadrillas(
+        instancia_chica(semilla, trabajadores=2, ordenes=3), configuracion
+    )
+    solver = modelo.armar_solver(ConfiguracionCPLEX(restricciones_perezosas=modo))
+    _, valores = solver.resolver()
+    anterior = modelo.anotar_solucion(valores)
+
+    reoptimizador = Reoptimizador(modelo, solver)
+    for _ in range(2):
+        resultado = reoptimizador.reoptimizar(
+            anterior, delta_aleatorio(rng, reoptimizador.modelo)
+        )
+
+        desde_cero = ModeloAsignacionCuadrillas(
+            reoptimizador.modelo.instancia, configuracion
+        )
+        reoptimizador.restringir(desde_cero)
+        objetivo, _ = desde_cero.armar_solver(ConfiguracionCPLEX()).resolver()
+
+        assert mismo_objetivo(resultado.objetivo, objetivo)
+        assert filas_violadas(reoptimizador.modelo, resultado.valores) == 0
+        anterior = resultado.solucion
+
+
+def test_la_penalizacion_de_cambios_no_supera_el_optimo():
+    rng = random.Random(7)
+    configuracion = CONFIGURACIONES_MODELO["evitar"]
+    modelo = ModeloAsignacionCuadrillas(
+        instancia_chica(7, trabajadores=2, ordenes=3), configuracion
+    )
+    solver = modelo.armar_solver(ConfiguracionCPLEX())
+    _, valores = solver.resolver()
+
+    reoptimizador = Reoptimizador(
+        modelo, solver, ConfiguracionReoptimizacion(penalizacion_cambios=50.0)
+    )
+    resultado = reoptimizador.reoptimizar(
+        modelo.anotar_solucion(valores), delta_aleatorio(rng, modelo)
+    )
+
+    desde_cero = ModeloAsignacionCuadrillas(
+        reoptimizador.modelo.instancia, configuracion
+    )
+    reoptimizador.restringir(desde_cero)
+    objetivo, _ = desde_cero.armar_solver(ConfiguracionCPLEX()).resolver()
+
+    assert resultado.objetivo <= objetivo + 1e-3
+    assert filas_violadas(reoptimizador.modelo, resultado.valores) == 0
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_reparar_tras_reoptimizar_usa_el_modelo_nuevo(semilla):
+    configuracion = CONFIGURACIONES_MODELO["multar"]
+    modelo = ModeloAsignacionCuadrillas(
+        instancia_chica(semilla, trabajadores=2, ordenes=3), configuracion
+    )
+    solver = modelo.armar_solver(ConfiguracionCPLEX())
+    _, valores = solver.resolver()
+    modelo.reparar_solucion(valores)
+
+    reoptimizador = Reoptimizador(modelo, solver)
+    resultado = reoptimizador.reoptimizar(
+        modelo.anotar_solucion(valores),
+        DeltaInstancia(ordenes_nuevas=[Orden(0, 9000.0, 1)]),
+    )
+
+    objetivo, reparada = reoptimizador.modelo.reparar_solucion(resultado.valores)
+
+    desde_cero = ModeloAsignacionCuadrillas(
+        reoptimizador.modelo.instancia, configuracion
+    )
+    por_nombre = {
+        var.nombre: valor
+        for var, valor in zip(reoptimizador.modelo.variables, resultado.valores)
+    }
+    referencia, _ = desde_cero.reparar_solucion(
+        [por_nombre[var.nombre] for var in desde_cero.variables]
+    )
+
+    assert mismo_objetivo(objetivo, referencia)
+    assert filas_violadas(reoptimizador.modelo, reparada) == 0
@@ -0,0 +1,108 @@
+import random
+from typing import List
+
+from src.instancia import InstanciaAsignacionCuadrillas, Orden
+from src.modelo.modelo import (
+    ConfiguracionAsignacionCuadrillas,
+    ModeloAsignacionCuadrillas,
+)
+from src.modelo.restricciones_deseables import (
+    EvitarConflictos,
+    EvitarRepeticiones,
+    IgnorarConflictos,
+    IgnorarRepeticiones,
+    MultarConflictos,
+    MultarRepeticiones,
+)
+
+"""Tolerancia relativa para comparar objetivos de resoluciones distintas"""
+TOL_OBJETIVO = 1e-4
+
+"""Tolerancia para considerar satisfecha una restricción"""
+TOL_FACTIBILIDAD = 1e-6
+
+"""Configuraciones del modelo con cada estrategia de conflictos y repeticiones"""
+CONFIGURACIONES_MODELO = {
+    "ignorar": ConfiguracionAsignacionCuadrillas(
+        IgnorarConflictos(), IgnorarRepeticiones()
+    ),
+    "evitar": ConfiguracionAsignacionCuadrillas(
+        EvitarConflictos(), EvitarRepeticiones()
+    ),
+    "multar": ConfiguracionAsignacionCuadrillas(
+        MultarConflictos(500.0), MultarRepeticiones(700.0)
+    ),
+}
+
+
+def instancia_chica(
+    semilla: int, trabajadores: int = 3, ordenes: int = 4
+) -> InstanciaAsignacionCuadrillas:
+    """
+    Instancia aleatoria chica (los modelos entran en los límites de la edición
+    Community de CPLEX), con al menos un conflicto entre trabajadores y un par de
+    órdenes conflictivas, para que haya restricciones perezosas.
+    """
+    rng = random.Random(semilla)
+    pares_trabajadores = [
+        (a, b) for a in range(trabajadores) for b in range(a + 1, trabajadores)
+    ]
+    pares_ordenes = [(a, b) for a in range(ordenes) for b in range(a + 1, ordenes)]
+
+    return InstanciaAsignacionCuadrillas(
+        cantidad_trabajadores=trabajadores,
+        ordenes=[
+            Orden(i, rng.uniform(1000, 12000), rng.randint(1, 3))
+            for i in range(ordenes)
+        ],
+        conflictos_trabajadores=rng.sample(
+            pares_trabajadores, min(len(pares_trabajadores), rng.randint(1, 2))
+        ),
+        ordenes_correlativas=rng.sample(
+            [(a, b) for a in range(ordenes) for b in range(ordenes) if a != b],
+            rng.randint(0, 1),
+        ),
+        ordenes_conflictivas=rng.sample(
+            pares_ordenes, min(len(pares_ordenes), rng.randint(1, 2))
+        ),
+        ordenes_repetitivas=rng.sample(
+            pares_ordenes, min(len(pares_ordenes), rng.randint(0, 2))
+        ),
+    )
+
+
+def mismo_objetivo(a: float, b: float) -> bool:
+    return abs(a - b) <= TOL_OBJETIVO * (1 + abs(b))
+
+
+def filas_violadas(modelo: ModeloAsignacionCuadrillas, valores: List[float]) -> int:
+    """
+    Cantidad de restricciones (incluyendo las perezosas) y cotas del modelo que
+    la solución viola
+    """
+    x = {modelo.nombre_de(indice): valor for indice, valor in enumerate(valores)}
+    restricciones = list(modelo.restricciones) + [
+        restr
+        for familia in modelo.restricciones_perezosas.values()
+        for restr in familia
+    ]
+
+    violadas = 0
+    for restr in restricciones:
+        izq = sum(coef * x[var] for coef, var in restr.terminos_izq) - sum(
+            coef * x[var] for coef, var in restr.terminos_der
+        )
+        rhs = restr.term_independiente
+        violadas += (
+            (restr.sentido == "L" and izq > rhs + TOL_FACTIBILIDAD)
+            or (restr.sentido == "G" and izq < rhs - TOL_FACTIBILIDAD)
+            or (restr.sentido == "E" and abs(izq - rhs) > TOL_FACTIBILIDAD)
+        )
+    for var in modelo.variables:
+        violadas += not (
+            var.cota_inferior - TOL_FACTIBILIDAD
+            <= x[var.nombre]
+            <= var.cota_superior + TOL_FACTIBILIDAD
+        )
+
+    return violadas